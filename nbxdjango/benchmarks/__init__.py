@@ -0,0 +1,10 @@
+"""
+Offline load-test and benchmark suite for the GraphQL API.
+
+Run from the ``nbxdjango`` directory against any database configured through
+``DATABASE_URL`` (SQLite file or local PostgreSQL):
+
+    DATABASE_URL=sqlite:///bench.sqlite3 python -m benchmarks run --scale small
+
+See ``python -m benchmarks --help`` for the available sub-commands.
+"""
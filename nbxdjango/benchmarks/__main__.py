@@ -0,0 +1,203 @@
+"""
+Command line entry point: ``python -m benchmarks {run,queue,compare}``.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+
+def _setup_django():
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "nbxdjango.settings")
+    import django
+
+    django.setup()
+
+
+def _run(args):
+    _setup_django()
+    from django.core.management import call_command
+
+    from . import report, runner, scenarios
+    from .seed import seed
+
+    selected = scenarios.select(args.scenario)
+    call_command("migrate", verbosity=0, interactive=False)
+    print(f"Seeding '{args.scale}' dataset...")
+    seeded = seed(args.scale)
+
+    results = []
+    if "test_client" in args.mode:
+        print("Running test client benchmarks...")
+        results += runner.run_test_client(selected, seeded, iterations=args.iterations)
+    if "gunicorn" in args.mode:
+        for worker_class in args.worker_class:
+            if worker_class == "gevent" and importlib.util.find_spec("gevent") is None:
+                print("Skipping gevent workers: gevent is not installed (pip install gevent).")
+                continue
+            print(f"Running gunicorn benchmarks ({worker_class} workers)...")
+            results += runner.run_gunicorn(
+                selected,
+                seeded,
+                concurrency_levels=args.concurrency,
+                iterations=args.iterations,
+                workers=args.workers,
+                worker_class=worker_class,
+                threads=args.threads,
+            )
+
+    data = report.build_report(
+        results,
+        args.scale,
+        seeded.counts,
+        iterations=args.iterations,
+        workers=args.workers,
+        threads=args.threads,
+        concurrency=args.concurrency,
+    )
+    path = report.write_report(data, args.output)
+    for row in results:
+        print(
+            f"{row['scenario']:<22} {row['mode']:<12} {row.get('worker_class') or '':<8} c={row['concurrency']:<3} "
+            f"p50={row['p50_ms']}ms p95={row['p95_ms']}ms p99={row['p99_ms']}ms "
+            f"rps={row['throughput_rps']} errors={row['errors']}"
+        )
+    print(f"Results written to {path}")
+
+
+def _queue(args):
+    _setup_django()
+    from django.core.management import call_command
+
+    from . import queue, report
+
+    call_command("migrate", verbosity=0, interactive=False)
+    redis_process = None
+    results = []
+    try:
+        for broker in args.broker:
+            redis_url = None
+            if broker == "redis":
+                if importlib.util.find_spec("redis") is None:
+                    print("Skipping the Redis broker: the redis package is not installed (pip install redis).")
+                    continue
+                redis_url = args.redis_url
+                if redis_url is None:
+                    redis_process, redis_url = queue.start_redis()
+                if redis_url is None:
+                    print(
+                        "Skipping the Redis broker: neither redis-server nor fakeredis is installed; pass "
+                        "--redis-url (e.g. `docker compose --profile queue up redis`)."
+                    )
+                    continue
+            print(f"Running queue benchmark ({broker} broker, {args.tasks} tasks)...")
+            results.append(
+                queue.run_queue(
+                    broker,
+                    tasks=args.tasks,
+                    workers=args.workers,
+                    task_ms=args.task_ms,
+                    timeout=args.timeout,
+                    redis_url=redis_url,
+                )
+            )
+    finally:
+        if redis_process is not None:
+            redis_process.terminate()
+
+    data = report.build_report(
+        results, None, {}, tasks=args.tasks, workers=args.workers, task_ms=args.task_ms, brokers=args.broker
+    )
+    path = report.write_report(data, args.output)
+    for row in results:
+        print(
+            f"{row['mode']:<16} tasks={row['iterations']:<5} p50={row['p50_ms']}ms p95={row['p95_ms']}ms "
+            f"queued_p95={row['queued_p95_ms']}ms enqueue_rps={row['enqueue_rps']} "
+            f"rps={row['throughput_rps']} errors={row['errors']}"
+        )
+    print(f"Results written to {path}")
+
+
+def _compare(args):
+    from . import report
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    candidate = json.loads(Path(args.candidate).read_text())
+    for row in report.compare(baseline, candidate):
+        deltas = " ".join(f"{metric}={row[metric]:+.1f}%" for metric in report.COMPARED_METRICS if metric in row)
+        print(
+            f"{row['scenario']:<22} {row['mode']:<12} {row['worker_class'] or '':<8} c={row['concurrency']:<3} {deltas}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Seed a dataset and benchmark the GraphQL API")
+    run.add_argument("--scale", default="small", help="Dataset size: tiny, small, medium or large (default: small)")
+    run.add_argument("--scenario", action="append", help="Scenario to run (repeatable, default: all)")
+    run.add_argument(
+        "--mode",
+        action="append",
+        choices=["test_client", "gunicorn"],
+        help="Runner to use (repeatable, default: test_client)",
+    )
+    run.add_argument("--iterations", type=int, default=100, help="Requests per scenario and level (default: 100)")
+    run.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="Gunicorn concurrency levels")
+    run.add_argument("--workers", type=int, default=2, help="Gunicorn worker processes (default: 2)")
+    run.add_argument(
+        "--threads",
+        type=int,
+        help="Threads per gunicorn worker (default: gunicorn.conf.py's default for the worker class)",
+    )
+    run.add_argument(
+        "--worker-class",
+        action="append",
+        choices=["sync", "gthread", "gevent"],
+        help="Gunicorn worker class (repeatable, default: sync)",
+    )
+    run.add_argument(
+        "--output",
+        default=f"benchmark-results/{datetime.now():%Y%m%d-%H%M%S}.json",
+        help="Where to write the JSON results",
+    )
+    run.set_defaults(func=_run)
+
+    queue = subparsers.add_parser("queue", help="Benchmark django-q task throughput under the ORM and Redis brokers")
+    queue.add_argument(
+        "--broker", action="append", choices=["orm", "redis"], help="Broker to measure (repeatable, default: both)"
+    )
+    queue.add_argument("--tasks", type=int, default=500, help="Tasks per burst (default: 500)")
+    queue.add_argument("--workers", type=int, default=4, help="qcluster workers (default: 4)")
+    queue.add_argument("--task-ms", type=int, default=20, help="Simulated I/O per task in ms (default: 20)")
+    queue.add_argument("--timeout", type=int, default=300, help="Seconds to wait for a burst to drain")
+    queue.add_argument("--redis-url", help="Redis to use (default: start a local stand-in)")
+    queue.add_argument(
+        "--output",
+        default=f"benchmark-results/queue-{datetime.now():%Y%m%d-%H%M%S}.json",
+        help="Where to write the JSON results",
+    )
+    queue.set_defaults(func=_queue)
+
+    compare = subparsers.add_parser("compare", help="Compare two JSON result files")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.set_defaults(func=_compare)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        args.mode = args.mode or ["test_client"]
+        args.worker_class = args.worker_class or ["sync"]
+    if args.command == "queue":
+        args.broker = args.broker or ["orm", "redis"]
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Task queue benchmark: throughput and latency of the django-q cluster under the
+ORM and Redis brokers.
+
+django-q reads its configuration once at import, so every broker is measured
+in its own process (``python -m benchmarks.queue``) started with ``Q_BROKER``
+set. That process boots ``manage.py qcluster`` with the same environment,
+waits for a warm-up task to round-trip, enqueues a burst of
+``simulated_task`` calls and waits until every one has a ``TaskMetric`` row.
+Without ``--redis-url`` a throwaway ``redis-server`` (or fakeredis's TCP
+server) on a free local port stands in for Redis; fakeredis is pure Python, so
+use a real Redis for absolute numbers.
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+import uuid
+
+from .runner import PROJECT_DIR, _free_port, _round, percentile
+
+
+def simulated_task(ms):
+    """Stand-in for an I/O-bound task such as a Mailgun API call."""
+    time.sleep(ms / 1000)
+
+
+def start_redis():
+    """
+    Start a local Redis stand-in on a free port: ``redis-server`` if installed,
+    else fakeredis's TCP server (``pip install fakeredis``) in its own process.
+    Returns ``(process, url)``, or ``(None, None)`` when neither is available.
+    """
+    port = _free_port()
+    binary = shutil.which("redis-server")
+    if binary:
+        command = [binary, "--port", str(port), "--save", "", "--appendonly", "no"]
+    elif importlib.util.find_spec("fakeredis"):
+        command = [
+            sys.executable,
+            "-c",
+            f"from fakeredis import TcpFakeServer; TcpFakeServer(('127.0.0.1', {port})).serve_forever()",
+        ]
+    else:
+        return None, None
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+                sock.sendall(b"*1\r\n$4\r\nPING\r\n")
+                if sock.recv(16).startswith(b"+PONG"):
+                    return process, f"redis://127.0.0.1:{port}/0"
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("The Redis stand-in did not become ready within 10 seconds")
+
+
+def summarize_queue(broker, workers, task_ms, requested, timings, failures, enqueue_elapsed, elapsed):
+    """Build the JSON result row for one broker from ``(queued_ms, run_ms)`` pairs."""
+    latencies = [queued + run for queued, run in timings]
+    queued = [queued for queued, _ in timings]
+    completed = len(timings)
+    return {
+        "scenario": f"queue:{task_ms}ms",
+        "mode": f"qcluster:{broker}",
+        "broker": broker,
+        "workers": workers,
+        "iterations": completed,
+        "errors": failures + (requested - completed),
+        "p50_ms": _round(percentile(latencies, 50)),
+        "p95_ms": _round(percentile(latencies, 95)),
+        "p99_ms": _round(percentile(latencies, 99)),
+        "queued_p95_ms": _round(percentile(queued, 95)),
+        "enqueue_rps": _round(requested / enqueue_elapsed if enqueue_elapsed else None),
+        "throughput_rps": _round(completed / elapsed if elapsed else None),
+    }
+
+
+def _start_cluster():
+    # Inherits this process's environment, so the cluster uses the same broker profile.
+    return subprocess.Popen(
+        [sys.executable, "manage.py", "qcluster"],
+        cwd=PROJECT_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _wait_for(group, count, timeout, process):
+    from packagehandling.models import TaskMetric
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"qcluster exited with code {process.returncode}")
+        if TaskMetric.objects.filter(group=group).count() >= count:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def measure(broker, tasks, workers, task_ms, timeout):
+    """Measure one broker; must run in a process whose settings select ``broker``."""
+    from django_q.tasks import async_task
+    from packagehandling.models import TaskMetric
+
+    func = "benchmarks.queue.simulated_task"
+    process = _start_cluster()
+    try:
+        warmup = f"warmup-{uuid.uuid4().hex[:8]}"
+        async_task(func, 0, group=warmup)
+        if not _wait_for(warmup, 1, 60, process):
+            raise RuntimeError("qcluster did not process the warm-up task within 60 seconds")
+
+        group = f"bench-{uuid.uuid4().hex[:8]}"
+        started = time.perf_counter()
+        for _ in range(tasks):
+            async_task(func, task_ms, group=group)
+        enqueue_elapsed = time.perf_counter() - started
+        _wait_for(group, tasks, timeout, process)
+        elapsed = time.perf_counter() - started
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    metrics = TaskMetric.objects.filter(group=group)
+    timings = list(metrics.values_list("queued_ms", "run_ms"))
+    failures = metrics.filter(success=False).count()
+    return summarize_queue(broker, workers, task_ms, tasks, timings, failures, enqueue_elapsed, elapsed)
+
+
+def run_queue(broker, tasks=500, workers=4, task_ms=20, timeout=300, redis_url=None):
+    """Measure ``broker`` in a child process configured through the environment."""
+    env = {**os.environ, "Q_BROKER": broker, "Q_WORKERS": str(workers)}
+    if redis_url:
+        env["Q_REDIS_URL"] = redis_url
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.queue",
+        broker,
+        f"--tasks={tasks}",
+        f"--workers={workers}",
+        f"--task-ms={task_ms}",
+        f"--timeout={timeout}",
+    ]
+    output = subprocess.run(command, cwd=PROJECT_DIR, env=env, check=True, stdout=subprocess.PIPE, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure one broker (used by `python -m benchmarks queue`)")
+    parser.add_argument("broker", choices=["orm", "redis"])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--task-ms", type=int, default=20)
+    parser.add_argument("--timeout", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "nbxdjango.settings")
+    import django
+
+    django.setup()
+    logging.getLogger("django-q").setLevel(logging.WARNING)
+    print(json.dumps(measure(args.broker, args.tasks, args.workers, args.task_ms, args.timeout)))
+
+
+if __name__ == "__main__":
+    main()
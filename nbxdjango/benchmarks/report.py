@@ -0,0 +1,77 @@
+"""
+JSON result files and run-to-run comparison.
+"""
+
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+import django
+from django.db import connection
+
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(results, scale, counts, **options):
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "scale": scale,
+            "row_counts": counts,
+            "options": options,
+        },
+        "results": results,
+    }
+
+
+def write_report(report, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+    return path
+
+
+def _key(row):
+    return (row["scenario"], row["mode"], row.get("worker_class"), row.get("concurrency"))
+
+
+def compare(baseline, candidate):
+    """
+    Pair up rows from two reports and return the relative change of each metric
+    (positive means slower for latencies and faster for throughput).
+    """
+    baseline_rows = {_key(row): row for row in baseline["results"]}
+    rows = []
+    for row in candidate["results"]:
+        before = baseline_rows.get(_key(row))
+        if before is None:
+            continue
+        deltas = {}
+        for metric in COMPARED_METRICS:
+            if before.get(metric) and row.get(metric) is not None:
+                deltas[metric] = round((row[metric] - before[metric]) / before[metric] * 100, 1)
+        rows.append(
+            {
+                "scenario": row["scenario"],
+                "mode": row["mode"],
+                "worker_class": row.get("worker_class"),
+                "concurrency": row.get("concurrency"),
+                **deltas,
+            }
+        )
+    return rows
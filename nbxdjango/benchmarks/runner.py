@@ -0,0 +1,218 @@
+"""
+Benchmark runners.
+
+``run_test_client`` drives the GraphQL endpoint in-process through Django's
+test client, which isolates resolver and ORM cost from the network stack.
+``run_gunicorn`` boots a real gunicorn server against the same database and
+hits it from a thread pool at several concurrency levels.
+"""
+
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.test import Client
+
+GRAPHQL_PATH = "/graphql"
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples`` (``pct`` in 0-100)."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(scenario, mode, latencies, errors, elapsed, **extra):
+    """Build the JSON-serializable result row for one scenario run."""
+    latencies_ms = [latency * 1000 for latency in latencies]
+    count = len(latencies_ms)
+    return {
+        "scenario": scenario.name,
+        "mode": mode,
+        **extra,
+        "iterations": count,
+        "errors": errors,
+        "p50_ms": _round(percentile(latencies_ms, 50)),
+        "p95_ms": _round(percentile(latencies_ms, 95)),
+        "p99_ms": _round(percentile(latencies_ms, 99)),
+        "mean_ms": _round(sum(latencies_ms) / count if count else None),
+        "throughput_rps": _round(count / elapsed if elapsed else None),
+    }
+
+
+def _round(value):
+    return round(value, 3) if value is not None else None
+
+
+def _iterations_for(scenario, seeded, requested):
+    if scenario.max_iterations is None:
+        return requested
+    return min(requested, scenario.max_iterations(seeded))
+
+
+def _tokens(seeded):
+    return {"admin": seeded.admin_token(), "client": seeded.client_token(), None: None}
+
+
+def _has_errors(status, body):
+    return status != 200 or bool(body.get("errors"))
+
+
+def run_test_client(scenarios, seeded, iterations=100, warmup=5):
+    """Measure each scenario sequentially through ``django.test.Client``."""
+    client = Client(HTTP_HOST="localhost", raise_request_exception=False)
+    tokens = _tokens(seeded)
+    results = []
+    for scenario in scenarios:
+        headers = {}
+        if tokens[scenario.auth]:
+            headers["HTTP_AUTHORIZATION"] = f"JWT {tokens[scenario.auth]}"
+
+        total = _iterations_for(scenario, seeded, iterations + warmup)
+        latencies, errors = [], 0
+        started = None
+        for i in range(total):
+            payload = json.dumps(scenario.payload(seeded, i))
+            if i == warmup:
+                started = time.perf_counter()
+            begin = time.perf_counter()
+            response = client.post(GRAPHQL_PATH, payload, content_type="application/json", secure=True, **headers)
+            latency = time.perf_counter() - begin
+            if i < warmup:
+                continue
+            latencies.append(latency)
+            is_json = response.get("Content-Type", "").startswith("application/json")
+            errors += _has_errors(response.status_code, response.json() if is_json else {})
+        elapsed = time.perf_counter() - started if started is not None else 0
+        results.append(summarize(scenario, "test_client", latencies, errors, elapsed, concurrency=1))
+    return results
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(workers=2, worker_class="sync", threads=None, extra_args=(), env=None):
+    """
+    Start gunicorn with the production ``gunicorn.conf.py`` on a free local
+    port and wait until it answers. ``threads=None`` keeps the profile's
+    default for the worker class.
+    """
+    port = _free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "nbxdjango.wsgi",
+        "--config",
+        "gunicorn.conf.py",
+        "--bind",
+        f"127.0.0.1:{port}",
+        "--workers",
+        str(workers),
+        "--worker-class",
+        worker_class,
+        "--log-level",
+        "warning",
+        *(["--threads", str(threads)] if threads else []),
+        *extra_args,
+    ]
+    env = {
+        **os.environ,
+        # Let the profile derive its per-class defaults, and keep access logs out of the benchmark output.
+        "GUNICORN_WORKER_CLASS": worker_class,
+        "GUNICORN_ACCESS_LOG": "",
+        **(env or {}),
+    }
+    process = subprocess.Popen(command, cwd=PROJECT_DIR, env=env)
+    url = f"http://127.0.0.1:{port}{GRAPHQL_PATH}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            _post(url, {"query": "{ __typename }"}, None, timeout=1)
+            return process, url
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("gunicorn did not become ready within 30 seconds")
+
+
+def _post(url, payload, token, timeout=30):
+    headers = {
+        "Content-Type": "application/json",
+        # settings.SECURE_SSL_REDIRECT is on outside DEBUG; pretend we sit behind the TLS proxy.
+        "X-Forwarded-Proto": "https",
+    }
+    if token:
+        headers["Authorization"] = f"JWT {token}"
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), headers=headers, method="POST")
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.status, json.loads(response.read())
+
+
+def run_gunicorn(
+    scenarios,
+    seeded,
+    concurrency_levels=(1, 4, 16),
+    iterations=200,
+    workers=2,
+    worker_class="sync",
+    threads=None,
+):
+    """Measure each scenario over HTTP against a gunicorn server at several concurrency levels."""
+    tokens = _tokens(seeded)
+    process, url = start_gunicorn(workers=workers, worker_class=worker_class, threads=threads)
+    results = []
+    try:
+        for scenario in scenarios:
+            token = tokens[scenario.auth]
+            for concurrency in concurrency_levels:
+                total = _iterations_for(scenario, seeded, iterations)
+
+                def call(i, scenario=scenario, token=token):
+                    payload = scenario.payload(seeded, i)
+                    begin = time.perf_counter()
+                    try:
+                        status, body = _post(url, payload, token)
+                        failed = _has_errors(status, body)
+                    except (urllib.error.URLError, OSError):
+                        failed = True
+                    return time.perf_counter() - begin, failed
+
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    outcomes = list(pool.map(call, range(total)))
+                elapsed = time.perf_counter() - started
+                results.append(
+                    summarize(
+                        scenario,
+                        "gunicorn",
+                        [latency for latency, _ in outcomes],
+                        sum(failed for _, failed in outcomes),
+                        elapsed,
+                        concurrency=concurrency,
+                        workers=workers,
+                        worker_class=worker_class,
+                        threads=threads,
+                    )
+                )
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return results
@@ -0,0 +1,123 @@
+"""
+GraphQL operations exercised by the benchmark suite.
+
+Each scenario knows which token to authenticate with and how to build the
+variables for a given iteration, so the same definition drives both the
+in-process Django test client runner and the HTTP (gunicorn) runner.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    # seed imports models, which needs Django set up; the scenarios are also loaded without it.
+    from .seed import SeedResult
+
+ALL_PACKAGES_QUERY = """
+query AllPackages($page: Int, $pageSize: Int) {
+  allPackages(page: $page, pageSize: $pageSize, notInConsolidate: false) {
+    totalCount
+    results { id barcode courier weight servicePrice client { id email } }
+  }
+}
+"""
+
+ALL_CLIENTS_QUERY = """
+query AllClients($page: Int, $pageSize: Int) {
+  allClients(page: $page, pageSize: $pageSize, orderBy: "-created_at") {
+    totalCount
+    results { id email fullName city }
+  }
+}
+"""
+
+ALL_CONSOLIDATES_QUERY = """
+query AllConsolidates($page: Int, $pageSize: Int) {
+  allConsolidates(page: $page, pageSize: $pageSize) {
+    totalCount
+    results { id status deliveryDate client { id email } packages { id barcode } }
+  }
+}
+"""
+
+DASHBOARD_QUERY = """
+query Dashboard {
+  dashboard {
+    stats {
+      totalPackages recentPackages packagesPending packagesInTransit packagesDelivered
+      totalConsolidations consolidationsPending consolidationsProcessing consolidationsInTransit
+      totalRealPrice totalServicePrice totalClients
+    }
+    recentPackages { id barcode }
+    recentConsolidations { id status }
+  }
+}
+"""
+
+CREATE_CONSOLIDATE_MUTATION = """
+mutation CreateConsolidate($packageIds: [ID]!) {
+  createConsolidate(description: "benchmark", status: "pending", packageIds: $packageIds) {
+    consolidate { id status }
+  }
+}
+"""
+
+REFRESH_WITH_TOKEN_MUTATION = """
+mutation RefreshWithToken($refreshToken: String!) {
+  refreshWithToken(refreshToken: $refreshToken) { token refreshExpiresIn }
+}
+"""
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    query: str
+    # Which token to send: "admin", "client" or None for anonymous requests.
+    auth: str | None
+    variables: Callable[["SeedResult", int], dict]
+    # Mutations that consume seeded rows cannot run more times than rows were seeded.
+    max_iterations: Callable[["SeedResult"], int] | None = None
+
+    def payload(self, seeded, iteration):
+        return {"query": self.query, "variables": self.variables(seeded, iteration)}
+
+
+def _page(seeded, iteration):
+    return {"page": 1, "pageSize": 20}
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("allPackages", ALL_PACKAGES_QUERY, "admin", _page),
+        Scenario("allPackages:client", ALL_PACKAGES_QUERY, "client", _page),
+        Scenario("allClients", ALL_CLIENTS_QUERY, "admin", _page),
+        Scenario("allConsolidates", ALL_CONSOLIDATES_QUERY, "admin", _page),
+        Scenario("dashboard", DASHBOARD_QUERY, "admin", lambda seeded, iteration: {}),
+        Scenario("dashboard:client", DASHBOARD_QUERY, "client", lambda seeded, iteration: {}),
+        Scenario(
+            "createConsolidate",
+            CREATE_CONSOLIDATE_MUTATION,
+            "admin",
+            lambda seeded, iteration: {"packageIds": [seeded.consolidate_pool.pop()]},
+            max_iterations=lambda seeded: len(seeded.consolidate_pool),
+        ),
+        Scenario(
+            "refreshWithToken",
+            REFRESH_WITH_TOKEN_MUTATION,
+            None,
+            lambda seeded, iteration: {"refreshToken": seeded.refresh_token},
+        ),
+    )
+}
+
+
+def select(names=None):
+    """Return the scenarios named in ``names`` (all of them when empty)."""
+    if not names:
+        return list(SCENARIOS.values())
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenario(s): {', '.join(unknown)}. Valid values are {', '.join(SCENARIOS)}.")
+    return [SCENARIOS[name] for name in names]
@@ -0,0 +1,80 @@
+"""
+Seed realistic data volumes for the benchmark suite with the factory-based bulk seed engine.
+"""
+
+import random
+from dataclasses import dataclass, field
+
+from django.contrib.auth import get_user_model
+from graphql_jwt.refresh_token.shortcuts import create_refresh_token
+from graphql_jwt.shortcuts import get_token
+from packagehandling.factories import UserFactory
+from packagehandling.models import Consolidate, Package
+from packagehandling.seeding import SeedEngine
+
+BENCHMARK_ADMIN_EMAIL = "benchmark-admin@example.com"
+BENCHMARK_PASSWORD = "password"
+
+# Rows created per scale: clients, packages and consolidations per client (on average),
+# and the pool of unconsolidated packages reserved for the createConsolidate scenario.
+SCALES = {
+    "tiny": {"clients": 3, "packages_per_client": 5, "consolidates_per_client": 1, "consolidate_pool": 50},
+    "small": {"clients": 20, "packages_per_client": 25, "consolidates_per_client": 3, "consolidate_pool": 500},
+    "medium": {"clients": 100, "packages_per_client": 100, "consolidates_per_client": 10, "consolidate_pool": 2000},
+    "large": {"clients": 500, "packages_per_client": 200, "consolidates_per_client": 20, "consolidate_pool": 5000},
+}
+
+
+@dataclass
+class SeedResult:
+    """Handles to the seeded data that the scenarios need."""
+
+    admin: object
+    client_user: object
+    refresh_token: str
+    consolidate_pool: list[int] = field(default_factory=list)
+    counts: dict = field(default_factory=dict)
+
+    def admin_token(self):
+        return get_token(self.admin)
+
+    def client_token(self):
+        return get_token(self.client_user)
+
+
+def seed(scale="small", seed_value=42):
+    """
+    Populate the database with ``scale`` worth of clients, packages and
+    consolidations and return the handles the scenarios use.
+    """
+    if scale not in SCALES:
+        raise ValueError(f"Unknown scale '{scale}'. Valid values are {', '.join(SCALES)}.")
+    volumes = SCALES[scale]
+    random.seed(seed_value)
+
+    User = get_user_model()
+    admin = User.objects.filter(email=BENCHMARK_ADMIN_EMAIL).first()
+    if admin is None:
+        admin = UserFactory(email=BENCHMARK_ADMIN_EMAIL, is_superuser=True, is_staff=True, password=BENCHMARK_PASSWORD)
+
+    engine = SeedEngine(password=BENCHMARK_PASSWORD)
+    clients = engine.create_clients(volumes["clients"])
+    per_status = max(1, volumes["clients"] * volumes["consolidates_per_client"] // len(Consolidate.Status))
+    consolidates = []
+    for status, _ in Consolidate.Status.choices:
+        consolidates += engine.create_consolidates(clients, per_status, status=status)
+    # Roughly half of the packages are already consolidated, like production data.
+    engine.create_packages(volumes["clients"] * volumes["packages_per_client"], clients, consolidates)
+
+    # Packages reserved for createConsolidate: one per iteration, never shared with the read scenarios' client.
+    pool_client = engine.create_clients(1)[0]
+    engine.create_packages(volumes["consolidate_pool"], [pool_client], consolidated_ratio=0.0)
+    pool = list(Package.objects.filter(client=pool_client).values_list("pk", flat=True))
+
+    return SeedResult(
+        admin=admin,
+        client_user=clients[0].user,
+        refresh_token=create_refresh_token(admin).token,
+        consolidate_pool=pool,
+        counts={name: engine.stats[name] for name in ("clients", "consolidates", "packages")},
+    )
@@ -0,0 +1,58 @@
+"""
+Gunicorn production profile.
+
+Every setting can be overridden with an environment variable, so the same file
+serves Railway, Docker and the benchmark suite:
+
+    GUNICORN_WORKER_CLASS  sync (default), gthread or gevent; uvicorn.workers.UvicornWorker
+                           for the ASGI app (nbxdjango.asgi:application)
+    WEB_CONCURRENCY        worker processes (default derived from the CPU count)
+    GUNICORN_THREADS       threads per gthread worker (default: 4)
+    GUNICORN_WORKER_CONNECTIONS  concurrent greenlets per gevent worker (default: 100)
+    GUNICORN_TIMEOUT       worker timeout in seconds (default: 30)
+    GUNICORN_MAX_REQUESTS  recycle workers after this many requests (default: 1000, 0 disables)
+    GUNICORN_ACCESS_LOG    access log target (default: "-" for stdout, empty disables)
+    PORT                   port to bind on 0.0.0.0 (default: 8000)
+
+Each worker holds at most ``threads`` (gthread) or ``worker_connections``
+(gevent) database connections, so ``workers x that`` must stay below the
+PostgreSQL (or PgBouncer) connection limit. See DEPLOYMENT.md.
+"""
+
+import multiprocessing
+import os
+
+cpu_count = multiprocessing.cpu_count()
+
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+
+if worker_class == "gthread":
+    default_workers = cpu_count + 1
+elif worker_class == "gevent" or worker_class.startswith("uvicorn"):
+    default_workers = cpu_count
+else:
+    default_workers = cpu_count * 2 + 1
+
+workers = int(os.environ.get("WEB_CONCURRENCY", default_workers))
+threads = int(os.environ.get("GUNICORN_THREADS", 4 if worker_class == "gthread" else 1))
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 100))
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = timeout
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# Recycle workers periodically (with jitter so they don't all restart at once) to bound memory growth.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    # Database connections must never be shared across forked workers.
+    from django.db import connections
+
+    connections.close_all()
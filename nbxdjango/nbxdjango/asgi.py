@@ -12,5 +12,24 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "nbxdjango.settings")
+os.environ.setdefault("GRAPHQL_ASYNC", "True")
 
-application = get_asgi_application()
+# Initialize Django before importing anything that touches models.
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import OriginValidator  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.urls import path  # noqa: E402
+from packagehandling.consumers import GraphQLSubscriptionConsumer  # noqa: E402
+
+application = ProtocolTypeRouter(
+    {
+        "http": django_asgi_app,
+        # GraphQL subscriptions share the /graphql path with queries and mutations.
+        "websocket": OriginValidator(
+            URLRouter([path("graphql", GraphQLSubscriptionConsumer.as_asgi())]),
+            settings.CORS_ALLOWED_ORIGINS,
+        ),
+    }
+)
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import datetime
+import json
 import os
 from pathlib import Path
 
@@ -101,14 +102,47 @@ WSGI_APPLICATION = "nbxdjango.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Django 4.2 has no built-in connection pool, so production pools through PgBouncer
+# (see DEPLOYMENT.md). Set DATABASE_POOLER=pgbouncer when DATABASE_URL points at a
+# transaction-mode PgBouncer: server-side cursors do not survive across its transactions.
+# gevent workers hold a connection per greenlet that is never reused, so they default to
+# closing connections at the end of each request instead of keeping them alive.
+DATABASE_POOLER = os.environ.get("DATABASE_POOLER", "")
+DATABASE_CONN_MAX_AGE = int(
+    os.environ.get("DATABASE_CONN_MAX_AGE", 0 if os.environ.get("GUNICORN_WORKER_CLASS") == "gevent" else 600)
+)
+
 DATABASES = {
     "default": dj_database_url.config(
-        conn_max_age=600,
+        conn_max_age=DATABASE_CONN_MAX_AGE,
         conn_health_checks=True,
         default=os.environ.get("DATABASE_URL"),
     )
 }
 
+# Read replica (packagehandling.routing). With DATABASE_REPLICA_URL set, GraphQL queries read
+# from it; everything else, and a user's queries for REPLICA_STICKY_SECONDS after their last
+# mutation, use the primary. Stickiness is tracked in the cache: set CACHE_REDIS_URL to share
+# it between processes.
+if os.environ.get("DATABASE_REPLICA_URL"):
+    DATABASES["replica"] = dj_database_url.parse(
+        os.environ["DATABASE_REPLICA_URL"], conn_max_age=DATABASE_CONN_MAX_AGE, conn_health_checks=True
+    )
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+DATABASE_REPLICA_ALIAS = "replica" if "replica" in DATABASES else None
+DATABASE_ROUTERS = ["packagehandling.routing.ReplicaRouter"]
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 5))
+
+if DATABASE_POOLER == "pgbouncer":
+    for database in DATABASES.values():
+        database["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+# Monthly range partitioning of the package and consolidation tables by created_at
+# (packagehandling.partitioning, PostgreSQL only). The daily ensure_partitions schedule
+# keeps partitions created PARTITION_MONTHS_AHEAD months ahead.
+DB_PARTITIONING = os.environ.get("DB_PARTITIONING", "False").lower() == "true"
+PARTITION_MONTHS_AHEAD = int(os.environ.get("PARTITION_MONTHS_AHEAD", 3))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -161,8 +195,38 @@ GRAPHENE = {
     "MIDDLEWARE": [
         "graphql_jwt.middleware.JSONWebTokenMiddleware",
     ],
+    # Each mutation commits together with the outbox events its changes write.
+    "ATOMIC_MUTATIONS": True,
 }
 
+# Serve /graphql with AsyncGraphQLView (set by nbxdjango/asgi.py). Top-level query fields
+# then resolve concurrently on a pool of GRAPHQL_ASYNC_WORKERS database threads per process.
+GRAPHQL_ASYNC = os.environ.get("GRAPHQL_ASYNC", "False").lower() == "true"
+GRAPHQL_ASYNC_WORKERS = int(os.environ.get("GRAPHQL_ASYNC_WORKERS", 4))
+
+# Limits on a single GraphQL operation (packagehandling.schema.validation), checked before it
+# runs: nested field levels, aliased fields, and its estimated cost, where list fields multiply
+# their items by pageSize / limit, or by GRAPHQL_DEFAULT_LIST_SIZE when they have neither.
+# Costing stops after GRAPHQL_MAX_SELECTIONS fields and fragments, rejecting the operation.
+GRAPHQL_MAX_DEPTH = int(os.environ.get("GRAPHQL_MAX_DEPTH", 10))
+GRAPHQL_MAX_ALIASES = int(os.environ.get("GRAPHQL_MAX_ALIASES", 20))
+GRAPHQL_MAX_COST = int(os.environ.get("GRAPHQL_MAX_COST", 5000))
+GRAPHQL_DEFAULT_LIST_SIZE = int(os.environ.get("GRAPHQL_DEFAULT_LIST_SIZE", 20))
+GRAPHQL_MAX_SELECTIONS = int(os.environ.get("GRAPHQL_MAX_SELECTIONS", 1000))
+
+# Channel layer carrying GraphQL subscription events between processes. The in-memory
+# layer only reaches subscribers in the same process; multi-worker deployments set
+# CHANNEL_LAYER_REDIS_URL (requires channels-redis).
+if os.environ.get("CHANNEL_LAYER_REDIS_URL"):
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {"hosts": [os.environ["CHANNEL_LAYER_REDIS_URL"]]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
 AUTHENTICATION_BACKENDS = [
     "graphql_jwt.backends.JSONWebTokenBackend",
     "packagehandling.authentication.EmailBackend",
@@ -185,20 +249,96 @@ ANYMAIL = {
 
 DEFAULT_FROM_EMAIL = "noreply@yourdomain.com"
 
+# How long an idempotent email (utils.send_email(..., idempotency=...)) blocks an identical resend.
+EMAIL_IDEMPOTENCY_TTL_HOURS = int(os.environ.get("EMAIL_IDEMPOTENCY_TTL_HOURS", 24))
+
 # Narbox Logo URL for email templates
 # Set this to your publicly hosted logo URL, e.g.,
 # "https://yourdomain.com/static/packagehandling/images/narbox-logo.png"
 NARBOX_LOGO_URL = os.environ.get("NARBOX_LOGO_URL", "")
 
+# Django-Q2 cluster. Q_BROKER picks the broker profile:
+#   orm   - the database queue (default); workers poll it every Q_POLL seconds.
+#   redis - a Redis list at Q_REDIS_URL (requires the `redis` package); workers block
+#           on it instead of polling, which scales to bursts of hundreds of tasks.
+# Every other key can be tuned from the environment; the defaults depend on the profile.
+Q_BROKER = os.environ.get("Q_BROKER", "orm")
+if Q_BROKER not in ("orm", "redis"):
+    raise ValueError("Q_BROKER must be 'orm' or 'redis'.")
+_q_redis = Q_BROKER == "redis"
 Q_CLUSTER = {
+    # Shared by every cluster of the site (it signs task packages); a worker picks its
+    # lane from ALT_CLUSTERS with django-q's own Q_CLUSTER_NAME variable instead.
     "name": "DjangORM",
-    "workers": 4,
-    "timeout": 90,
-    "retry": 120,
-    "queue_limit": 50,
-    "bulk": 10,
-    "orm": "default",
+    "workers": int(os.environ.get("Q_WORKERS", 4)),
+    "timeout": int(os.environ.get("Q_TIMEOUT", 90)),
+    "retry": int(os.environ.get("Q_RETRY", 120)),
+    "queue_limit": int(os.environ.get("Q_QUEUE_LIMIT", 200 if _q_redis else 50)),
+    "bulk": int(os.environ.get("Q_BULK", 1 if _q_redis else 10)),
+    "recycle": int(os.environ.get("Q_RECYCLE", 500)),
+    "max_attempts": int(os.environ.get("Q_MAX_ATTEMPTS", 0)),  # 0 retries until success
+    "save_limit": int(os.environ.get("Q_SAVE_LIMIT", 250)),
 }
+if _q_redis:
+    Q_CLUSTER["redis"] = os.environ.get("Q_REDIS_URL", "redis://localhost:6379/0")
+else:
+    Q_CLUSTER["orm"] = "default"
+    Q_CLUSTER["poll"] = float(os.environ.get("Q_POLL", 0.2))
+
+# Priority lanes (packagehandling.lanes). Each lane is a separate queue served by its own
+# cluster, started with `Q_CLUSTER_NAME=<lane> python manage.py qcluster`:
+#   transactional - auth mail (password resets); small prefetch, fast polling.
+#   bulk          - notification batches; few workers, paced by BULK_LANE_MIN_INTERVAL_SECONDS.
+# Q_LANES lists the lanes whose cluster is deployed; tasks for any other lane stay on the
+# default queue, so nothing is stranded before the lane workers exist.
+Q_LANES = [lane.strip() for lane in os.environ.get("Q_LANES", "").split(",") if lane.strip()]
+Q_CLUSTER["ALT_CLUSTERS"] = {
+    "transactional": {
+        "workers": int(os.environ.get("Q_TRANSACTIONAL_WORKERS", 2)),
+        "queue_limit": int(os.environ.get("Q_TRANSACTIONAL_QUEUE_LIMIT", 4)),
+        "bulk": 1,
+        "timeout": 30,
+        "retry": 60,
+        **({} if _q_redis else {"poll": 0.05}),
+    },
+    "bulk": {
+        "workers": int(os.environ.get("Q_BULK_LANE_WORKERS", 1)),
+        "queue_limit": int(os.environ.get("Q_BULK_LANE_QUEUE_LIMIT", 10)),
+    },
+}
+BULK_LANE_MIN_INTERVAL_SECONDS = float(os.environ.get("BULK_LANE_MIN_INTERVAL_SECONDS", 0.5))
+
+# Client deletion (packagehandling.deletion): ids deleted per transaction, and the package
+# count up to which deleteClient finishes within the request instead of in a django-q task.
+CLIENT_DELETE_CHUNK_SIZE = int(os.environ.get("CLIENT_DELETE_CHUNK_SIZE", 2000))
+CLIENT_DELETE_INLINE_LIMIT = int(os.environ.get("CLIENT_DELETE_INLINE_LIMIT", 500))
+
+# Archival tier (packagehandling.archive): consolidations delivered or cancelled more than
+# ARCHIVE_AFTER_DAYS days ago move, with their packages, to the archive tables, in batches
+# of ARCHIVE_BATCH_SIZE consolidations per transaction.
+ARCHIVE_AFTER_DAYS = int(os.environ.get("ARCHIVE_AFTER_DAYS", 180))
+ARCHIVE_BATCH_SIZE = int(os.environ.get("ARCHIVE_BATCH_SIZE", 500))
+
+# Shared cache (admin filter choices). Without CACHE_REDIS_URL each process keeps its own
+# in-memory cache; set it (requires the `redis` package) to share one across workers.
+if os.environ.get("CACHE_REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["CACHE_REDIS_URL"],
+        }
+    }
+
+# Admin changelists (packagehandling.admin): how long filter choices are cached, and the
+# table size above which unfiltered PostgreSQL lists show the planner's row estimate.
+ADMIN_FILTER_CACHE_SECONDS = int(os.environ.get("ADMIN_FILTER_CACHE_SECONDS", 600))
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.environ.get("ADMIN_ESTIMATED_COUNT_THRESHOLD", 100000))
+
+# consolidateStatusDwellTimes (packagehandling.status_history): how long the averages are cached.
+STATUS_DWELL_CACHE_SECONDS = int(os.environ.get("STATUS_DWELL_CACHE_SECONDS", 300))
+
+# Per-task timings recorded for `manage.py qstats` / the queueStats query.
+TASK_METRICS_RETENTION_HOURS = int(os.environ.get("TASK_METRICS_RETENTION_HOURS", 48))
 
 # CORS Configuration
 # Comma-separated list of allowed origins, e.g., "http://localhost:3000,https://app.example.com"
@@ -210,11 +350,33 @@ CORS_ALLOWED_ORIGINS = [
 ]
 CORS_ALLOW_CREDENTIALS = True
 
+# Incremental sync (packagesUpdatedSince / consolidatesUpdatedSince): syncedAt lags the clock by
+# this much, so rows saved by transactions that commit after the read are picked up next time.
+SYNC_SETTLE_SECONDS = int(os.environ.get("SYNC_SETTLE_SECONDS", 5))
+
+# Partner webhooks (packagehandling.outbox), configured as WebhookEndpoint rows in the admin
+WEBHOOK_BATCH_SIZE = int(os.environ.get("WEBHOOK_BATCH_SIZE", 100))
+WEBHOOK_TIMEOUT_SECONDS = int(os.environ.get("WEBHOOK_TIMEOUT_SECONDS", 10))
+WEBHOOK_DISPATCH_WORKERS = int(os.environ.get("WEBHOOK_DISPATCH_WORKERS", 8))
+WEBHOOK_RETRY_BASE_SECONDS = int(os.environ.get("WEBHOOK_RETRY_BASE_SECONDS", 30))
+WEBHOOK_RETRY_MAX_SECONDS = int(os.environ.get("WEBHOOK_RETRY_MAX_SECONDS", 3600))
+OUTBOX_SETTLE_SECONDS = int(os.environ.get("OUTBOX_SETTLE_SECONDS", 5))
+OUTBOX_RETENTION_DAYS = int(os.environ.get("OUTBOX_RETENTION_DAYS", 7))
+
+# Pricing engine (packagehandling.pricing). The rate table is a JSON list of
+# [max billable kg, price per kg] brackets, the last one with no maximum (null).
+PRICING_RATE_TABLE = json.loads(os.environ.get("PRICING_RATE_TABLE", "[[5, 8.0], [20, 6.5], [null, 5.0]]"))
+PRICING_VOLUMETRIC_DIVISOR = float(os.environ.get("PRICING_VOLUMETRIC_DIVISOR", 5000))  # cm³ per kg
+PRICING_WEIGHT_INCREMENT_KG = float(os.environ.get("PRICING_WEIGHT_INCREMENT_KG", 0.5))
+PRICING_MINIMUM_CHARGE = float(os.environ.get("PRICING_MINIMUM_CHARGE", 5.0))
+
 # Frontend URL for password reset links
 FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:3000")
 
 # Security settings for production
 SECURE_SSL_REDIRECT = not DEBUG
+# Platform health probes hit the container directly over plain HTTP.
+SECURE_REDIRECT_EXEMPT = [r"^health/"]
 SECURE_HSTS_SECONDS = 31536000 if not DEBUG else 0  # 1 year
 SECURE_HSTS_INCLUDE_SUBDOMAINS = not DEBUG
 SECURE_HSTS_PRELOAD = not DEBUG
@@ -19,9 +19,18 @@ from django.conf import settings
 from django.contrib import admin
 from django.urls import path
 from django.views.decorators.csrf import csrf_exempt
-from graphene_django.views import GraphQLView
+from packagehandling.views import (
+    AsyncGraphQLView,
+    RoutedGraphQLView,
+    health_check,
+    liveness_check,
+)
+
+graphql_view_class = AsyncGraphQLView if settings.GRAPHQL_ASYNC else RoutedGraphQLView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("graphql", csrf_exempt(GraphQLView.as_view(graphiql=settings.DEBUG))),
+    path("graphql", csrf_exempt(graphql_view_class.as_view(graphiql=settings.DEBUG))),
+    path("health/", health_check, name="health"),
+    path("health/live/", liveness_check, name="health-live"),
 ]
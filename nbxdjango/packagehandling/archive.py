@@ -0,0 +1,117 @@
+"""
+Archival tier for closed consolidations.
+
+Consolidations delivered or cancelled (and not edited since) more than
+``ARCHIVE_AFTER_DAYS`` days ago are moved, with their packages, out of the hot
+``Consolidate`` / ``Package`` tables into ``ArchivedConsolidate`` /
+``ArchivedPackage``, so the tables and indexes that ``allPackages``,
+``allConsolidates`` and the dashboard scan only hold the working set.
+``archive_consolidations`` (scheduled daily) moves them in batches of
+``ARCHIVE_BATCH_SIZE`` consolidations, one transaction per batch.
+
+Archived rows keep their ids, so sync clients and webhooks see nothing
+deleted, and the status history (``status_history``) still applies.
+``Client.package_count`` counts the working set only. Read queries leave the
+archive out unless asked (``includeArchived``), in which case
+``paginate_with_archive`` merges both tables in one ``UNION ALL``.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Value
+from django.utils import timezone
+
+from .models import ArchivedConsolidate, ArchivedPackage, Client, Consolidate, Package
+
+ARCHIVED_STATUSES = (Consolidate.Status.DELIVERED, Consolidate.Status.CANCELLED)
+
+
+def _shared_columns(model, archive_model):
+    """Column attribute names of ``model`` that ``archive_model`` copies."""
+    archived = {field.attname for field in archive_model._meta.concrete_fields}
+    return [field.attname for field in model._meta.concrete_fields if field.attname in archived]
+
+
+def archivable(days=None):
+    """Consolidations closed (and untouched) for more than ``days`` (default ``ARCHIVE_AFTER_DAYS``)."""
+    cutoff = timezone.now() - timedelta(days=settings.ARCHIVE_AFTER_DAYS if days is None else days)
+    # created_at <= updated_at: the redundant bound lets a partitioned table skip recent months.
+    return Consolidate.objects.filter(status__in=ARCHIVED_STATUSES, updated_at__lt=cutoff, created_at__lt=cutoff)
+
+
+def archive_batch(consolidates):
+    """
+    Move ``consolidates`` (a queryset; rows edited or reopened since are
+    skipped by re-filtering it under lock) and their packages to the archive
+    tables. Returns ``(consolidates, packages)`` moved.
+    """
+    with transaction.atomic():
+        rows = list(consolidates.select_for_update().values(*_shared_columns(Consolidate, ArchivedConsolidate)))
+        if not rows:
+            return 0, 0
+        ids = [row["id"] for row in rows]
+        packages = Package.objects.filter(consolidate_id__in=ids)
+        package_rows = list(packages.values(*_shared_columns(Package, ArchivedPackage)))
+
+        ArchivedConsolidate.objects.bulk_create([ArchivedConsolidate(**row) for row in rows])
+        ArchivedPackage.objects.bulk_create([ArchivedPackage(**row) for row in package_rows])
+        for group in packages.order_by().values("client_id").annotate(moved=Count("id")):
+            Client.objects.filter(pk=group["client_id"]).update(package_count=F("package_count") - group["moved"])
+
+        # The rows live on in the archive: no tombstones, outbox events or Consolidate pre_delete handling.
+        packages._raw_delete(packages.db)
+        closed = Consolidate.objects.filter(pk__in=ids)
+        closed._raw_delete(closed.db)
+    return len(rows), len(package_rows)
+
+
+def archive_consolidations(days=None, batch_size=None, dry_run=False):
+    """
+    Archive every ``archivable`` consolidation, ``batch_size`` (default
+    ``ARCHIVE_BATCH_SIZE``) at a time. Returns how many consolidations and
+    packages were (or, with ``dry_run``, would be) moved. Scheduled daily.
+    """
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    candidates = archivable(days)
+    if dry_run:
+        return {
+            "consolidates": candidates.count(),
+            "packages": Package.objects.filter(consolidate__in=candidates).count(),
+        }
+
+    moved = {"consolidates": 0, "packages": 0}
+    while True:
+        ids = list(candidates.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return moved
+        consolidates, packages = archive_batch(candidates.filter(pk__in=ids))
+        if not consolidates:
+            return moved
+        moved["consolidates"] += consolidates
+        moved["packages"] += packages
+
+
+def paginate_with_archive(hot, archived, ordering, start, end):
+    """
+    Rows ``start:end`` of ``hot`` and ``archived`` (querysets of a hot model and
+    its archive, filtered alike) merged in ``ordering`` (field names, or
+    ``F()`` orderings of selected columns). The page's ids come from one
+    ``UNION ALL``; the rows from one query per table. Returns ``(items, total_count)``.
+    """
+    columns = []
+    for term in ordering:
+        name = term.lstrip("-") if isinstance(term, str) else term.expression.name
+        if name not in columns:
+            columns.append(name)
+
+    def keys(queryset, is_archived):
+        return queryset.order_by().annotate(archived=Value(is_archived)).values_list("pk", "archived", *columns)
+
+    page = list(keys(hot, False).union(keys(archived, True), all=True).order_by(*ordering, "pk")[start:end])
+    rows = {
+        False: hot.in_bulk([pk for pk, is_archived, *_ in page if not is_archived]),
+        True: archived.in_bulk([pk for pk, is_archived, *_ in page if is_archived]),
+    }
+    return [rows[bool(is_archived)][pk] for pk, is_archived, *_ in page], hot.count() + archived.count()
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from graphql import ExecutionResult, GraphQLError, parse, subscribe, validate
+from graphql_jwt.exceptions import JSONWebTokenError
+from graphql_jwt.shortcuts import get_user_by_token
+
+from .graphql_schema import schema
+from .models import Client
+from .schema.validation import query_limit_rules
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL = "graphql-transport-ws"
+
+
+@database_sync_to_async
+def _authenticate(token):
+    user = get_user_by_token(token)
+    client_id = Client.objects.filter(user=user).values_list("pk", flat=True).first()
+    return user, client_id
+
+
+class GraphQLSubscriptionConsumer(AsyncJsonWebsocketConsumer):
+    """
+    GraphQL subscriptions over the ``graphql-transport-ws`` protocol.
+
+    The JWT is sent once in the ``connection_init`` payload
+    (``{"Authorization": "JWT <token>"}``); every ``subscribe`` message then
+    starts one operation whose events are pushed as ``next`` messages until
+    the client sends ``complete`` or disconnects.
+    """
+
+    async def connect(self):
+        if PROTOCOL not in self.scope.get("subprotocols", []):
+            await self.close(code=4406)
+            return
+        self.context = None
+        self.operations = {}
+        await self.accept(subprotocol=PROTOCOL)
+
+    async def disconnect(self, code):
+        for task in getattr(self, "operations", {}).values():
+            task.cancel()
+
+    async def receive_json(self, message, **kwargs):
+        message_type = message.get("type")
+        if message_type == "connection_init":
+            await self._connection_init(message.get("payload") or {})
+        elif message_type == "ping":
+            await self.send_json({"type": "pong"})
+        elif message_type == "pong":
+            pass
+        elif self.context is None:
+            await self.close(code=4401)
+        elif message_type == "subscribe":
+            await self._subscribe(message.get("id"), message.get("payload") or {})
+        elif message_type == "complete":
+            task = self.operations.pop(message.get("id"), None)
+            if task:
+                task.cancel()
+        else:
+            await self.close(code=4400)
+
+    async def _connection_init(self, payload):
+        if self.context is not None:
+            await self.close(code=4429)
+            return
+        authorization = payload.get("Authorization") or payload.get("authorization") or ""
+        prefix, _, token = authorization.partition(" ")
+        if prefix != "JWT" or not token:
+            await self.close(code=4403)
+            return
+        try:
+            user, client_id = await _authenticate(token)
+        except JSONWebTokenError:
+            await self.close(code=4403)
+            return
+        self.context = SimpleNamespace(user=user, client_id=client_id)
+        await self.send_json({"type": "connection_ack"})
+
+    async def _subscribe(self, operation_id, payload):
+        if not operation_id or operation_id in self.operations:
+            await self.close(code=4409)
+            return
+        try:
+            document = parse(payload.get("query") or "")
+        except GraphQLError as error:
+            await self._send_errors(operation_id, [error])
+            return
+        errors = validate(schema.graphql_schema, document, query_limit_rules(payload.get("variables")))
+        if errors:
+            await self._send_errors(operation_id, errors)
+            return
+
+        result = await subscribe(
+            schema.graphql_schema,
+            document,
+            context_value=self.context,
+            variable_values=payload.get("variables"),
+            operation_name=payload.get("operationName"),
+        )
+        if isinstance(result, ExecutionResult):
+            await self._send_errors(operation_id, result.errors)
+            return
+        self.operations[operation_id] = asyncio.create_task(self._stream(operation_id, result))
+
+    async def _stream(self, operation_id, results):
+        try:
+            async for result in results:
+                await self.send_json({"type": "next", "id": operation_id, "payload": result.formatted})
+            await self.send_json({"type": "complete", "id": operation_id})
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Subscription %s failed", operation_id)
+            await self.send_json({"type": "complete", "id": operation_id})
+        finally:
+            self.operations.pop(operation_id, None)
+            await results.aclose()
+
+    async def _send_errors(self, operation_id, errors):
+        await self.send_json({"type": "error", "id": operation_id, "payload": [error.formatted for error in errors]})
@@ -0,0 +1,202 @@
+"""
+Cached package counters on ``Client`` and ``Consolidate``.
+
+``Client.package_count`` / ``unconsolidated_count`` and
+``Consolidate.package_count`` / ``total_weight`` (kg) / ``total_service_price``
+are kept current with ``F()`` increments, so concurrent writers never
+overwrite each other's changes. Every counter write also bumps ``updated_at``,
+so the sync feeds resend the changed rows:
+
+- saving a package moves its contribution from where it was loaded to where
+  it is saved (``signals.update_package_counters``);
+- deleting a package, one by one or through a queryset (the admin's bulk
+  delete), takes its contribution away (``signals.remove_package_from_counters``);
+- ``Consolidate.set_packages()`` and deleting a consolidation move whole
+  package sets with one aggregate per (client, consolidation) pair.
+
+Writes that bypass all of these (``bulk_create``, ``COPY``, queryset
+``update()``, ``_raw_delete()``, raw SQL) must call ``recompute_counters``, which is
+also what ``repair_counters`` (``manage.py repair_counters``, and a daily
+schedule) runs over every row. Deleting a client needs nothing:
+its packages and consolidations go with it.
+"""
+
+from collections import namedtuple
+
+from django.db import transaction
+from django.db.models import (
+    Count,
+    F,
+    FloatField,
+    IntegerField,
+    Max,
+    Min,
+    OuterRef,
+    Q,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Client, Consolidate, Package
+from .models.package import COUNTED_FIELDS
+from .totals import package_total_aggregates
+from .units import weight_in_kg
+
+# What one package adds to its client's and consolidation's counters.
+Contribution = namedtuple("Contribution", ["client_id", "consolidate_id", "weight", "service_price"])
+
+
+def contribution(counted):
+    """What a package with the ``Package.COUNTED_FIELDS`` values ``counted`` adds to the counters."""
+    return Contribution(
+        counted["client_id"],
+        counted["consolidate_id"],
+        weight_in_kg(counted["weight"], counted["weight_unit"]),
+        counted["service_price"] or 0.0,
+    )
+
+
+def _add(moved, sign, count=1):
+    now = timezone.now()
+    clients = Client.objects.filter(pk=moved.client_id)
+    if moved.consolidate_id is None:
+        clients.update(
+            package_count=F("package_count") + sign * count,
+            unconsolidated_count=F("unconsolidated_count") + sign * count,
+            updated_at=now,
+        )
+        return
+    clients.update(package_count=F("package_count") + sign * count, updated_at=now)
+    Consolidate.objects.filter(pk=moved.consolidate_id).update(
+        package_count=F("package_count") + sign * count,
+        total_weight=F("total_weight") + sign * moved.weight,
+        total_service_price=F("total_service_price") + sign * moved.service_price,
+        updated_at=now,
+    )
+
+
+def package_saved(old, new):
+    """Move a package's contribution from ``old`` (None when created) to ``new`` (``COUNTED_FIELDS`` values)."""
+    if old == new:
+        return
+    if old is not None:
+        _add(contribution(old), -1)
+    _add(contribution(new), +1)
+
+
+def stored_counted(package):
+    """``COUNTED_FIELDS`` of the package's stored row: as loaded, or read back when they were deferred."""
+    if getattr(package, "loaded_counted", None) is not None:
+        return package.loaded_counted
+    return Package.objects.filter(pk=package.pk).values(*COUNTED_FIELDS).first()
+
+
+def package_deleted(counted):
+    _add(contribution(counted), -1)
+
+
+def move_packages(packages, consolidate_id):
+    """
+    Counter side of moving ``packages`` (a queryset, evaluated before the move)
+    into ``consolidate_id`` (None to detach them). One aggregate per
+    (client, current consolidation) pair.
+    """
+    groups = (
+        packages.exclude(consolidate_id=consolidate_id)
+        .order_by()
+        .values("client_id", "consolidate_id")
+        .annotate(**package_total_aggregates())
+    )
+    for group in groups:
+        moved = Contribution(group["client_id"], group["consolidate_id"], group["total_weight"], group["total_cost"])
+        _add(moved, -1, count=group["package_count"])
+        _add(moved._replace(consolidate_id=consolidate_id), +1, count=group["package_count"])
+
+
+def client_counter_values():
+    """Set-based expressions recomputing the ``Client`` counters from its packages."""
+    packages = Package.objects.filter(client=OuterRef("pk")).order_by().values("client")
+    return {
+        "package_count": Coalesce(
+            Subquery(packages.annotate(value=Count("id")).values("value"), output_field=IntegerField()), 0
+        ),
+        "unconsolidated_count": Coalesce(
+            Subquery(
+                packages.filter(consolidate__isnull=True).annotate(value=Count("id")).values("value"),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+    }
+
+
+def consolidate_counter_values():
+    """Set-based expressions recomputing the ``Consolidate`` counters from its packages."""
+    packages = Package.objects.filter(consolidate=OuterRef("pk")).order_by().values("consolidate")
+    aggregates = package_total_aggregates()
+
+    def per_consolidate(aggregate, output_field, default):
+        value = packages.annotate(value=aggregate).values("value")
+        return Coalesce(Subquery(value, output_field=output_field), default)
+
+    return {
+        "package_count": per_consolidate(aggregates["package_count"], IntegerField(), 0),
+        "total_weight": per_consolidate(aggregates["total_weight"], FloatField(), 0.0),
+        "total_service_price": per_consolidate(aggregates["total_cost"], FloatField(), 0.0),
+    }
+
+
+def _drifted(queryset, values, tolerance=1e-6):
+    """Rows of ``queryset`` whose stored counters differ from ``values``."""
+    actual = {f"actual_{name}": expression for name, expression in values.items()}
+    drift = Q()
+    for name, expression in values.items():
+        if isinstance(expression.output_field, FloatField):
+            drift |= Q(**{f"{name}__gt": F(f"actual_{name}") + tolerance})
+            drift |= Q(**{f"{name}__lt": F(f"actual_{name}") - tolerance})
+        else:
+            drift |= ~Q(**{name: F(f"actual_{name}")})
+    return queryset.annotate(**actual).filter(drift)
+
+
+def recompute_counters(clients=None, consolidates=None, dry_run=False):
+    """
+    Recompute the counters of ``clients`` and ``consolidates`` (querysets,
+    default: every row) with one ``UPDATE ... SET counter = (SELECT ...)`` per
+    table, touching only the rows that drifted. Returns how many rows of each
+    table were (or, with ``dry_run``, would be) corrected.
+    """
+    clients = Client.objects.all() if clients is None else clients
+    consolidates = Consolidate.objects.all() if consolidates is None else consolidates
+    repaired = {}
+    for name, queryset, values in (
+        ("clients", clients, client_counter_values()),
+        ("consolidates", consolidates, consolidate_counter_values()),
+    ):
+        drifted = queryset.filter(pk__in=_drifted(queryset, values).values("pk"))
+        repaired[name] = drifted.count() if dry_run else drifted.update(**values, updated_at=timezone.now())
+    return repaired
+
+
+def repair_counters(batch_size=10000, dry_run=False):
+    """
+    ``recompute_counters`` over every client and consolidation, one id range
+    per transaction so neither table is locked for the whole repair. Scheduled
+    daily by ``setup_schedules``.
+    """
+    repaired = {"clients": 0, "consolidates": 0}
+    for name, model in (("clients", Client), ("consolidates", Consolidate)):
+        bounds = model.objects.aggregate(low=Min("pk"), high=Max("pk"))
+        if bounds["low"] is None:
+            continue
+        for start in range(bounds["low"], bounds["high"] + 1, batch_size):
+            chunk = model.objects.filter(pk__gte=start, pk__lt=start + batch_size)
+            with transaction.atomic():
+                result = recompute_counters(
+                    clients=chunk if model is Client else Client.objects.none(),
+                    consolidates=chunk if model is Consolidate else Consolidate.objects.none(),
+                    dry_run=dry_run,
+                )
+            repaired[name] += result[name]
+    return repaired
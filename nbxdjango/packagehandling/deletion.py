@@ -0,0 +1,127 @@
+"""
+Bulk client deletion.
+
+Deleting a client through ``Client.delete()`` makes Django's deletion
+collector load every consolidation and package of the client into memory to
+cascade and send signals, which times out for clients with tens of thousands
+of packages. ``start_client_deletion`` records a ``ClientDeletionJob`` and
+``run_client_deletion`` works through it instead:
+
+1. packages, then consolidations (archived ones first), are deleted in chunks of
+   ``CLIENT_DELETE_CHUNK_SIZE`` ids with set-based ``DELETE`` statements, each
+   chunk in its own transaction together with its sync tombstones, webhook
+   events, the consolidations' status history and the job's progress counters;
+2. the now empty client is deleted, or its user when ``delete_user`` is set.
+
+Small clients (up to ``CLIENT_DELETE_INLINE_LIMIT`` packages) are deleted
+within the request; larger ones in a django-q task. The user account is
+deactivated as soon as the deletion is requested. A failed job can be run
+again: it resumes with whatever is left.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import lanes, outbox
+from .models import (
+    ArchivedConsolidate,
+    ArchivedPackage,
+    Client,
+    ClientDeletionJob,
+    Consolidate,
+    ConsolidateStatusEvent,
+    DeletionLog,
+    Package,
+)
+
+# (model, tombstone type, job progress field) in deletion order: packages before the consolidations they point to.
+DELETION_ORDER = (
+    (ArchivedPackage, DeletionLog.ObjectType.PACKAGE, "packages_deleted"),
+    (Package, DeletionLog.ObjectType.PACKAGE, "packages_deleted"),
+    (ArchivedConsolidate, DeletionLog.ObjectType.CONSOLIDATE, "consolidates_deleted"),
+    (Consolidate, DeletionLog.ObjectType.CONSOLIDATE, "consolidates_deleted"),
+)
+
+
+def start_client_deletion(client, delete_user=False, requested_by=None):
+    """
+    Deactivate ``client``'s user and delete the client, inline or in the
+    background depending on its size. Returns the ``ClientDeletionJob``; a
+    deletion already under way for the client is returned instead of a new one.
+    """
+    unfinished = [ClientDeletionJob.Status.PENDING, ClientDeletionJob.Status.RUNNING]
+    job = ClientDeletionJob.objects.filter(client_id=client.pk, status__in=unfinished).first()
+    if job is not None:
+        return job
+
+    with transaction.atomic():
+        if client.user_id:
+            get_user_model().objects.filter(pk=client.user_id).update(is_active=False)
+        job = ClientDeletionJob.objects.create(
+            client_id=client.pk,
+            user_id=client.user_id,
+            delete_user=delete_user,
+            requested_by=requested_by,
+            packages_total=sum(
+                model.objects.filter(client_id=client.pk).count() for model in (Package, ArchivedPackage)
+            ),
+            consolidates_total=sum(
+                model.objects.filter(client_id=client.pk).count() for model in (Consolidate, ArchivedConsolidate)
+            ),
+        )
+
+    if job.packages_total <= settings.CLIENT_DELETE_INLINE_LIMIT:
+        return run_client_deletion(job.pk)
+    transaction.on_commit(lambda: lanes.enqueue("packagehandling.deletion.run_client_deletion", job.pk))
+    return job
+
+
+def _delete_chunks(job, model, object_type, progress_field, chunk_size):
+    rows = model.objects.filter(client_id=job.client_id).order_by("pk")
+    while True:
+        ids = list(rows.values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            return
+        chunk = model.objects.filter(client_id=job.client_id, pk__in=ids)
+        with transaction.atomic():
+            DeletionLog.record(object_type, chunk)
+            outbox.record_deletions(chunk)
+            if object_type == DeletionLog.ObjectType.CONSOLIDATE:
+                history = ConsolidateStatusEvent.objects.filter(consolidate_id__in=ids)
+                history._raw_delete(history.db)
+            # _raw_delete issues the DELETE without the collector: the client's packages are gone
+            # before its consolidations, so neither Consolidate's pre_delete handler nor the
+            # package cascades have anything left to do.
+            deleted = chunk._raw_delete(chunk.db)
+            ClientDeletionJob.objects.filter(pk=job.pk).update(**{progress_field: F(progress_field) + deleted})
+
+
+def run_client_deletion(job_id, chunk_size=None):
+    """Carry out (or resume) a ``ClientDeletionJob``. Runs as a django-q task for large clients."""
+    chunk_size = chunk_size or settings.CLIENT_DELETE_CHUNK_SIZE
+    job = ClientDeletionJob.objects.get(pk=job_id)
+    if job.status == ClientDeletionJob.Status.COMPLETED:
+        return job
+    ClientDeletionJob.objects.filter(pk=job.pk).update(
+        status=ClientDeletionJob.Status.RUNNING, started_at=job.started_at or timezone.now(), error=""
+    )
+
+    try:
+        for model, object_type, progress_field in DELETION_ORDER:
+            _delete_chunks(job, model, object_type, progress_field, chunk_size)
+        with transaction.atomic():
+            if job.delete_user and job.user_id:
+                get_user_model().objects.filter(pk=job.user_id).delete()  # the client goes with it
+            Client.objects.filter(pk=job.client_id).delete()
+    except Exception as error:
+        ClientDeletionJob.objects.filter(pk=job.pk).update(status=ClientDeletionJob.Status.FAILED, error=str(error))
+        raise
+
+    ClientDeletionJob.objects.filter(pk=job.pk).update(
+        status=ClientDeletionJob.Status.COMPLETED, finished_at=timezone.now()
+    )
+    job.refresh_from_db()
+    return job
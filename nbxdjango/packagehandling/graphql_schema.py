@@ -2,5 +2,6 @@ import graphene
 
 from .schema.mutations import Mutation
 from .schema.queries import Query
+from .schema.subscriptions import Subscription
 
-schema = graphene.Schema(query=Query, mutation=Mutation)
+schema = graphene.Schema(query=Query, mutation=Mutation, subscription=Subscription)
@@ -0,0 +1,65 @@
+"""
+Priority lanes for background tasks.
+
+Every lane is its own django-q queue with its own cluster (``ALT_CLUSTERS`` in
+settings), so a burst on one lane never delays another:
+
+- ``transactional``: mail a user is waiting for (password resets). Dedicated
+  workers with a small prefetch and fast polling.
+- ``bulk``: notification batches. Few workers, and every task waits at least
+  ``BULK_LANE_MIN_INTERVAL_SECONDS`` after the worker's previous one.
+- ``default``: everything else (webhook dispatch, maintenance schedules).
+
+A lane only gets its own queue once it is listed in ``Q_LANES``, i.e. once
+its cluster is deployed; until then its tasks run on the default queue.
+"""
+
+import time
+
+from django.conf import settings
+from django_q.brokers import get_broker
+from django_q.tasks import async_task
+
+DEFAULT = "default"
+TRANSACTIONAL = "transactional"
+BULK = "bulk"
+LANES = (DEFAULT, TRANSACTIONAL, BULK)
+
+_last_bulk_task = 0.0
+
+
+def cluster_for(lane):
+    """The django-q ``cluster`` option routing to ``lane``, or None for the default queue."""
+    if lane not in LANES:
+        raise ValueError(f"Unknown task lane: {lane}")
+    if lane != DEFAULT and lane in settings.Q_LANES:
+        return lane
+    return None
+
+
+def lane_of(task):
+    """The lane a task package was enqueued on."""
+    return task.get("cluster") or DEFAULT
+
+
+def enqueue(func, *args, lane=DEFAULT, **kwargs):
+    """``async_task`` on ``lane``."""
+    return async_task(func, *args, cluster=cluster_for(lane), **kwargs)
+
+
+def broker_for(lane):
+    return get_broker(cluster_for(lane))
+
+
+def throttle_bulk_lane(sender, func, task, **kwargs):
+    """
+    ``pre_execute`` receiver pacing bulk-lane tasks per worker process. It runs
+    before the task's execution is stamped, so the pause counts as queue wait.
+    """
+    global _last_bulk_task
+    if lane_of(task) != BULK:
+        return
+    wait = _last_bulk_task + settings.BULK_LANE_MIN_INTERVAL_SECONDS - time.monotonic()
+    if wait > 0:
+        time.sleep(wait)
+    _last_bulk_task = time.monotonic()
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from packagehandling.archive import archive_consolidations
+
+
+class Command(BaseCommand):
+    help = "Move long-closed consolidations and their packages to the archive tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Archive consolidations delivered or cancelled more than this many days ago "
+            "(default: ARCHIVE_AFTER_DAYS)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Consolidations moved per transaction (default: ARCHIVE_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count what would be archived",
+        )
+
+    def handle(self, *args, **options):
+        moved = archive_consolidations(
+            days=options["days"], batch_size=options["batch_size"], dry_run=options["dry_run"]
+        )
+        verb = "Would archive" if options["dry_run"] else "Archived"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {moved['consolidates']} consolidations and {moved['packages']} packages.")
+        )
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min, OuterRef, Q, Subquery
+from packagehandling.models import Consolidate, Package
+
+
+class Command(BaseCommand):
+    help = "One-off backfill of the denormalized Package.consolidate_status column"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of package ids updated per transaction (default: 10000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        bounds = Package.objects.aggregate(low=Min("pk"), high=Max("pk"))
+        if bounds["low"] is None:
+            self.stdout.write("No packages to backfill.")
+            return
+
+        consolidate_status = Subquery(Consolidate.objects.filter(pk=OuterRef("consolidate_id")).values("status")[:1])
+        updated = 0
+        for start in range(bounds["low"], bounds["high"] + 1, batch_size):
+            # Each id range is a short transaction, so the table is never locked for the whole backfill.
+            with transaction.atomic():
+                chunk = Package.objects.filter(pk__gte=start, pk__lt=start + batch_size)
+                updated += chunk.filter(consolidate__isnull=True, consolidate_status__isnull=False).update(
+                    consolidate_status=None
+                )
+                updated += (
+                    chunk.filter(consolidate__isnull=False)
+                    .exclude(Q(consolidate_status=consolidate_status))
+                    .update(consolidate_status=consolidate_status)
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled consolidate_status on {updated} packages."))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+from packagehandling.models import Package
+from packagehandling.units import (
+    length_in_cm_expression,
+    volume_in_cm3_expression,
+    weight_in_kg_expression,
+)
+
+
+class Command(BaseCommand):
+    help = "One-off backfill of the unit-normalised Package weight_kg / *_cm / volume_cm3 columns"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of package ids updated per transaction (default: 10000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        bounds = Package.objects.aggregate(low=Min("pk"), high=Max("pk"))
+        if bounds["low"] is None:
+            self.stdout.write("No packages to backfill.")
+            return
+
+        # NULL measurements stay NULL: every branch of the conversion multiplies the typed-in value.
+        normalized = {
+            "weight_kg": weight_in_kg_expression(),
+            "length_cm": length_in_cm_expression("length"),
+            "width_cm": length_in_cm_expression("width"),
+            "height_cm": length_in_cm_expression("height"),
+            "volume_cm3": volume_in_cm3_expression(),
+        }
+        updated = 0
+        for start in range(bounds["low"], bounds["high"] + 1, batch_size):
+            # Each id range is a short transaction, so the table is never locked for the whole backfill.
+            with transaction.atomic():
+                updated += Package.objects.filter(pk__gte=start, pk__lt=start + batch_size).update(**normalized)
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled normalised measurements on {updated} packages."))
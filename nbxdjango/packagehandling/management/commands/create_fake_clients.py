@@ -1,5 +1,5 @@
 from django.core.management.base import BaseCommand
-from packagehandling.factories import ClientFactory
+from packagehandling.seeding import SeedEngine
 
 
 class Command(BaseCommand):
@@ -17,7 +17,7 @@ class Command(BaseCommand):
         count = options["count"]
         self.stdout.write(f"Creating {count} fake clients with users...")
 
-        clients = ClientFactory.create_batch(count)
+        clients = SeedEngine().create_clients(count)
 
         self.stdout.write(self.style.SUCCESS(f"Successfully created {len(clients)} clients with associated users."))
 
@@ -1,8 +1,8 @@
 import random
 
 from django.core.management.base import BaseCommand
-from packagehandling.factories import ClientFactory, ConsolidateFactory, PackageFactory
 from packagehandling.models import Client
+from packagehandling.seeding import SeedEngine
 
 
 class Command(BaseCommand):
@@ -51,6 +51,7 @@ class Command(BaseCommand):
         packages_count = options["packages"]
         packages_min = options["packages_min"]
         packages_max = options["packages_max"]
+        engine = SeedEngine()
 
         # Determine the client
         client = None
@@ -75,22 +76,12 @@ class Command(BaseCommand):
             all_clients = list(Client.objects.all())
             if not all_clients:
                 self.stdout.write("No clients found. Creating some clients first...")
-                all_clients = ClientFactory.create_batch(5)
+                all_clients = engine.create_clients(5)
                 self.stdout.write(f"Created {len(all_clients)} new clients")
 
         # Create consolidations
         self.stdout.write(f"Creating {count} fake consolidations...")
-        consolidations = []
-
-        for i in range(count):
-            # Determine which client to use
-            cons_client = client
-            if not cons_client:
-                cons_client = random.choice(all_clients)
-
-            # Create consolidation
-            consolidation = ConsolidateFactory(client=cons_client)
-            consolidations.append(consolidation)
+        consolidations = engine.create_consolidates([client] if client else all_clients, count)
 
         self.stdout.write(self.style.SUCCESS(f"Successfully created {len(consolidations)} consolidations."))
 
@@ -105,11 +96,7 @@ class Command(BaseCommand):
                 if packages_min != packages_max:
                     num_packages = random.randint(packages_min, packages_max)
 
-                for _ in range(num_packages):
-                    PackageFactory(
-                        client=consolidation.client,
-                        consolidate=consolidation,
-                    )
+                engine.create_packages(num_packages, [consolidation.client], consolidate=consolidation)
                 total_packages += num_packages
                 self.stdout.write(
                     f"  - {consolidation}: {num_packages} packages",
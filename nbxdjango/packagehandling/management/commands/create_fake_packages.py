@@ -1,8 +1,6 @@
-import random
-
 from django.core.management.base import BaseCommand
-from packagehandling.factories import ClientFactory, PackageFactory
 from packagehandling.models import Client, Consolidate
+from packagehandling.seeding import SeedEngine
 
 
 class Command(BaseCommand):
@@ -42,6 +40,7 @@ class Command(BaseCommand):
         client_email = options["client_email"]
         consolidate_id = options["consolidate_id"]
         with_consolidation = options["with_consolidation"]
+        engine = SeedEngine()
 
         # Determine the client
         client = None
@@ -94,40 +93,27 @@ class Command(BaseCommand):
             all_clients = list(Client.objects.all())
             if not all_clients:
                 self.stdout.write("No clients found. Creating some clients first...")
-                all_clients = ClientFactory.create_batch(5)
+                all_clients = engine.create_clients(5)
                 self.stdout.write(f"Created {len(all_clients)} new clients")
 
         # Create packages
         self.stdout.write(f"Creating {count} fake packages...")
-        packages = []
-
-        for i in range(count):
-            # Determine which client to use
-            pkg_client = client
-            if not pkg_client:
-                pkg_client = random.choice(all_clients)
-
-            # Determine consolidation
-            pkg_consolidate = consolidate
-            if not pkg_consolidate and with_consolidation and available_consolidates:
-                # 50% chance to assign to a consolidation
-                if random.random() < 0.5:
-                    pkg_consolidate = random.choice(available_consolidates)
-
-            # Create package
-            package = PackageFactory(
-                client=pkg_client,
-                consolidate=pkg_consolidate,
-            )
-            packages.append(package)
+        engine.create_packages(
+            count,
+            [client] if client else all_clients,
+            consolidates=available_consolidates,
+            # 50% chance to assign to a consolidation
+            consolidated_ratio=0.5 if with_consolidation else 0.0,
+            consolidate=consolidate,
+        )
 
-        self.stdout.write(self.style.SUCCESS(f"Successfully created {len(packages)} packages."))
+        self.stdout.write(self.style.SUCCESS(f"Successfully created {count} packages."))
 
         # Show summary
         if consolidate:
             self.stdout.write(f"All packages assigned to consolidation: {consolidate}")
         elif client:
-            count_with_consolidation = sum(1 for p in packages if p.consolidate)
+            count_with_consolidation = engine.stats["consolidated_packages"]
             self.stdout.write(f"Client: {client.full_name}")
             self.stdout.write(f"  - Packages with consolidation: {count_with_consolidation}")
-            self.stdout.write(f"  - Packages without consolidation: {len(packages) - count_with_consolidation}")
+            self.stdout.write(f"  - Packages without consolidation: {count - count_with_consolidation}")
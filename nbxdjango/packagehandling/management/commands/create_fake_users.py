@@ -1,5 +1,5 @@
 from django.core.management.base import BaseCommand
-from packagehandling.factories import UserFactory
+from packagehandling.seeding import SeedEngine
 
 
 class Command(BaseCommand):
@@ -25,7 +25,7 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Creating {count} fake users...")
 
-        users = UserFactory.create_batch(count, password=password)
+        users = SeedEngine(password=password).create_users(count)
 
         self.stdout.write(self.style.SUCCESS(f"Successfully created {len(users)} users."))
 
@@ -0,0 +1,121 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from packagehandling.models import Client, Consolidate, Package
+
+
+def _index_name(model, fields, condition=None):
+    """Name of the index declared in ``model.Meta.indexes`` on ``fields`` (and ``condition``)."""
+    for index in model._meta.indexes:
+        if list(index.fields) == fields and index.condition == condition:
+            return index.name
+    raise LookupError(f"{model.__name__} has no index on {fields}")
+
+
+def hot_queries(client_id):
+    """
+    The querysets behind the hottest resolver paths, paired with the index each
+    one is meant to use. Keep these in step with ``schema/query_parts``.
+    """
+    return [
+        (
+            "allPackages (client, default notInConsolidate)",
+            "package_unconsolidated_idx",
+            Package.objects.filter(client_id=client_id, consolidate__isnull=True).order_by("-created_at")[:10],
+        ),
+        (
+            "allPackages (admin, default notInConsolidate)",
+            "package_unconsol_recent_idx",
+            Package.objects.filter(consolidate__isnull=True).order_by("-created_at")[:10],
+        ),
+        (
+            "allPackages (client, all packages)",
+            _index_name(Package, ["client", "-created_at"]),
+            Package.objects.filter(client_id=client_id).order_by("-created_at")[:10],
+        ),
+        *[
+            (
+                f"allConsolidates (status={status})",
+                name,
+                Consolidate.objects.filter(status=status).order_by("-created_at")[:10],
+            )
+            for status, name in (
+                (Consolidate.Status.AWAITING_PAYMENT, "consol_awaiting_recent_idx"),
+                (Consolidate.Status.PENDING, "consol_pending_recent_idx"),
+                (Consolidate.Status.PROCESSING, "consol_processing_recent_idx"),
+                (Consolidate.Status.IN_TRANSIT, "consol_in_transit_recent_idx"),
+            )
+        ],
+        (
+            "allConsolidates (client)",
+            _index_name(Consolidate, ["client", "-created_at"]),
+            Consolidate.objects.filter(client_id=client_id).order_by("-created_at")[:10],
+        ),
+        (
+            "dashboard package counts (client)",
+            _index_name(Package, ["client", "consolidate_status"]),
+            Package.objects.filter(client_id=client_id)
+            .values("consolidate_status")
+            .annotate(total=Count("id"))
+            .order_by(),
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = "Runs EXPLAIN on the hot resolver queries and reports whether each one uses its intended index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--client-id",
+            type=int,
+            help="Client to use for per-client queries (default: the client with the most packages)",
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Use EXPLAIN ANALYZE to execute the queries (PostgreSQL only)",
+        )
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help="Exit with an error if any query does not use its intended index",
+        )
+
+    def handle(self, *args, **options):
+        client_id = options["client_id"]
+        if client_id is None:
+            busiest = Client.objects.annotate(total=Count("packages")).order_by("-total").values("pk").first()
+            client_id = busiest["pk"] if busiest else 0
+
+        explain_options = {}
+        if options["analyze"]:
+            if connection.vendor != "postgresql":
+                raise CommandError("--analyze is only supported on PostgreSQL.")
+            explain_options = {"analyze": True}
+
+        missed = []
+        for name, index_name, queryset in hot_queries(client_id):
+            plan = queryset.explain(**explain_options)
+            used = index_name in plan
+            if used:
+                self.stdout.write(self.style.SUCCESS(f"[USED]     {name}: {index_name}"))
+            else:
+                missed.append(name)
+                self.stdout.write(self.style.WARNING(f"[NOT USED] {name}: {index_name}"))
+            if options["verbosity"] > 1 or not used:
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+
+        if missed:
+            message = f"{len(missed)} hot quer{'y' if len(missed) == 1 else 'ies'} not using the intended index."
+            if options["strict"]:
+                raise CommandError(message)
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{message} Small or un-ANALYZEd tables are often scanned sequentially, and SQLite "
+                    "cannot match bound parameters against partial index predicates."
+                )
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("All hot queries use their intended index."))
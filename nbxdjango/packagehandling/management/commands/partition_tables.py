@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from packagehandling.partitioning import (
+    PARTITIONED_MODELS,
+    conversion_sql,
+    ensure_partitions,
+    is_partitioned,
+    partitioning_enabled,
+    partitions,
+)
+
+
+class Command(BaseCommand):
+    help = "Create the upcoming monthly partitions of the package and consolidation tables (DB_PARTITIONING)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="First convert the tables that are not partitioned yet. Locks each table while its rows "
+            "are copied: run it in a maintenance window",
+        )
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            help="Months of partitions to keep created ahead (default: PARTITION_MONTHS_AHEAD)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only print what would be done",
+        )
+
+    def handle(self, *args, **options):
+        if not partitioning_enabled(connection):
+            if options["convert"]:
+                raise CommandError("Partitioning needs DB_PARTITIONING=true and a PostgreSQL database.")
+            self.stdout.write("Partitioning is off (DB_PARTITIONING) or the database is not PostgreSQL.")
+            return
+
+        if options["convert"]:
+            for model in PARTITIONED_MODELS:
+                table = model._meta.db_table
+                if is_partitioned(connection, table):
+                    continue
+                with transaction.atomic(), connection.schema_editor(atomic=False) as schema_editor:
+                    statements = conversion_sql(model, schema_editor, options["months_ahead"])
+                    for sql in statements:
+                        if options["dry_run"]:
+                            self.stdout.write(f"{sql};")
+                        else:
+                            schema_editor.execute(sql, params=None)
+                if not options["dry_run"]:
+                    self.stdout.write(self.style.SUCCESS(f"Converted {table}."))
+
+        created = ensure_partitions(months_ahead=options["months_ahead"], dry_run=options["dry_run"])
+        verb = "Would create" if options["dry_run"] else "Created"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(created)} partitions: {', '.join(created) or '-'}"))
+        for model in PARTITIONED_MODELS:
+            table = model._meta.db_table
+            if is_partitioned(connection, table):
+                self.stdout.write(f"{table}: {len(partitions(connection, table))} partitions")
+            else:
+                self.stdout.write(f"{table}: not partitioned (run with --convert)")
@@ -0,0 +1,52 @@
+import json
+
+from django.core.management.base import BaseCommand
+from packagehandling.queue_metrics import queue_stats
+
+
+def _fmt(value, suffix=" ms"):
+    return "-" if value is None else f"{value:.1f}{suffix}"
+
+
+class Command(BaseCommand):
+    help = "Shows django-q queue depth, task latency, failure rate and per-lane and per-function timing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--minutes", type=int, default=15, help="Window of finished tasks to report on")
+        parser.add_argument("--json", action="store_true", help="Print the raw metrics as JSON")
+
+    def handle(self, *args, **options):
+        stats = queue_stats(minutes=options["minutes"])
+        if options["json"]:
+            self.stdout.write(json.dumps(stats, indent=2))
+            return
+
+        self.stdout.write(
+            f"Queue depth: {stats['queue_depth']}  in flight: {stats['in_flight']}  "
+            f"clusters: {stats['clusters']}  workers: {stats['workers']}"
+        )
+        self.stdout.write(
+            f"Last {stats['window_minutes']} min: {stats['tasks']} tasks, {stats['failures']} failed "
+            f"({stats['failure_rate']:.1%}), {stats['throughput_per_minute']}/min"
+        )
+        for label, key in (("Queue latency", "queued_ms"), ("Run time", "run_ms")):
+            timing = stats[key]
+            self.stdout.write(
+                f"{label}: avg {_fmt(timing['avg'])}  p95 {_fmt(timing['p95'])}  max {_fmt(timing['max'])}"
+            )
+        self.stdout.write("")
+        self.stdout.write(f"{'Lane':<15} {'Depth':>6} {'Tasks':>6} {'Failed':>7} {'Avg wait':>10} {'p95 wait':>10}")
+        for row in stats["lanes"]:
+            depth = row["queue_depth"] if row["enabled"] else "shared"
+            self.stdout.write(
+                f"{row['lane']:<15} {str(depth):>6} {row['tasks']:>6} {row['failure_rate']:>7.1%} "
+                f"{_fmt(row['avg_queued_ms']):>10} {_fmt(row['p95_queued_ms']):>10}"
+            )
+        if stats["functions"]:
+            self.stdout.write("")
+            self.stdout.write(f"{'Function':<50} {'Tasks':>6} {'Failed':>7} {'Avg run':>10} {'Avg wait':>10}")
+            for row in stats["functions"]:
+                self.stdout.write(
+                    f"{row['func'][:50]:<50} {row['tasks']:>6} {row['failure_rate']:>7.1%} "
+                    f"{_fmt(row['avg_run_ms']):>10} {_fmt(row['avg_queued_ms']):>10}"
+                )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from packagehandling.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Update the daily arrival and revenue rollups behind arrivalStats and revenueStats"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild every day instead of only the days changed since the last refresh",
+        )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_rollups(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(f"Recomputed {refreshed['days']} days ({refreshed['rows']} client rows)."))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from packagehandling.counters import repair_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the cached package counters on clients and consolidations with set-based SQL"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of client / consolidation ids repaired per transaction (default: 10000)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the rows whose counters drifted",
+        )
+
+    def handle(self, *args, **options):
+        repaired = repair_counters(batch_size=options["batch_size"], dry_run=options["dry_run"])
+        verb = "Would repair" if options["dry_run"] else "Repaired"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} counters on {repaired['clients']} clients and {repaired['consolidates']} consolidations."
+            )
+        )
@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+from packagehandling.models import Consolidate, Package
+from packagehandling.pricing import rate_table, reprice_packages
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes service_price from the pricing rate table for packages not yet delivered or cancelled, "
+        "in one vectorised pass followed by chunked bulk updates"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--client-id",
+            type=int,
+            help="Only reprice this client's packages",
+        )
+        parser.add_argument(
+            "--include-closed",
+            action="store_true",
+            help="Also reprice packages of delivered and cancelled consolidations",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Packages updated per transaction (default: 5000)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the packages whose price would change",
+        )
+
+    def handle(self, *args, **options):
+        # Validates the PRICING_* settings before any package is read.
+        table = rate_table()
+        packages = Package.objects.all()
+        if options["client_id"]:
+            packages = packages.filter(client_id=options["client_id"])
+        if not options["include_closed"]:
+            packages = packages.exclude(
+                consolidate_status__in=[Consolidate.Status.DELIVERED, Consolidate.Status.CANCELLED]
+            )
+
+        started = time.perf_counter()
+        priced, changed = reprice_packages(
+            packages, table=table, chunk_size=options["chunk_size"], dry_run=options["dry_run"]
+        )
+        elapsed = time.perf_counter() - started
+
+        verb = "would change" if options["dry_run"] else "changed"
+        self.stdout.write(self.style.SUCCESS(f"Priced {priced} packages in {elapsed:.2f}s; {changed} prices {verb}."))
@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from packagehandling.seeding import (
+    DEFAULT_BATCH_SIZE,
+    SCALE_UNIT,
+    seed,
+    volumes_for_scale,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generates a load-testing dataset. Each unit of --scale adds "
+        f"{SCALE_UNIT['clients']} clients, {SCALE_UNIT['consolidates']} consolidations "
+        f"and {SCALE_UNIT['packages']} packages (--scale 1000 = 1M packages)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=1,
+            help="Number of dataset units to generate (default: 1)",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Worker processes inserting independent shards in parallel (default: 1)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows per bulk insert (default: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--password",
+            type=str,
+            default="password",
+            help="Password shared by every generated user (default: 'password')",
+        )
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help="Insert packages with COPY instead of INSERT (PostgreSQL only)",
+        )
+
+    def handle(self, *args, **options):
+        scale = options["scale"]
+        processes = options["processes"]
+        if scale < 1:
+            raise CommandError("--scale must be at least 1.")
+        if options["copy"] and connection.vendor != "postgresql":
+            raise CommandError("--copy is only supported on PostgreSQL.")
+        if processes > 1 and connection.vendor == "sqlite":
+            self.stdout.write(self.style.WARNING("SQLite allows a single writer; using one process."))
+            processes = 1
+
+        volumes = volumes_for_scale(scale)
+        self.stdout.write(
+            f"Seeding {volumes['clients']} clients, {volumes['consolidates']} consolidations and "
+            f"{volumes['packages']} packages with {processes} process(es)..."
+        )
+
+        started = time.monotonic()
+        stats = seed(
+            scale,
+            processes=processes,
+            batch_size=options["batch_size"],
+            password=options["password"],
+            use_copy=options["copy"],
+        )
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(f"Seeded dataset in {elapsed:.1f}s."))
+        for name in ("users", "clients", "consolidates", "packages", "consolidated_packages"):
+            self.stdout.write(f"  - {name}: {stats.get(name, 0)}")
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from packagehandling.schedules import ensure_schedules
+
+
+class Command(BaseCommand):
+    help = "Creates or updates the recurring django-q schedules (webhook dispatch, maintenance jobs)"
+
+    def handle(self, *args, **options):
+        created, updated = ensure_schedules()
+        self.stdout.write(self.style.SUCCESS(f"Schedules ready: {created} created, {updated} updated."))
@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-19 02:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="package",
+            name="consolidate_status",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("awaiting_payment", "Awaiting Payment"),
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("in_transit", "In Transit"),
+                    ("delivered", "Delivered"),
+                    ("cancelled", "Cancelled"),
+                ],
+                max_length=50,
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="package",
+            index=models.Index(fields=["consolidate_status"], name="packagehand_consoli_9155c8_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="package",
+            index=models.Index(fields=["client", "consolidate_status"], name="packagehand_client__d1d1ce_idx"),
+        ),
+    ]
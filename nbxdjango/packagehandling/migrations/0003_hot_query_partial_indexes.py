@@ -0,0 +1,59 @@
+# Generated by Django 4.2 on 2026-10-19 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0002_package_consolidate_status"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="consolidate",
+            index=models.Index(
+                condition=models.Q(("status", "awaiting_payment")),
+                fields=["-created_at"],
+                name="consol_awaiting_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consolidate",
+            index=models.Index(
+                condition=models.Q(("status", "pending")), fields=["-created_at"], name="consol_pending_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consolidate",
+            index=models.Index(
+                condition=models.Q(("status", "processing")),
+                fields=["-created_at"],
+                name="consol_processing_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consolidate",
+            index=models.Index(
+                condition=models.Q(("status", "in_transit")),
+                fields=["-created_at"],
+                name="consol_in_transit_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="package",
+            index=models.Index(
+                condition=models.Q(("consolidate__isnull", True)),
+                fields=["client", "-created_at"],
+                name="package_unconsolidated_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="package",
+            index=models.Index(
+                condition=models.Q(("consolidate__isnull", True)),
+                fields=["-created_at"],
+                name="package_unconsol_recent_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2 on 2026-10-19 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0003_hot_query_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeletionLog",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "object_type",
+                    models.CharField(choices=[("package", "Package"), ("consolidate", "Consolidate")], max_length=20),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("client_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="consolidate",
+            index=models.Index(fields=["updated_at", "id"], name="packagehand_updated_6655e3_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="consolidate",
+            index=models.Index(fields=["client", "updated_at", "id"], name="packagehand_client__d6ea87_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="package",
+            index=models.Index(fields=["updated_at", "id"], name="packagehand_updated_345c78_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="package",
+            index=models.Index(fields=["client", "updated_at", "id"], name="packagehand_client__daffd2_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="deletionlog",
+            index=models.Index(
+                fields=["object_type", "client_id", "deleted_at"], name="packagehand_object__101cf0_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deletionlog",
+            index=models.Index(fields=["object_type", "deleted_at"], name="packagehand_object__f46af9_idx"),
+        ),
+    ]
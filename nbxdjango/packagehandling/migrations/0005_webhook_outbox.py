@@ -0,0 +1,54 @@
+# Generated by Django 4.2 on 2026-10-19 03:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0004_change_feed"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("event_type", models.CharField(max_length=50)),
+                ("aggregate_type", models.CharField(max_length=20)),
+                ("aggregate_id", models.BigIntegerField()),
+                ("client_id", models.BigIntegerField(null=True)),
+                ("payload", models.JSONField(default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="WebhookEndpoint",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100)),
+                ("url", models.URLField()),
+                (
+                    "secret",
+                    models.CharField(blank=True, help_text="Signs each request body (HMAC-SHA256)", max_length=255),
+                ),
+                (
+                    "event_types",
+                    models.JSONField(blank=True, default=list, help_text="Event types to deliver; empty for all"),
+                ),
+                ("is_active", models.BooleanField(default=True)),
+                ("max_concurrency", models.PositiveSmallIntegerField(default=2, help_text="Batches in flight at once")),
+                ("last_event_id", models.BigIntegerField(default=0)),
+                ("failures", models.PositiveIntegerField(default=0)),
+                ("next_attempt_at", models.DateTimeField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True)),
+                ("locked_until", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="outboxevent",
+            index=models.Index(fields=["created_at"], name="packagehand_created_5bc8c8_idx"),
+        ),
+    ]
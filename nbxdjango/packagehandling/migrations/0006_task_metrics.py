@@ -0,0 +1,34 @@
+# Generated by Django 4.2 on 2026-10-19 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0005_webhook_outbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskMetric",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("task_id", models.CharField(max_length=32)),
+                ("func", models.CharField(max_length=256)),
+                ("group", models.CharField(blank=True, max_length=100)),
+                ("success", models.BooleanField()),
+                ("queued_ms", models.FloatField()),
+                ("run_ms", models.FloatField()),
+                ("finished_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="taskmetric",
+            index=models.Index(fields=["finished_at"], name="packagehand_finishe_d5571b_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="taskmetric",
+            index=models.Index(fields=["group", "finished_at"], name="packagehand_group_8c096a_idx"),
+        ),
+    ]
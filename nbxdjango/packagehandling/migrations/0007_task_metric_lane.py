@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-19 03:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0006_task_metrics"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskmetric",
+            name="lane",
+            field=models.CharField(default="default", max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name="taskmetric",
+            index=models.Index(fields=["lane", "finished_at"], name="packagehand_lane_3d1788_idx"),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-19 03:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0007_task_metric_lane"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailIdempotencyKey",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.CharField(max_length=64, unique=True)),
+                ("template", models.CharField(max_length=50)),
+                ("consolidate_id", models.BigIntegerField(null=True)),
+                ("status", models.CharField(blank=True, max_length=20)),
+                ("recipients", models.TextField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("expires_at", models.DateTimeField()),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="emailidempotencykey",
+            index=models.Index(fields=["expires_at"], name="packagehand_expires_ac8f36_idx"),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2 on 2026-10-19 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0008_email_idempotency_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="client",
+            name="package_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="client",
+            name="unconsolidated_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="consolidate",
+            name="package_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="consolidate",
+            name="total_service_price",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name="consolidate",
+            name="total_weight",
+            field=models.FloatField(default=0.0, help_text="Kilograms"),
+        ),
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(fields=["-unconsolidated_count", "id"], name="client_unconsolidated_cnt_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(fields=["-package_count", "id"], name="client_package_cnt_idx"),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2 on 2026-10-19 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0009_package_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="package",
+            name="height_cm",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="package",
+            name="length_cm",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="package",
+            name="volume_cm3",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="package",
+            name="weight_kg",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="package",
+            name="width_cm",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="package",
+            index=models.Index(fields=["weight_kg"], name="packagehand_weight__a333a6_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="package",
+            index=models.Index(fields=["volume_cm3"], name="packagehand_volume__4f2e43_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="package",
+            index=models.Index(fields=["client", "-weight_kg"], name="package_client_weight_idx"),
+        ),
+    ]
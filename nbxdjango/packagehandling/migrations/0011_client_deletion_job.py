@@ -0,0 +1,59 @@
+# Generated by Django 4.2 on 2026-10-19 04:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0010_package_normalized_measurements"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClientDeletionJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("client_id", models.BigIntegerField()),
+                ("user_id", models.BigIntegerField(blank=True, null=True)),
+                ("delete_user", models.BooleanField(default=False)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("packages_total", models.IntegerField(default=0)),
+                ("packages_deleted", models.IntegerField(default=0)),
+                ("consolidates_total", models.IntegerField(default=0)),
+                ("consolidates_deleted", models.IntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "requested_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="clientdeletionjob",
+            index=models.Index(fields=["client_id", "status"], name="packagehand_client__0d8370_idx"),
+        ),
+    ]
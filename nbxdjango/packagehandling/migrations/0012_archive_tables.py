@@ -0,0 +1,127 @@
+# Generated by Django 4.2 on 2026-10-19 04:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0011_client_deletion_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedConsolidate",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("description", models.TextField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("awaiting_payment", "Awaiting Payment"),
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("in_transit", "In Transit"),
+                            ("delivered", "Delivered"),
+                            ("cancelled", "Cancelled"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("delivery_date", models.DateField(blank=True, null=True)),
+                ("comment", models.TextField(blank=True, null=True)),
+                ("extra_attributes", models.JSONField(default=dict)),
+                ("package_count", models.IntegerField(default=0)),
+                ("total_weight", models.FloatField(default=0.0, help_text="Kilograms")),
+                ("total_service_price", models.FloatField(default=0.0)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "client",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_consolidates",
+                        to="packagehandling.client",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ArchivedPackage",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("barcode", models.CharField(max_length=255)),
+                ("courier", models.CharField(max_length=255)),
+                ("other_courier", models.CharField(blank=True, max_length=255, null=True)),
+                ("length", models.FloatField(blank=True, null=True)),
+                ("width", models.FloatField(blank=True, null=True)),
+                ("height", models.FloatField(blank=True, null=True)),
+                ("dimension_unit", models.CharField(blank=True, max_length=10, null=True)),
+                ("weight", models.FloatField(blank=True, null=True)),
+                ("weight_unit", models.CharField(blank=True, max_length=10, null=True)),
+                ("weight_kg", models.FloatField(blank=True, null=True)),
+                ("length_cm", models.FloatField(blank=True, null=True)),
+                ("width_cm", models.FloatField(blank=True, null=True)),
+                ("height_cm", models.FloatField(blank=True, null=True)),
+                ("volume_cm3", models.FloatField(blank=True, null=True)),
+                ("description", models.TextField(blank=True, null=True)),
+                ("purchase_link", models.URLField(blank=True, null=True)),
+                ("real_price", models.FloatField(blank=True, null=True)),
+                ("service_price", models.FloatField(blank=True, null=True)),
+                ("arrival_date", models.DateField(blank=True, null=True)),
+                ("comments", models.TextField(blank=True, null=True)),
+                (
+                    "consolidate_status",
+                    models.CharField(
+                        choices=[
+                            ("awaiting_payment", "Awaiting Payment"),
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("in_transit", "In Transit"),
+                            ("delivered", "Delivered"),
+                            ("cancelled", "Cancelled"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "client",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_packages",
+                        to="packagehandling.client",
+                    ),
+                ),
+                (
+                    "consolidate",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="packages",
+                        to="packagehandling.archivedconsolidate",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="archivedpackage",
+            index=models.Index(fields=["barcode"], name="packagehand_barcode_f37385_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedpackage",
+            index=models.Index(fields=["client", "-created_at"], name="packagehand_client__29b0fe_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedconsolidate",
+            index=models.Index(fields=["client", "-created_at"], name="packagehand_client__bc30ee_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedconsolidate",
+            index=models.Index(fields=["-created_at"], name="packagehand_created_ef0b5c_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-19 04:53
+
+from django.db import migrations
+from packagehandling.partitioning import partition_tables
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0012_archive_tables"),
+    ]
+
+    operations = [
+        # Converts only with DB_PARTITIONING on PostgreSQL. To partition later, run
+        # `manage.py partition_tables --convert` instead.
+        migrations.RunPython(partition_tables, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2 on 2026-10-19 05:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0013_partition_by_created_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConsolidateStatusEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("consolidate_id", models.BigIntegerField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("awaiting_payment", "Awaiting Payment"),
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("in_transit", "In Transit"),
+                            ("delivered", "Delivered"),
+                            ("cancelled", "Cancelled"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "previous_status",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("awaiting_payment", "Awaiting Payment"),
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("in_transit", "In Transit"),
+                            ("delivered", "Delivered"),
+                            ("cancelled", "Cancelled"),
+                        ],
+                        max_length=50,
+                        null=True,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="consolidatestatusevent",
+            index=models.Index(fields=["consolidate_id", "created_at"], name="packagehand_consoli_4222f8_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="consolidatestatusevent",
+            index=models.Index(fields=["status", "created_at"], name="packagehand_status_fcf1ae_idx"),
+        ),
+    ]
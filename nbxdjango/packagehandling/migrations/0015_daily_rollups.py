@@ -0,0 +1,46 @@
+# Generated by Django 4.2 on 2026-10-19 05:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("packagehandling", "0014_consolidate_status_history"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("client_id", models.BigIntegerField(blank=True, null=True)),
+                ("packages_arrived", models.IntegerField(default=0)),
+                ("real_price_total", models.FloatField(default=0.0)),
+                ("service_price_total", models.FloatField(default=0.0)),
+                ("consolidates_created", models.IntegerField(default=0)),
+                ("consolidates_delivered", models.IntegerField(default=0)),
+                ("stale", models.BooleanField(default=False)),
+                ("refreshed_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="dailyrollup",
+            index=models.Index(fields=["refreshed_at"], name="packagehand_refresh_9d780c_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="dailyrollup",
+            index=models.Index(condition=models.Q(("stale", True)), fields=["stale"], name="rollup_stale_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="dailyrollup",
+            constraint=models.UniqueConstraint(fields=("client_id", "day"), name="rollup_client_day_uniq"),
+        ),
+        migrations.AddConstraint(
+            model_name="dailyrollup",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("client_id__isnull", True)), fields=("day",), name="rollup_day_uniq"
+            ),
+        ),
+    ]
@@ -1,6 +1,30 @@
+from .archived_consolidate import ArchivedConsolidate
+from .archived_package import ArchivedPackage
 from .client import Client
+from .client_deletion_job import ClientDeletionJob
 from .consolidate import Consolidate
+from .consolidate_status_event import ConsolidateStatusEvent
+from .daily_rollup import DailyRollup
+from .deletion_log import DeletionLog
+from .email_idempotency_key import EmailIdempotencyKey
+from .outbox import OutboxEvent, WebhookEndpoint
 from .package import Package
+from .task_metric import TaskMetric
 from .user import CustomUser
 
-__all__ = ["CustomUser", "Client", "Package", "Consolidate"]
+__all__ = [
+    "CustomUser",
+    "Client",
+    "ClientDeletionJob",
+    "Package",
+    "Consolidate",
+    "ConsolidateStatusEvent",
+    "DailyRollup",
+    "DeletionLog",
+    "ArchivedConsolidate",
+    "ArchivedPackage",
+    "OutboxEvent",
+    "WebhookEndpoint",
+    "TaskMetric",
+    "EmailIdempotencyKey",
+]
@@ -0,0 +1,35 @@
+from django.db import models
+
+from .client import Client
+from .consolidate import Consolidate
+
+
+class ArchivedConsolidate(models.Model):
+    """
+    A delivered or cancelled consolidation moved out of the hot ``Consolidate``
+    table by ``packagehandling.archive``. Keeps the original id and columns; the
+    counters are frozen at archival time.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    description = models.TextField()
+    status = models.CharField(max_length=50, choices=Consolidate.Status.choices)
+    delivery_date = models.DateField(null=True, blank=True)
+    comment = models.TextField(null=True, blank=True)
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="archived_consolidates")
+    extra_attributes = models.JSONField(default=dict)
+    package_count = models.IntegerField(default=0)
+    total_weight = models.FloatField(default=0.0, help_text="Kilograms")
+    total_service_price = models.FloatField(default=0.0)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["client", "-created_at"]),
+            models.Index(fields=["-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Archived consolidate {self.id}"
@@ -0,0 +1,46 @@
+from django.db import models
+
+from .archived_consolidate import ArchivedConsolidate
+from .client import Client
+from .consolidate import Consolidate
+
+
+class ArchivedPackage(models.Model):
+    """A package of an ``ArchivedConsolidate``, moved out of the hot ``Package`` table with it."""
+
+    id = models.BigIntegerField(primary_key=True)
+    barcode = models.CharField(max_length=255)
+    courier = models.CharField(max_length=255)
+    other_courier = models.CharField(max_length=255, null=True, blank=True)
+    length = models.FloatField(null=True, blank=True)
+    width = models.FloatField(null=True, blank=True)
+    height = models.FloatField(null=True, blank=True)
+    dimension_unit = models.CharField(max_length=10, null=True, blank=True)
+    weight = models.FloatField(null=True, blank=True)
+    weight_unit = models.CharField(max_length=10, null=True, blank=True)
+    weight_kg = models.FloatField(null=True, blank=True)
+    length_cm = models.FloatField(null=True, blank=True)
+    width_cm = models.FloatField(null=True, blank=True)
+    height_cm = models.FloatField(null=True, blank=True)
+    volume_cm3 = models.FloatField(null=True, blank=True)
+    description = models.TextField(null=True, blank=True)
+    purchase_link = models.URLField(null=True, blank=True)
+    real_price = models.FloatField(null=True, blank=True)
+    service_price = models.FloatField(null=True, blank=True)
+    arrival_date = models.DateField(null=True, blank=True)
+    comments = models.TextField(null=True, blank=True)
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="archived_packages")
+    consolidate = models.ForeignKey(ArchivedConsolidate, on_delete=models.CASCADE, related_name="packages")
+    consolidate_status = models.CharField(max_length=50, choices=Consolidate.Status.choices)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["barcode"]),
+            models.Index(fields=["client", "-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Archived package {self.barcode}"
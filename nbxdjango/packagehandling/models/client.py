@@ -1,8 +1,12 @@
 from django.conf import settings
 from django.db import models
 
+from .counters import CounterFieldsMixin
+
+
+class Client(CounterFieldsMixin, models.Model):
+    COUNTER_FIELDS = ("package_count", "unconsolidated_count")
 
-class Client(models.Model):
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -21,6 +25,9 @@ class Client(models.Model):
     building_number = models.CharField(max_length=255, null=True, blank=True)
     mobile_phone_number = models.CharField(max_length=255, null=True, blank=True)
     phone_number = models.CharField(max_length=255, null=True, blank=True)
+    # Maintained by packagehandling.counters; repaired with `manage.py repair_counters`.
+    package_count = models.IntegerField(default=0)
+    unconsolidated_count = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -29,6 +36,9 @@ class Client(models.Model):
             models.Index(fields=["email"]),
             models.Index(fields=["identification_number"]),
             models.Index(fields=["created_at"]),
+            # allClients sorted by package counts ("clients with most waiting packages").
+            models.Index(fields=["-unconsolidated_count", "id"], name="client_unconsolidated_cnt_idx"),
+            models.Index(fields=["-package_count", "id"], name="client_package_cnt_idx"),
         ]
 
     @property
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db import models
+
+
+class ClientDeletionJob(models.Model):
+    """
+    Progress of a client deletion run by ``packagehandling.deletion``.
+    ``client_id`` and ``user_id`` are plain columns: both rows are gone once
+    the job completes.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    client_id = models.BigIntegerField()
+    user_id = models.BigIntegerField(null=True, blank=True)
+    delete_user = models.BooleanField(default=False)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    packages_total = models.IntegerField(default=0)
+    packages_deleted = models.IntegerField(default=0)
+    consolidates_total = models.IntegerField(default=0)
+    consolidates_deleted = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["client_id", "status"]),
+        ]
+
+    def __str__(self):
+        return f"Deletion of client {self.client_id} ({self.status})"
+
+    @property
+    def progress(self):
+        """Fraction of the client's packages and consolidations deleted so far."""
+        if self.status == self.Status.COMPLETED:
+            return 1.0
+        total = self.packages_total + self.consolidates_total
+        return (self.packages_deleted + self.consolidates_deleted) / total if total else 0.0
@@ -1,9 +1,13 @@
 from django.db import models
+from django.utils import timezone
 
 from .client import Client
+from .counters import CounterFieldsMixin
 
 
-class Consolidate(models.Model):
+class Consolidate(CounterFieldsMixin, models.Model):
+    COUNTER_FIELDS = ("package_count", "total_weight", "total_service_price")
+
     class Status(models.TextChoices):
         AWAITING_PAYMENT = "awaiting_payment", "Awaiting Payment"
         PENDING = "pending", "Pending"
@@ -22,6 +26,10 @@ class Consolidate(models.Model):
     comment = models.TextField(null=True, blank=True)
     client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="consolidates")
     extra_attributes = models.JSONField(default=dict)
+    # Maintained by packagehandling.counters; repaired with `manage.py repair_counters`.
+    package_count = models.IntegerField(default=0)
+    total_weight = models.FloatField(default=0.0, help_text="Kilograms")
+    total_service_price = models.FloatField(default=0.0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -30,7 +38,59 @@ class Consolidate(models.Model):
             models.Index(fields=["client", "-created_at"]),
             models.Index(fields=["status"]),
             models.Index(fields=["delivery_date"]),
+            # packagesUpdatedSince / consolidatesUpdatedSince keyset pagination
+            models.Index(fields=["updated_at", "id"]),
+            models.Index(fields=["client", "updated_at", "id"]),
+            # allConsolidates filtered by one of the open statuses, newest first. Delivered and
+            # cancelled rows make up most of the table and are served by the plain status index.
+            models.Index(
+                fields=["-created_at"],
+                condition=models.Q(status="awaiting_payment"),
+                name="consol_awaiting_recent_idx",
+            ),
+            models.Index(
+                fields=["-created_at"],
+                condition=models.Q(status="pending"),
+                name="consol_pending_recent_idx",
+            ),
+            models.Index(
+                fields=["-created_at"],
+                condition=models.Q(status="processing"),
+                name="consol_processing_recent_idx",
+            ),
+            models.Index(
+                fields=["-created_at"],
+                condition=models.Q(status="in_transit"),
+                name="consol_in_transit_recent_idx",
+            ),
         ]
 
     def __str__(self):
         return f"Consolidate {self.id} for {self.client}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so post_save can tell a status transition from any other edit.
+        instance.loaded_status = instance.__dict__.get("status")
+        return instance
+
+    def set_packages(self, packages):
+        """
+        Replace this consolidate's package set with ``packages``.
+
+        Like ``self.packages.set()`` this runs as set-based UPDATEs, but it also
+        keeps ``Package.consolidate_status`` and the package counters in sync for
+        added and removed packages.
+        """
+        from ..counters import move_packages
+
+        package_ids = [package.pk for package in packages]
+        now = timezone.now()
+        removed = self.packages.exclude(pk__in=package_ids)
+        added = self.packages.model.objects.filter(pk__in=package_ids)
+        move_packages(removed, None)
+        removed.update(consolidate=None, consolidate_status=None, updated_at=now)
+        move_packages(added, self.pk)
+        added.update(consolidate=self, consolidate_status=self.status, updated_at=now)
+        self.refresh_from_db(fields=["package_count", "total_weight", "total_service_price"])
@@ -0,0 +1,26 @@
+from django.db import models
+
+from .consolidate import Consolidate
+
+
+class ConsolidateStatusEvent(models.Model):
+    """
+    One status a consolidation entered, appended by ``packagehandling.status_history``
+    in the transaction that saved the transition. ``consolidate_id`` is a plain
+    column rather than a foreign key: the consolidation may since have moved to
+    the archive, and a partitioned ``Consolidate`` table can't be referenced.
+    """
+
+    consolidate_id = models.BigIntegerField()
+    status = models.CharField(max_length=50, choices=Consolidate.Status.choices)
+    previous_status = models.CharField(max_length=50, choices=Consolidate.Status.choices, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["consolidate_id", "created_at"]),
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Consolidate {self.consolidate_id} {self.status}"
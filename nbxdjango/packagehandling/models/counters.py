@@ -0,0 +1,26 @@
+from django.db import models
+
+
+class CounterFieldsMixin(models.Model):
+    """
+    Model whose ``COUNTER_FIELDS`` are only ever written with ``F()``
+    increments (see ``packagehandling.counters``). Saving an existing row
+    leaves them out, so the possibly stale in-memory values never overwrite
+    increments made since the row was loaded.
+    """
+
+    COUNTER_FIELDS: tuple[str, ...] = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        updating = not self._state.adding and not args and not kwargs.get("force_insert")
+        if updating and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class DailyRollup(models.Model):
+    """
+    One day's activity of one client, or of all clients together when
+    ``client_id`` is null, maintained by ``packagehandling.rollups``.
+    ``client_id`` is a plain column: a deleted client's rows are recomputed
+    away rather than cascaded, so the global rows can be corrected with them.
+    """
+
+    day = models.DateField()
+    client_id = models.BigIntegerField(null=True, blank=True)
+    # Packages by arrival_date, and the prices of those packages.
+    packages_arrived = models.IntegerField(default=0)
+    real_price_total = models.FloatField(default=0.0)
+    service_price_total = models.FloatField(default=0.0)
+    consolidates_created = models.IntegerField(default=0)
+    consolidates_delivered = models.IntegerField(default=0)
+    # Set when a change the refresh can't find by updated_at (a package moved to another day or client) affects it.
+    stale = models.BooleanField(default=False)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["client_id", "day"], name="rollup_client_day_uniq"),
+            models.UniqueConstraint(fields=["day"], condition=models.Q(client_id__isnull=True), name="rollup_day_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["refreshed_at"]),
+            models.Index(fields=["stale"], condition=models.Q(stale=True), name="rollup_stale_idx"),
+        ]
+
+    def __str__(self):
+        return f"Rollup {self.day} ({self.client_id or 'all clients'})"
@@ -0,0 +1,38 @@
+from django.db import models
+
+
+class DeletionLog(models.Model):
+    """
+    Tombstone for a deleted package or consolidate, so incremental sync
+    (``packagesUpdatedSince`` / ``consolidatesUpdatedSince``) can tell clients
+    which rows to drop. ``client_id`` is a plain column: the client itself may
+    be gone too.
+    """
+
+    class ObjectType(models.TextChoices):
+        PACKAGE = "package", "Package"
+        CONSOLIDATE = "consolidate", "Consolidate"
+
+    object_type = models.CharField(max_length=20, choices=ObjectType.choices)
+    object_id = models.BigIntegerField()
+    client_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["object_type", "client_id", "deleted_at"]),
+            models.Index(fields=["object_type", "deleted_at"]),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.object_type} {self.object_id}"
+
+    @classmethod
+    def record(cls, object_type, queryset):
+        """Write a tombstone for every row of ``queryset`` (call before deleting them)."""
+        return cls.objects.bulk_create(
+            [
+                cls(object_type=object_type, object_id=pk, client_id=client_id)
+                for pk, client_id in queryset.values_list("pk", "client_id").iterator()
+            ]
+        )
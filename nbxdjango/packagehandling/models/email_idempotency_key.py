@@ -0,0 +1,61 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+
+class EmailIdempotencyKey(models.Model):
+    """
+    Reservation for one email, keyed on (template, consolidation, recipients,
+    status). ``utils.send_email`` reserves the key before enqueueing, so a
+    repeated request within ``EMAIL_IDEMPOTENCY_TTL_HOURS`` is not enqueued;
+    ``utils.deliver_email`` claims ``sent_at`` before sending, so a redelivered
+    task is not sent twice.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    template = models.CharField(max_length=50)
+    consolidate_id = models.BigIntegerField(null=True)
+    status = models.CharField(max_length=20, blank=True)
+    recipients = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["expires_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.template} {self.consolidate_id} -> {self.recipients}"
+
+    @staticmethod
+    def make_key(template, consolidate_id, status, recipient_list):
+        recipients = sorted(recipient.strip().lower() for recipient in recipient_list)
+        raw = json.dumps([template, consolidate_id, status or "", recipients])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @classmethod
+    def reserve(cls, template, recipient_list, consolidate_id=None, status=""):
+        """Create the reservation, or return None if an unexpired one already exists."""
+        key = cls.make_key(template, consolidate_id, status, recipient_list)
+        now = timezone.now()
+        # An expired reservation no longer blocks a resend.
+        cls.objects.filter(key=key, expires_at__lte=now).delete()
+        try:
+            # Savepoint: callers run inside atomic mutations.
+            with transaction.atomic():
+                return cls.objects.create(
+                    key=key,
+                    template=template,
+                    consolidate_id=consolidate_id,
+                    status=status or "",
+                    recipients=",".join(recipient_list),
+                    expires_at=now + timedelta(hours=settings.EMAIL_IDEMPOTENCY_TTL_HOURS),
+                )
+        except IntegrityError:
+            return None
@@ -0,0 +1,52 @@
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    """
+    A change to a package or consolidate, written in the same transaction as the
+    change itself and delivered to webhooks later by ``outbox.dispatch_outbox``.
+    """
+
+    event_type = models.CharField(max_length=50)
+    aggregate_type = models.CharField(max_length=20)
+    aggregate_id = models.BigIntegerField()
+    client_id = models.BigIntegerField(null=True)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.aggregate_type}:{self.aggregate_id}"
+
+
+class WebhookEndpoint(models.Model):
+    """
+    A partner URL receiving outbox events. Each endpoint consumes the outbox
+    independently from ``last_event_id`` onwards, so a failing endpoint only
+    delays itself.
+    """
+
+    name = models.CharField(max_length=100)
+    url = models.URLField()
+    secret = models.CharField(max_length=255, blank=True, help_text="Signs each request body (HMAC-SHA256)")
+    event_types = models.JSONField(default=list, blank=True, help_text="Event types to deliver; empty for all")
+    is_active = models.BooleanField(default=True)
+    max_concurrency = models.PositiveSmallIntegerField(default=2, help_text="Batches in flight at once")
+
+    last_event_id = models.BigIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
+    def wants(self, event_type):
+        return not self.event_types or event_type in self.event_types
@@ -1,9 +1,18 @@
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 
+from ..units import length_in_cm, volume_in_cm3, weight_in_kg
 from .client import Client
 from .consolidate import Consolidate
 
+# Columns a package's contribution to the cached counters (packagehandling.counters) depends on.
+COUNTED_FIELDS = ("client_id", "consolidate_id", "weight", "weight_unit", "service_price")
+
+# Typed-in measurements and the unit-normalised columns computed from them on save.
+MEASUREMENT_FIELDS = ("length", "width", "height", "dimension_unit", "weight", "weight_unit")
+NORMALIZED_FIELDS = ("weight_kg", "length_cm", "width_cm", "height_cm", "volume_cm3")
+
 
 class Package(models.Model):
     barcode = models.CharField(max_length=255, unique=True)
@@ -15,6 +24,12 @@ class Package(models.Model):
     dimension_unit = models.CharField(max_length=10, null=True, blank=True)
     weight = models.FloatField(null=True, blank=True)
     weight_unit = models.CharField(max_length=10, null=True, blank=True)
+    # Canonical copies of the measurements above (see packagehandling.units), for range filters and SQL aggregates.
+    weight_kg = models.FloatField(null=True, blank=True, editable=False)
+    length_cm = models.FloatField(null=True, blank=True, editable=False)
+    width_cm = models.FloatField(null=True, blank=True, editable=False)
+    height_cm = models.FloatField(null=True, blank=True, editable=False)
+    volume_cm3 = models.FloatField(null=True, blank=True, editable=False)
     description = models.TextField(null=True, blank=True)
     purchase_link = models.URLField(null=True, blank=True)
     real_price = models.FloatField(null=True, blank=True)
@@ -25,6 +40,9 @@ class Package(models.Model):
     consolidate = models.ForeignKey(
         Consolidate, on_delete=models.SET_NULL, null=True, blank=True, related_name="packages"
     )
+    # Denormalized copy of consolidate.status (NULL while unconsolidated) so hot
+    # filters and dashboard counts don't need to join Consolidate.
+    consolidate_status = models.CharField(max_length=50, choices=Consolidate.Status.choices, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -34,15 +52,72 @@ class Package(models.Model):
             models.Index(fields=["client", "-created_at"]),
             models.Index(fields=["consolidate"]),
             models.Index(fields=["arrival_date"]),
+            models.Index(fields=["consolidate_status"]),
+            models.Index(fields=["client", "consolidate_status"]),
+            # packagesUpdatedSince keyset pagination
+            models.Index(fields=["updated_at", "id"]),
+            models.Index(fields=["client", "updated_at", "id"]),
+            # allPackages defaults to notInConsolidate=True: "unconsolidated packages (of a client), newest first".
+            models.Index(
+                fields=["client", "-created_at"],
+                condition=models.Q(consolidate__isnull=True),
+                name="package_unconsolidated_idx",
+            ),
+            models.Index(
+                fields=["-created_at"],
+                condition=models.Q(consolidate__isnull=True),
+                name="package_unconsol_recent_idx",
+            ),
+            # Weight / volume range filters, and a client's packages by weight.
+            models.Index(fields=["weight_kg"]),
+            models.Index(fields=["volume_cm3"]),
+            models.Index(fields=["client", "-weight_kg"], name="package_client_weight_idx"),
         ]
 
     def __str__(self):
         return f"Package {self.barcode}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so saving or deleting can move what was counted for the stored row.
+        if all(field in instance.__dict__ for field in COUNTED_FIELDS):
+            instance.loaded_counted = {field: instance.__dict__[field] for field in COUNTED_FIELDS}
+        # ...and the daily rollup row it is counted in (packagehandling.rollups).
+        if "arrival_date" in instance.__dict__ and "client_id" in instance.__dict__:
+            instance.loaded_arrival = (instance.client_id, instance.arrival_date)
+        # ...and its barcode, which a partitioned table can't keep unique (see clean()).
+        if "barcode" in instance.__dict__:
+            instance.loaded_barcode = instance.barcode
+        return instance
+
+    def counted_values(self):
+        return {field: getattr(self, field) for field in COUNTED_FIELDS}
+
+    def normalize_measurements(self):
+        """Fill in the canonical kg / cm / cm³ columns from the typed-in measurements."""
+        self.weight_kg = None if self.weight is None else weight_in_kg(self.weight, self.weight_unit)
+        self.length_cm = length_in_cm(self.length, self.dimension_unit)
+        self.width_cm = length_in_cm(self.width, self.dimension_unit)
+        self.height_cm = length_in_cm(self.height, self.dimension_unit)
+        self.volume_cm3 = volume_in_cm3(self.length, self.width, self.height, self.dimension_unit)
+
     def clean(self):
         if self.consolidate and self.client != self.consolidate.client:
             raise ValidationError("Package and Consolidate must belong to the same client.")
+        # A partitioned table can't enforce a unique barcode (packagehandling.partitioning).
+        if settings.DB_PARTITIONING and (self._state.adding or self.barcode != getattr(self, "loaded_barcode", None)):
+            if Package.objects.filter(barcode=self.barcode).exclude(pk=self.pk).exists():
+                raise ValidationError("A package with this barcode already exists.")
 
     def save(self, *args, **kwargs):
         self.clean()  # Call clean explicitly to ensure validation
-        super().save(*args, **kwargs)
+        self.consolidate_status = self.consolidate.status if self.consolidate else None
+        self.normalize_measurements()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(update_fields) & set(MEASUREMENT_FIELDS):
+            kwargs["update_fields"] = {*update_fields, *NORMALIZED_FIELDS}
+        # The counter updates in post_save commit or roll back with the row.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self.loaded_barcode = self.barcode
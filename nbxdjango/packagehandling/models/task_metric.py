@@ -0,0 +1,29 @@
+from django.db import models
+
+
+class TaskMetric(models.Model):
+    """
+    Timing of one executed django-q task, recorded by ``queue_metrics`` from the
+    cluster's execution signals. ``queued_ms`` is the wait between enqueue and
+    execution start; ``run_ms`` is the execution itself. ``lane`` is the queue
+    the task ran on (see ``packagehandling.lanes``).
+    """
+
+    task_id = models.CharField(max_length=32)
+    func = models.CharField(max_length=256)
+    group = models.CharField(max_length=100, blank=True)
+    lane = models.CharField(max_length=20, default="default")
+    success = models.BooleanField()
+    queued_ms = models.FloatField()
+    run_ms = models.FloatField()
+    finished_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["finished_at"]),
+            models.Index(fields=["group", "finished_at"]),
+            models.Index(fields=["lane", "finished_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.func} ({self.run_ms:.0f} ms)"
@@ -0,0 +1,255 @@
+"""
+Transactional outbox for partner webhooks.
+
+Model signals write an ``OutboxEvent`` row next to every package and
+consolidate change, inside the same transaction. The ``dispatch_outbox``
+django-q schedule then drains the outbox: for each due ``WebhookEndpoint`` it
+POSTs the events after the endpoint's ``last_event_id`` in batches, with up to
+``max_concurrency`` batches in flight, and advances the cursor past every
+batch delivered in order. Failed endpoints back off exponentially.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import math
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .models import OutboxEvent, WebhookEndpoint
+
+logger = logging.getLogger(__name__)
+
+
+def record_event(event_type, instance, payload):
+    """Add an event for ``instance`` to the outbox (in the caller's transaction)."""
+    return OutboxEvent.objects.create(
+        event_type=event_type,
+        aggregate_type=instance._meta.model_name,
+        aggregate_id=instance.pk,
+        client_id=instance.client_id,
+        payload=json.loads(json.dumps(payload, cls=DjangoJSONEncoder)),
+    )
+
+
+def record_deletions(queryset):
+    """Add a ``<model>.deleted`` event for every row of ``queryset`` (call before deleting them)."""
+    model_name = queryset.model._meta.model_name
+    return OutboxEvent.objects.bulk_create(
+        [
+            OutboxEvent(
+                event_type=f"{model_name}.deleted",
+                aggregate_type=model_name,
+                aggregate_id=pk,
+                client_id=client_id,
+                payload={"id": pk, "client_id": client_id},
+            )
+            for pk, client_id in queryset.values_list("pk", "client_id").iterator()
+        ]
+    )
+
+
+def package_payload(package):
+    return {
+        "id": package.pk,
+        "client_id": package.client_id,
+        "barcode": package.barcode,
+        "courier": package.courier,
+        "consolidate_id": package.consolidate_id,
+        "consolidate_status": package.consolidate_status,
+        "arrival_date": package.arrival_date,
+        "updated_at": package.updated_at,
+    }
+
+
+def consolidate_payload(consolidate, previous_status=None):
+    return {
+        "id": consolidate.pk,
+        "client_id": consolidate.client_id,
+        "status": consolidate.status,
+        "previous_status": previous_status,
+        "delivery_date": consolidate.delivery_date,
+        "updated_at": consolidate.updated_at,
+    }
+
+
+def backoff(failures):
+    """Seconds to wait after the ``failures``-th consecutive failure."""
+    return min(settings.WEBHOOK_RETRY_BASE_SECONDS * 2 ** (failures - 1), settings.WEBHOOK_RETRY_MAX_SECONDS)
+
+
+def sign(secret, body):
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def post_batch(endpoint, events):
+    """POST ``events`` to ``endpoint``; returns None on success or the error message."""
+    body = json.dumps(
+        {
+            "events": [
+                {
+                    "id": event.pk,
+                    "type": event.event_type,
+                    "occurred_at": event.created_at,
+                    "data": event.payload,
+                }
+                for event in events
+            ]
+        },
+        cls=DjangoJSONEncoder,
+    ).encode()
+    headers = {"Content-Type": "application/json", "User-Agent": "nbx-webhooks/1.0"}
+    if endpoint.secret:
+        headers["X-Webhook-Signature"] = f"sha256={sign(endpoint.secret, body)}"
+    request = urllib.request.Request(endpoint.url, data=body, headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=settings.WEBHOOK_TIMEOUT_SECONDS) as response:
+            response.read()
+    except urllib.error.HTTPError as error:
+        return f"HTTP {error.code}"
+    except (urllib.error.URLError, OSError) as error:
+        return str(getattr(error, "reason", error))
+    return None
+
+
+def _lease(rounds=1):
+    """How long to hold endpoints for ``rounds`` of requests, with room for a slow connect and the bookkeeping."""
+    return timedelta(seconds=settings.WEBHOOK_TIMEOUT_SECONDS * (rounds + 2))
+
+
+def _claim(endpoint, now):
+    """
+    Lease ``endpoint`` so overlapping dispatcher runs never deliver the same
+    batch twice. Returns the endpoint as it is once leased, or None when
+    another run holds it.
+    """
+    claimed = (
+        WebhookEndpoint.objects.filter(pk=endpoint.pk)
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+        .update(locked_until=now + _lease())
+    )
+    if not claimed:
+        return None
+    # Another run may have delivered and moved the cursor since the endpoint was listed.
+    return WebhookEndpoint.objects.get(pk=endpoint.pk)
+
+
+def _extend_leases(endpoints, plans):
+    """
+    Hold the leases for the whole run. An endpoint never has more than
+    ``max_concurrency`` batches planned, so no request waits on its semaphore:
+    they only queue for the ``WEBHOOK_DISPATCH_WORKERS`` threads, each taking
+    at most ``WEBHOOK_TIMEOUT_SECONDS``.
+    """
+    requests = sum(1 for plan in plans.values() for events, _ in plan if events)
+    rounds = math.ceil(requests / settings.WEBHOOK_DISPATCH_WORKERS)
+    if rounds > 1:
+        WebhookEndpoint.objects.filter(pk__in=[endpoint.pk for endpoint in endpoints]).update(
+            locked_until=timezone.now() + _lease(rounds)
+        )
+
+
+def _plan(endpoint, batch_size, now):
+    """The batches to send to ``endpoint`` this run, in outbox order, and the last event id of each."""
+    # Ids are assigned at insert but become visible at commit; leaving the newest events
+    # to settle keeps a slow transaction's lower id from landing behind the cursor.
+    settled = now - timedelta(seconds=settings.OUTBOX_SETTLE_SECONDS)
+    events = list(
+        OutboxEvent.objects.filter(pk__gt=endpoint.last_event_id, created_at__lte=settled).order_by("pk")[
+            : batch_size * endpoint.max_concurrency
+        ]
+    )
+    plan = []
+    for start in range(0, len(events), batch_size):
+        chunk = events[start : start + batch_size]
+        plan.append(([event for event in chunk if endpoint.wants(event.event_type)], chunk[-1].pk))
+    return plan
+
+
+def _deliver(endpoint, events, semaphore):
+    if not events:
+        # Nothing this endpoint subscribes to; the cursor still moves past the batch.
+        return None
+    with semaphore:
+        return post_batch(endpoint, events)
+
+
+def _record_outcome(endpoint, plan, errors, now):
+    delivered = 0
+    last_event_id = endpoint.last_event_id
+    error = None
+    for (events, batch_last_id), batch_error in zip(plan, errors):
+        if batch_error:
+            error = batch_error
+            break
+        last_event_id = batch_last_id
+        delivered += len(events)
+
+    updates = {"last_event_id": last_event_id, "locked_until": None}
+    if error:
+        failures = endpoint.failures + 1
+        updates.update(
+            failures=failures,
+            next_attempt_at=now + timedelta(seconds=backoff(failures)),
+            last_error=error,
+        )
+        logger.warning("Webhook %s failed (%s attempt(s)): %s", endpoint, failures, error)
+    else:
+        updates.update(failures=0, next_attempt_at=None, last_error="")
+    WebhookEndpoint.objects.filter(pk=endpoint.pk).update(**updates, updated_at=now)
+    return delivered, bool(error)
+
+
+def dispatch_outbox(batch_size=None):
+    """
+    Deliver pending outbox events to every due webhook endpoint. Scheduled by
+    ``setup_schedules``; safe to run concurrently with itself.
+    """
+    batch_size = batch_size or settings.WEBHOOK_BATCH_SIZE
+    now = timezone.now()
+    due = WebhookEndpoint.objects.filter(is_active=True).filter(
+        Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now)
+    )
+    endpoints = [claimed for claimed in (_claim(endpoint, now) for endpoint in due) if claimed is not None]
+    plans = {endpoint.pk: _plan(endpoint, batch_size, now) for endpoint in endpoints}
+    _extend_leases(endpoints, plans)
+
+    # Only the HTTP calls run in threads, at most ``max_concurrency`` per endpoint;
+    # all database bookkeeping stays on this thread.
+    with ThreadPoolExecutor(max_workers=settings.WEBHOOK_DISPATCH_WORKERS) as pool:
+        futures = {}
+        for endpoint in endpoints:
+            semaphore = threading.BoundedSemaphore(endpoint.max_concurrency)
+            futures[endpoint.pk] = [
+                pool.submit(_deliver, endpoint, events, semaphore) for events, _ in plans[endpoint.pk]
+            ]
+        errors = {pk: [future.result() for future in endpoint_futures] for pk, endpoint_futures in futures.items()}
+
+    summary = {"endpoints": len(endpoints), "delivered": 0, "failed": 0}
+    for endpoint in endpoints:
+        delivered, failed = _record_outcome(endpoint, plans[endpoint.pk], errors[endpoint.pk], now)
+        summary["delivered"] += delivered
+        summary["failed"] += failed
+
+    summary["pruned"] = prune_outbox(now)
+    return summary
+
+
+def prune_outbox(now=None):
+    """Delete events every active endpoint has consumed and that are past the retention window."""
+    now = now or timezone.now()
+    consumed = WebhookEndpoint.objects.filter(is_active=True).aggregate(low=Min("last_event_id"))["low"]
+    queryset = OutboxEvent.objects.filter(created_at__lt=now - timedelta(days=settings.OUTBOX_RETENTION_DAYS))
+    if consumed is not None:
+        queryset = queryset.filter(pk__lte=consumed)
+    deleted, _ = queryset.delete()
+    return deleted
@@ -0,0 +1,213 @@
+"""
+Monthly range partitioning of the package and consolidation tables.
+
+With ``DB_PARTITIONING`` set on PostgreSQL, ``packagehandling_consolidate`` and
+``packagehandling_package`` are declaratively partitioned by
+``RANGE (created_at)``: one partition per calendar month (UTC), plus a default
+partition for rows outside them. Each month is vacuumed and reindexed on its
+own, and queries bounded on ``created_at`` (``created_between``) only scan the
+months they cover.
+
+PostgreSQL requires the partition key in every unique constraint of a
+partitioned table, so once converted:
+
+- the primary key is ``(id, created_at)``; ids still come from one sequence;
+- ``Package.barcode`` is no longer unique in the database, ``Package.clean``
+  checks it instead;
+- ``Package.consolidate`` has no foreign key constraint in the database
+  (``on_delete`` is carried out by Django either way).
+
+``conversion_sql`` rebuilds a table in place. Migration 0013 runs it when
+``DB_PARTITIONING`` is set at migrate time; on an existing database run
+``manage.py partition_tables --convert`` in a maintenance window instead, as it
+locks the table while every row is copied. ``ensure_partitions`` (scheduled
+daily) creates the partitions for the coming ``PARTITION_MONTHS_AHEAD``
+months. Without partitioning, or on another database (SQLite in tests),
+everything here is a no-op.
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from .models import Consolidate, Package
+
+# Converted in this order. Foreign keys pointing at a partitioned table are dropped.
+PARTITIONED_MODELS = (Consolidate, Package)
+
+
+def partitioning_enabled(connection):
+    return settings.DB_PARTITIONING and connection.vendor == "postgresql"
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_ranges(first, last):
+    """``(start, end)`` dates of every month from ``first``'s to ``last``'s, inclusive."""
+    month, last = month_start(first), month_start(last)
+    ranges = []
+    while month <= last:
+        ranges.append((month, add_months(month, 1)))
+        month = add_months(month, 1)
+    return ranges
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def create_partition_sql(connection, table, start, end):
+    qn = connection.ops.quote_name
+    return (
+        f"CREATE TABLE IF NOT EXISTS {qn(partition_name(table, start))} PARTITION OF {qn(table)} "
+        f"FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') TO ('{end.isoformat()} 00:00:00+00')"
+    )
+
+
+def is_partitioned(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [table])
+        return cursor.fetchone() is not None
+
+
+def partitions(connection, table):
+    """Names of ``table``'s partitions."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(%s) ORDER BY child.relname",
+            [table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def conversion_sql(model, schema_editor, months_ahead=None):
+    """
+    Statements that turn ``model``'s table into a partitioned one holding the
+    same rows, with monthly partitions from its oldest row to
+    ``months_ahead`` (default ``PARTITION_MONTHS_AHEAD``) months from now.
+    """
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    connection = schema_editor.connection
+    qn = schema_editor.quote_name
+    table = model._meta.db_table
+    legacy = f"{table}_unpartitioned"
+    pk = model._meta.pk.column
+    created_at = model._meta.get_field("created_at").column
+    sequence = f"{table}_{pk}_seq"
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN({qn(created_at)}) FROM {qn(table)}")
+        oldest = cursor.fetchone()[0] or timezone.now()
+    now = timezone.now()
+
+    statements = [
+        f"LOCK TABLE {qn(table)} IN ACCESS EXCLUSIVE MODE",
+        f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}",
+    ]
+    # A foreign key can only reference a unique constraint, which no longer covers id alone.
+    for relation in model._meta.related_objects:
+        field = relation.field
+        if relation.many_to_many or not field.db_constraint:
+            continue
+        referencing = relation.related_model
+        for name in schema_editor._constraint_names(referencing, [field.column], foreign_key=True):
+            statements.append(f"ALTER TABLE {qn(referencing._meta.db_table)} DROP CONSTRAINT {qn(name)}")
+    statements += [
+        f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE) "
+        f"PARTITION BY RANGE ({qn(created_at)})",
+        # Partitioned tables can't have identity columns before PostgreSQL 17: ids move to a plain sequence.
+        f"CREATE SEQUENCE {qn(sequence + '_new')} AS bigint OWNED BY {qn(table)}.{qn(pk)}",
+        f"SELECT setval('{sequence}_new', COALESCE((SELECT MAX({qn(pk)}) FROM {qn(legacy)}), 0) + 1, false)",
+        f"ALTER TABLE {qn(table)} ALTER COLUMN {qn(pk)} SET DEFAULT nextval('{sequence}_new')",
+    ]
+    for start, end in month_ranges(oldest, add_months(month_start(now), months_ahead)):
+        statements.append(create_partition_sql(connection, table, start, end))
+    statements += [
+        f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT",
+        f"INSERT INTO {qn(table)} SELECT * FROM {qn(legacy)}",
+        # Drops the old sequence with it, freeing its name (the column default follows the rename).
+        f"DROP TABLE {qn(legacy)}",
+        f"ALTER SEQUENCE {qn(sequence + '_new')} RENAME TO {qn(sequence)}",
+        f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(table + '_pkey')} PRIMARY KEY ({qn(pk)}, {qn(created_at)})",
+        *(str(sql) for sql in schema_editor._model_indexes_sql(model)),
+    ]
+    partitioned_tables = {partitioned._meta.db_table for partitioned in PARTITIONED_MODELS}
+    for field in model._meta.local_fields:
+        target = field.remote_field.model._meta.db_table if field.remote_field else None
+        if target and field.db_constraint and target not in partitioned_tables:
+            statements.append(str(schema_editor._create_fk_sql(model, field, "_fk_%(to_table)s_%(to_column)s")))
+    return statements
+
+
+def partition_tables(apps, schema_editor):
+    """Migration step: convert the tables when ``DB_PARTITIONING`` is set."""
+    connection = schema_editor.connection
+    if not partitioning_enabled(connection):
+        return
+    for model in PARTITIONED_MODELS:
+        model = apps.get_model(model._meta.label)
+        if not is_partitioned(connection, model._meta.db_table):
+            for sql in conversion_sql(model, schema_editor):
+                schema_editor.execute(sql, params=None)
+
+
+def missing_partitions(connection, table, months_ahead=None):
+    """``(start, end)`` of the months from this one to ``months_ahead`` ahead that ``table`` has no partition for."""
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    existing = set(partitions(connection, table))
+    now = timezone.now()
+    return [
+        (start, end)
+        for start, end in month_ranges(now, add_months(month_start(now), months_ahead))
+        if partition_name(table, start) not in existing
+    ]
+
+
+def ensure_partitions(months_ahead=None, using="default", dry_run=False):
+    """
+    Create the partitions for this month and the next ``months_ahead``
+    (default ``PARTITION_MONTHS_AHEAD``) of every partitioned table. Returns the
+    names of the partitions (to be) created. Scheduled daily.
+    """
+    connection = connections[using]
+    if not partitioning_enabled(connection):
+        return []
+    created = []
+    for model in PARTITIONED_MODELS:
+        table = model._meta.db_table
+        if not is_partitioned(connection, table):
+            continue
+        for start, end in missing_partitions(connection, table, months_ahead):
+            if not dry_run:
+                with connection.cursor() as cursor:
+                    cursor.execute(create_partition_sql(connection, table, start, end))
+            created.append(partition_name(table, start))
+    return created
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def created_between(queryset, created_from=None, created_to=None):
+    """
+    ``queryset`` limited to rows created from ``created_from`` to ``created_to``
+    (dates, inclusive, in the current time zone). Plain ``created_at`` range
+    bounds rather than ``__date`` lookups, so PostgreSQL skips the partitions
+    (and index ranges) outside them.
+    """
+    if created_from:
+        queryset = queryset.filter(created_at__gte=_day_start(created_from))
+    if created_to:
+        queryset = queryset.filter(created_at__lt=_day_start(created_to + timedelta(days=1)))
+    return queryset
@@ -0,0 +1,180 @@
+"""
+Vectorised volumetric-weight and pricing engine.
+
+For every package:
+
+- the actual weight is ``weight`` in kg and the volumetric weight is
+  ``length × width × height`` in cm³ divided by ``PRICING_VOLUMETRIC_DIVISOR``;
+- the billable weight is the larger of the two, rounded up to the next
+  ``PRICING_WEIGHT_INCREMENT_KG``;
+- the service price is the billable weight times the per-kg rate of its
+  bracket in ``PRICING_RATE_TABLE``, and at least ``PRICING_MINIMUM_CHARGE``.
+
+Packages are priced as NumPy column arrays, never one row at a time in Python:
+``reprice_packages`` reads the queryset's measurement columns, prices them in
+one vectorised pass and writes the changed prices back with chunked
+``bulk_update``. A package with neither a weight nor all three dimensions has
+no price (NaN in the arrays, None in quotes) and is left untouched.
+"""
+
+import math
+from collections import namedtuple
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .counters import recompute_counters
+from .models import Client, Consolidate, Package
+from .models.package import MEASUREMENT_FIELDS
+from .units import CM_PER, DEFAULT_DIMENSION_UNIT, DEFAULT_WEIGHT_UNIT, KG_PER
+
+RateTable = namedtuple("RateTable", ["limits", "rates", "volumetric_divisor", "weight_increment", "minimum_charge"])
+
+Quote = namedtuple(
+    "Quote", ["package_id", "actual_weight", "volumetric_weight", "billable_weight", "service_price", "current_price"]
+)
+
+
+def rate_table(brackets=None, volumetric_divisor=None, weight_increment=None, minimum_charge=None):
+    """A ``RateTable`` from the ``PRICING_*`` settings, with any of them overridden."""
+    brackets = settings.PRICING_RATE_TABLE if brackets is None else brackets
+    if not brackets or brackets[-1][0] is not None:
+        raise ValueError("The rate table needs brackets, the last one without a maximum weight.")
+    limits = [math.inf if limit is None else float(limit) for limit, _ in brackets]
+    if limits != sorted(limits) or len(set(limits)) != len(limits):
+        raise ValueError("Rate table brackets must be in increasing order of maximum weight.")
+    table = RateTable(
+        limits=np.array(limits),
+        rates=np.array([float(rate) for _, rate in brackets]),
+        volumetric_divisor=float(volumetric_divisor or settings.PRICING_VOLUMETRIC_DIVISOR),
+        weight_increment=float(weight_increment or settings.PRICING_WEIGHT_INCREMENT_KG),
+        minimum_charge=float(settings.PRICING_MINIMUM_CHARGE if minimum_charge is None else minimum_charge),
+    )
+    if table.volumetric_divisor <= 0 or table.weight_increment <= 0:
+        raise ValueError("The volumetric divisor and weight increment must be positive.")
+    return table
+
+
+def _unit_factors(units, factors, default):
+    """Conversion factor per element of ``units``, looked up once per distinct unit."""
+    units = np.array([(unit or "").strip().lower() for unit in units], dtype=object)
+    if not len(units):
+        return np.empty(0)
+    distinct, inverse = np.unique(units, return_inverse=True)
+    return np.array([factors.get(unit, factors[default]) for unit in distinct])[inverse]
+
+
+def price_arrays(length, width, height, dimension_unit, weight, weight_unit, table=None):
+    """
+    Price packages given as equally long columns (floats with NaN for missing
+    values, unit strings or None). Returns ``actual_weight``,
+    ``volumetric_weight``, ``billable_weight`` (kg) and ``service_price``
+    arrays; NaN where a value cannot be computed.
+    """
+    table = table or rate_table()
+    to_cm = _unit_factors(dimension_unit, CM_PER, DEFAULT_DIMENSION_UNIT)
+    actual = np.asarray(weight, dtype=float) * _unit_factors(weight_unit, KG_PER, DEFAULT_WEIGHT_UNIT)
+    volume = (
+        np.asarray(length, dtype=float) * np.asarray(width, dtype=float) * np.asarray(height, dtype=float) * to_cm**3
+    )
+    volumetric = volume / table.volumetric_divisor
+
+    # fmax ignores a NaN operand, so a package with only a weight or only dimensions is still priced.
+    billable = np.fmax(actual, volumetric)
+    billable = np.ceil(np.round(billable / table.weight_increment, 9)) * table.weight_increment
+    bracket = np.minimum(np.searchsorted(table.limits, billable, side="left"), len(table.rates) - 1)
+    price = np.fmax(billable * table.rates[bracket], table.minimum_charge)
+    price = np.where(np.isnan(billable), np.nan, np.round(price, 2))
+    return {
+        "actual_weight": actual,
+        "volumetric_weight": volumetric,
+        "billable_weight": billable,
+        "service_price": price,
+    }
+
+
+def _columns(rows):
+    """Column arrays from ``values_list("id", "service_price", *MEASUREMENT_FIELDS)`` rows."""
+    ids, prices, length, width, height, dimension_unit, weight, weight_unit = zip(*rows) if rows else ([],) * 8
+    return (
+        np.array(ids, dtype=np.int64),
+        np.array(prices, dtype=float),
+        {
+            "length": np.array(length, dtype=float),
+            "width": np.array(width, dtype=float),
+            "height": np.array(height, dtype=float),
+            "dimension_unit": dimension_unit,
+            "weight": np.array(weight, dtype=float),
+            "weight_unit": weight_unit,
+        },
+    )
+
+
+def _price_queryset(queryset, table):
+    rows = list(queryset.order_by("pk").values_list("id", "service_price", *MEASUREMENT_FIELDS))
+    ids, current, measurements = _columns(rows)
+    return ids, current, price_arrays(**measurements, table=table)
+
+
+def _number(value):
+    return None if np.isnan(value) else float(value)
+
+
+def quote(queryset, table=None):
+    """``Quote`` per package of ``queryset``, without saving anything."""
+    ids, current, priced = _price_queryset(queryset, table or rate_table())
+    return [
+        Quote(
+            package_id=int(ids[index]),
+            actual_weight=_number(priced["actual_weight"][index]),
+            volumetric_weight=_number(priced["volumetric_weight"][index]),
+            billable_weight=_number(priced["billable_weight"][index]),
+            service_price=_number(priced["service_price"][index]),
+            current_price=_number(current[index]),
+        )
+        for index in range(len(ids))
+    ]
+
+
+def quote_measurements(items, table=None):
+    """Price ad-hoc packages, given as dicts with any of ``MEASUREMENT_FIELDS``, in input order."""
+    columns = {field: [item.get(field) for item in items] for field in MEASUREMENT_FIELDS}
+    for field in ("length", "width", "height", "weight"):
+        columns[field] = np.array(columns[field], dtype=float)
+    priced = price_arrays(**columns, table=table or rate_table())
+    return [{name: _number(values[index]) for name, values in priced.items()} for index in range(len(items))]
+
+
+def reprice_packages(queryset, table=None, chunk_size=5000, dry_run=False):
+    """
+    Reprice every package of ``queryset``: one vectorised pricing pass, then
+    ``bulk_update`` of the changed prices (with ``updated_at``, so change feeds
+    pick them up) in chunks of ``chunk_size``, one transaction per chunk. The
+    cached totals of the affected consolidations are recomputed afterwards.
+    Returns ``(priced, changed)`` package counts.
+    """
+    ids, current, priced = _price_queryset(queryset, table or rate_table())
+    prices = priced["service_price"]
+    priceable = ~np.isnan(prices)
+    changed = priceable & (np.isnan(current) | (np.abs(prices - np.nan_to_num(current)) >= 0.005))
+    changed_ids, changed_prices = ids[changed], prices[changed]
+    if dry_run or not len(changed_ids):
+        return int(priceable.sum()), len(changed_ids)
+
+    now = timezone.now()
+    for start in range(0, len(changed_ids), chunk_size):
+        chunk = [
+            Package(pk=int(package_id), service_price=float(price), updated_at=now)
+            for package_id, price in zip(
+                changed_ids[start : start + chunk_size], changed_prices[start : start + chunk_size]
+            )
+        ]
+        with transaction.atomic():
+            Package.objects.bulk_update(chunk, ["service_price", "updated_at"])
+
+    # bulk_update bypasses the counter updates of Package.save().
+    consolidate_ids = queryset.filter(consolidate__isnull=False).values("consolidate_id")
+    recompute_counters(clients=Client.objects.none(), consolidates=Consolidate.objects.filter(pk__in=consolidate_ids))
+    return int(priceable.sum()), len(changed_ids)
@@ -0,0 +1,181 @@
+"""
+qstats-style metrics for the django-q cluster.
+
+The cluster's execution signals record one ``TaskMetric`` per executed task:
+``pre_execute`` (in the worker process) stamps the moment execution starts on
+the task package, and ``post_execute`` (in the monitor process, after the
+result is saved) stores how long the task waited in the queue, how long it ran
+and which lane it ran on. ``queue_stats`` combines those rows with the live
+depth of every lane's queue; it backs ``manage.py qstats`` and the
+``queueStats`` query.
+"""
+
+import logging
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count, Max, Q
+from django.utils import timezone
+from django_q.brokers import get_broker
+from django_q.status import Stat
+from django_q.utils import get_func_repr
+
+from . import lanes
+from .models import TaskMetric
+
+logger = logging.getLogger(__name__)
+
+
+def _ms(delta):
+    return max(delta.total_seconds() * 1000, 0.0)
+
+
+def mark_execution_started(sender, func, task, **kwargs):
+    task["execution_started"] = timezone.now()
+
+
+def record_task_metric(sender, task, **kwargs):
+    # post_execute is sent without send_robust(); an error here would stop the monitor.
+    try:
+        enqueued = task["started"]
+        execution_started = task.get("execution_started", enqueued)
+        TaskMetric.objects.create(
+            task_id=task["id"],
+            func=get_func_repr(task["func"])[:256],
+            group=(task.get("group") or "")[:100],
+            lane=lanes.lane_of(task)[:20],
+            success=bool(task["success"]),
+            queued_ms=_ms(execution_started - enqueued),
+            run_ms=_ms(task["stopped"] - execution_started),
+            finished_at=task["stopped"],
+        )
+    except Exception:
+        logger.exception("Could not record metrics for task %s", task.get("id"))
+
+
+def prune_task_metrics():
+    """Delete metrics older than ``TASK_METRICS_RETENTION_HOURS``. Scheduled by ``setup_schedules``."""
+    cutoff = timezone.now() - timedelta(hours=settings.TASK_METRICS_RETENTION_HOURS)
+    deleted, _ = TaskMetric.objects.filter(finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def _percentile(queryset, field, pct, count):
+    """Nearest-rank percentile of ``field``, picked by the database rather than loaded into Python."""
+    if not count:
+        return None
+    rank = max(1, math.ceil(pct / 100 * count))
+    return queryset.order_by(field).values_list(field, flat=True)[rank - 1]
+
+
+def _rate(part, total):
+    return round(part / total, 4) if total else 0.0
+
+
+def _lane_enabled(lane):
+    return lane == lanes.DEFAULT or lanes.cluster_for(lane) is not None
+
+
+def _broker_status():
+    """Cluster status and ``{lane: (queue_depth, in_flight)}`` for every lane with its own queue."""
+    try:
+        clusters = Stat.get_all(get_broker())
+        depths = {}
+        for lane in filter(_lane_enabled, lanes.LANES):
+            broker = lanes.broker_for(lane)
+            # The ORM broker keeps dequeued tasks in the table until they are acknowledged.
+            in_flight = broker.lock_size() if settings.Q_BROKER == "orm" else None
+            depths[lane] = (broker.queue_size(), in_flight)
+    except Exception as error:
+        logger.warning("Could not read the django-q broker: %s", error)
+        return {"queue_depth": None, "in_flight": None, "clusters": None, "workers": None}, {}
+    in_flight = [value for _, value in depths.values() if value is not None]
+    status = {
+        "queue_depth": sum(depth for depth, _ in depths.values()),
+        "in_flight": sum(in_flight) if in_flight else None,
+        "clusters": len(clusters),
+        "workers": sum(len(stat.workers) for stat in clusters),
+    }
+    return status, depths
+
+
+def _lane_stats(metrics, depths):
+    totals = {
+        row["lane"]: row
+        for row in metrics.values("lane").annotate(
+            tasks=Count("id"),
+            failures=Count("id", filter=Q(success=False)),
+            avg_queued_ms=Avg("queued_ms"),
+            avg_run_ms=Avg("run_ms"),
+        )
+    }
+    rows = []
+    for lane in lanes.LANES:
+        row = totals.get(lane, {"tasks": 0, "failures": 0, "avg_queued_ms": None, "avg_run_ms": None})
+        rows.append(
+            {
+                "lane": lane,
+                "enabled": _lane_enabled(lane),
+                "queue_depth": depths.get(lane, (None, None))[0],
+                "tasks": row["tasks"],
+                "failures": row["failures"],
+                "failure_rate": _rate(row["failures"], row["tasks"]),
+                "avg_queued_ms": row["avg_queued_ms"],
+                "p95_queued_ms": _percentile(metrics.filter(lane=lane), "queued_ms", 95, row["tasks"]),
+                "avg_run_ms": row["avg_run_ms"],
+            }
+        )
+    return rows
+
+
+def queue_stats(minutes=15, metrics=None):
+    """
+    Queue depth plus latency, failure rate and per-function timing of the tasks
+    finished in the last ``minutes``. ``metrics`` narrows the ``TaskMetric`` rows
+    considered (e.g. to one group).
+    """
+    since = timezone.now() - timedelta(minutes=minutes)
+    metrics = (metrics if metrics is not None else TaskMetric.objects.all()).filter(finished_at__gte=since)
+    totals = metrics.aggregate(
+        tasks=Count("id"),
+        failures=Count("id", filter=Q(success=False)),
+        avg_queued_ms=Avg("queued_ms"),
+        max_queued_ms=Max("queued_ms"),
+        avg_run_ms=Avg("run_ms"),
+        max_run_ms=Max("run_ms"),
+    )
+    tasks = totals["tasks"]
+    functions = [
+        {**row, "failure_rate": _rate(row["failures"], row["tasks"])}
+        for row in metrics.values("func")
+        .annotate(
+            tasks=Count("id"),
+            failures=Count("id", filter=Q(success=False)),
+            avg_queued_ms=Avg("queued_ms"),
+            avg_run_ms=Avg("run_ms"),
+            max_run_ms=Max("run_ms"),
+        )
+        .order_by("-tasks", "func")
+    ]
+    status, depths = _broker_status()
+    return {
+        **status,
+        "window_minutes": minutes,
+        "tasks": tasks,
+        "failures": totals["failures"],
+        "failure_rate": _rate(totals["failures"], tasks),
+        "throughput_per_minute": round(tasks / minutes, 2) if minutes else None,
+        "queued_ms": {
+            "avg": totals["avg_queued_ms"],
+            "p95": _percentile(metrics, "queued_ms", 95, tasks),
+            "max": totals["max_queued_ms"],
+        },
+        "run_ms": {
+            "avg": totals["avg_run_ms"],
+            "p95": _percentile(metrics, "run_ms", 95, tasks),
+            "max": totals["max_run_ms"],
+        },
+        "functions": functions,
+        "lanes": _lane_stats(metrics, depths),
+    }
@@ -0,0 +1,81 @@
+"""
+Publishing and listening for real-time GraphQL subscription events.
+
+Events travel over the Channels layer (``CHANNEL_LAYERS``) in one group per
+topic and client, plus an ``all`` group per topic for admins, so every web
+process only receives the events its open subscriptions asked for.
+"""
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+CONSOLIDATE_STATUS_CHANGED = "consolidate-status"
+PACKAGE_ARRIVED = "package-arrived"
+
+
+def group_name(topic, client_id=None):
+    """Channel layer group for ``topic`` events of one client, or of every client."""
+    return f"{topic}.client-{client_id}" if client_id is not None else f"{topic}.all"
+
+
+def _send(topic, client_id, payload):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    message = {"type": "graphql.event", "payload": payload}
+    for group in (group_name(topic, client_id), group_name(topic)):
+        async_to_sync(channel_layer.group_send)(group, message)
+
+
+def publish(topic, client_id, payload):
+    """
+    Broadcast ``payload`` once the current transaction commits, so subscribers
+    never see an event for a change that is rolled back.
+    """
+    transaction.on_commit(lambda: _send(topic, client_id, payload))
+
+
+def publish_consolidate_status_changed(consolidate, previous_status):
+    publish(
+        CONSOLIDATE_STATUS_CHANGED,
+        consolidate.client_id,
+        {
+            "consolidate_id": consolidate.pk,
+            "client_id": consolidate.client_id,
+            "previous_status": previous_status,
+            "status": consolidate.status,
+            "changed_at": consolidate.updated_at.isoformat(),
+        },
+    )
+
+
+def publish_package_arrived(package):
+    publish(
+        PACKAGE_ARRIVED,
+        package.client_id,
+        {
+            "package_id": package.pk,
+            "client_id": package.client_id,
+            "barcode": package.barcode,
+            "courier": package.courier,
+            "description": package.description,
+            # Mutations may hand over the date as an ISO string; str() covers both.
+            "arrival_date": str(package.arrival_date) if package.arrival_date else None,
+            "created_at": package.created_at.isoformat(),
+        },
+    )
+
+
+async def listen(topic, client_id=None):
+    """Yield the payload of every ``topic`` event published for ``client_id`` (or any client)."""
+    channel_layer = get_channel_layer()
+    channel = await channel_layer.new_channel()
+    group = group_name(topic, client_id)
+    await channel_layer.group_add(group, channel)
+    try:
+        while True:
+            message = await channel_layer.receive(channel)
+            yield message["payload"]
+    finally:
+        await channel_layer.group_discard(group, channel)
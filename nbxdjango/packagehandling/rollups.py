@@ -0,0 +1,246 @@
+"""
+Daily activity rollups.
+
+``DailyRollup`` keeps, per day, the packages that arrived (by
+``arrival_date``) with the sums of their ``real_price`` and ``service_price``,
+and the consolidations created and delivered: one row per client with any
+activity that day, plus one row for all clients together. ``arrivalStats`` and
+``revenueStats`` read these rows instead of scanning packages and
+consolidations. Archived rows (``packagehandling.archive``) keep counting.
+
+``refresh_rollups`` (scheduled every 15 minutes) recomputes only the
+(client, day) rows that may have changed since its last run, found through:
+
+- packages and consolidations with a newer ``updated_at``, which every
+  change bumps (the same guarantee the sync feeds rely on);
+- the delivered status events (``status_history``) of those consolidations;
+- deletion tombstones (``DeletionLog``): every day of the client is redone;
+- rows marked ``stale`` when a package moved to another day or client.
+
+The first run, or ``manage.py refresh_rollups --full``, rebuilds everything.
+"""
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import (
+    ArchivedConsolidate,
+    ArchivedPackage,
+    Consolidate,
+    ConsolidateStatusEvent,
+    DailyRollup,
+    DeletionLog,
+    Package,
+)
+
+ROLLUP_FIELDS = (
+    "packages_arrived",
+    "real_price_total",
+    "service_price_total",
+    "consolidates_created",
+    "consolidates_delivered",
+)
+GRANULARITIES = {"day": None, "week": TruncWeek, "month": TruncMonth}
+MAX_PERIODS = 400
+
+# Rows saved just before a run may only commit after it has read past them.
+OVERLAP = timedelta(minutes=10)
+# Days recomputed per transaction.
+DAYS_PER_BATCH = 31
+
+
+def _local_date(field):
+    return TruncDate(field, tzinfo=timezone.get_current_timezone())
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _delivered_events():
+    """Delivered status events annotated with the consolidation's client and the local ``day``."""
+    client_of = [
+        Subquery(model.objects.filter(pk=OuterRef("consolidate_id")).values("client_id")[:1])
+        for model in (Consolidate, ArchivedConsolidate)
+    ]
+    return ConsolidateStatusEvent.objects.filter(status=Consolidate.Status.DELIVERED).annotate(
+        client_id=Coalesce(*client_of), day=_local_date("created_at")
+    )
+
+
+def mark_stale(client_id, day):
+    """Have the next refresh redo ``day`` for ``client_id`` (and all clients) although no row changed on it."""
+    if day is not None:
+        DailyRollup.objects.filter(Q(client_id=client_id) | Q(client_id__isnull=True), day=day).update(stale=True)
+
+
+def compute_figures(days, client_ids=None):
+    """
+    ``{(client_id, day): {field: value}}`` for ``days`` and ``client_ids``
+    (default: every client), from the package and consolidation tables.
+    Clients and days without any activity are left out.
+    """
+    figures = defaultdict(lambda: dict.fromkeys(ROLLUP_FIELDS, 0))
+    clients = Q() if client_ids is None else Q(client_id__in=client_ids)
+    created_range = Q(created_at__gte=_day_start(min(days)), created_at__lt=_day_start(max(days) + timedelta(days=1)))
+
+    for model in (Package, ArchivedPackage):
+        arrived = model.objects.filter(clients, arrival_date__in=days).order_by().values("client_id", "arrival_date")
+        for row in arrived.annotate(count=Count("id"), real=Sum("real_price"), service=Sum("service_price")):
+            counts = figures[row["client_id"], row["arrival_date"]]
+            counts["packages_arrived"] += row["count"]
+            counts["real_price_total"] += row["real"] or 0.0
+            counts["service_price_total"] += row["service"] or 0.0
+
+    for model in (Consolidate, ArchivedConsolidate):
+        created = model.objects.filter(clients, created_range).annotate(day=_local_date("created_at"))
+        for row in created.order_by().values("client_id", "day").annotate(count=Count("id")):
+            figures[row["client_id"], row["day"]]["consolidates_created"] += row["count"]
+
+    delivered = _delivered_events().filter(clients, created_range)
+    for row in delivered.order_by().values("client_id", "day").annotate(count=Count("id")):
+        if row["client_id"] is not None:
+            figures[row["client_id"], row["day"]]["consolidates_delivered"] += row["count"]
+
+    wanted = set(days)
+    return {key: counts for key, counts in figures.items() if key[1] in wanted}
+
+
+def _rebuild(days, client_ids, refreshed_at):
+    """Recompute the rows of ``client_ids`` (None: all) and the all-clients rows for ``days``."""
+    figures = compute_figures(days, client_ids)
+    with transaction.atomic():
+        rows = DailyRollup.objects.filter(day__in=days)
+        if client_ids is not None:
+            rows = rows.filter(Q(client_id__in=client_ids) | Q(client_id__isnull=True))
+        rows.delete()
+        DailyRollup.objects.bulk_create(
+            [
+                DailyRollup(client_id=client_id, day=day, refreshed_at=refreshed_at, **counts)
+                for (client_id, day), counts in figures.items()
+            ]
+        )
+        totals = (
+            DailyRollup.objects.filter(day__in=days, client_id__isnull=False)
+            .values("day")
+            .annotate(**{field: Sum(field) for field in ROLLUP_FIELDS})
+        )
+        DailyRollup.objects.bulk_create([DailyRollup(refreshed_at=refreshed_at, **row) for row in totals])
+    return len(figures)
+
+
+def changed_client_days(since):
+    """``(client_id, day)`` pairs whose rows may be out of date because of changes from ``since`` on."""
+    pairs = set()
+    for model in (Package, ArchivedPackage):
+        changed = model.objects.filter(updated_at__gte=since, arrival_date__isnull=False)
+        pairs.update(changed.values_list("client_id", "arrival_date").distinct())
+
+    consolidate_clients = {}
+    for model in (Consolidate, ArchivedConsolidate):
+        changed = model.objects.filter(updated_at__gte=since).annotate(day=_local_date("created_at"))
+        for pk, client_id, day in changed.values_list("pk", "client_id", "day"):
+            consolidate_clients[pk] = client_id
+            pairs.add((client_id, day))
+    # A delivery saves the consolidation, so its event is as recent as the updated_at found above.
+    delivered = ConsolidateStatusEvent.objects.filter(status=Consolidate.Status.DELIVERED, created_at__gte=since)
+    for consolidate_id, day in delivered.annotate(day=_local_date("created_at")).values_list("consolidate_id", "day"):
+        if consolidate_id in consolidate_clients:
+            pairs.add((consolidate_clients[consolidate_id], day))
+
+    deleted_from = DeletionLog.objects.filter(deleted_at__gte=since).values("client_id")
+    stale = Q(client_id__in=deleted_from) | Q(stale=True)
+    for client_id, day in DailyRollup.objects.filter(stale).values_list("client_id", "day"):
+        # A stale all-clients row is redone with whichever client rows are redone that day.
+        pairs.add((client_id, day))
+    return pairs
+
+
+def _all_days():
+    days = set()
+    for model in (Package, ArchivedPackage):
+        days.update(model.objects.filter(arrival_date__isnull=False).values_list("arrival_date", flat=True).distinct())
+    for model in (Consolidate, ArchivedConsolidate):
+        days.update(model.objects.annotate(day=_local_date("created_at")).values_list("day", flat=True).distinct())
+    days.update(_delivered_events().values_list("day", flat=True).distinct())
+    return days
+
+
+def refresh_rollups(full=False):
+    """
+    Bring ``DailyRollup`` up to date: only the days changed since the last
+    refresh, or everything with ``full`` (or on the first run). Returns the
+    numbers of days and client rows recomputed. Scheduled every 15 minutes.
+    """
+    started = timezone.now()
+    last_refresh = None if full else DailyRollup.objects.aggregate(last=Max("refreshed_at"))["last"]
+
+    if last_refresh is None:
+        days = sorted(_all_days())
+        batches = [(days[i : i + DAYS_PER_BATCH], None) for i in range(0, len(days), DAYS_PER_BATCH)]
+    else:
+        clients_by_day = defaultdict(set)
+        for client_id, day in changed_client_days(last_refresh - OVERLAP):
+            clients = clients_by_day[day]
+            if client_id is not None:
+                clients.add(client_id)
+        days = sorted(clients_by_day)
+        batches = []
+        for i in range(0, len(days), DAYS_PER_BATCH):
+            batch = days[i : i + DAYS_PER_BATCH]
+            batches.append((batch, set().union(*(clients_by_day[day] for day in batch))))
+
+    rows = sum(_rebuild(batch, client_ids, started) for batch, client_ids in batches)
+    if last_refresh is None:
+        # Days left without any activity.
+        DailyRollup.objects.filter(refreshed_at__lt=started).delete()
+    return {"days": len(days), "rows": rows}
+
+
+def periods(date_from, date_to, granularity):
+    """Start dates of the ``granularity`` periods from ``date_from``'s to ``date_to``'s."""
+    if granularity == "month":
+        start = date_from.replace(day=1)
+    elif granularity == "week":
+        start = date_from - timedelta(days=date_from.weekday())
+    else:
+        start = date_from
+
+    result = []
+    while start <= date_to:
+        result.append(start)
+        if granularity == "month":
+            start = (start + timedelta(days=32)).replace(day=1)
+        else:
+            start += timedelta(weeks=1) if granularity == "week" else timedelta(days=1)
+    return result
+
+
+def rollup_series(fields, date_from, date_to, granularity="day", client_id=None):
+    """
+    ``fields`` of the rollups summed per ``granularity`` period (day, week
+    starting Monday, or month) from ``date_from`` to ``date_to``, for one
+    client or all of them. Every period is listed, with zeros when idle.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Invalid granularity. Valid values are {', '.join(GRANULARITIES)}.")
+    if date_from > date_to:
+        raise ValueError("from must not be after to.")
+    starts = periods(date_from, min(date_to, date_from + timedelta(days=MAX_PERIODS * 31)), granularity)
+    if len(starts) > MAX_PERIODS:
+        raise ValueError(f"At most {MAX_PERIODS} periods per query; use a coarser granularity.")
+
+    rows = DailyRollup.objects.filter(day__gte=date_from, day__lte=date_to)
+    rows = rows.filter(client_id=client_id) if client_id else rows.filter(client_id__isnull=True)
+    trunc = GRANULARITIES[granularity]
+    period = trunc("day") if trunc else F("day")
+    totals = {
+        row["period"]: row for row in rows.values(period=period).annotate(**{field: Sum(field) for field in fields})
+    }
+    empty = dict.fromkeys(fields, 0)
+    return [{**empty, **totals.get(start, {}), "period": start} for start in starts]
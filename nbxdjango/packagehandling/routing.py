@@ -0,0 +1,94 @@
+"""
+Read-replica routing for GraphQL queries.
+
+With a replica configured (``DATABASE_REPLICA_URL``, the ``replica`` alias),
+``RoutedExecutionContext`` (``schema/execution.py``) runs every GraphQL query
+with a ``ReadRoute`` in effect, and ``ReplicaRouter`` sends that query's reads
+of this app's tables to the replica. Mutations, subscriptions, the admin,
+management commands and background tasks read from ``default``, and writes
+always go to ``default``. Account lookups (sessions, the JWT user, ``me``)
+stay on ``default`` too, so a new or changed account is seen at once.
+
+The replica may lag behind. For ``REPLICA_STICKY_SECONDS`` after a mutation,
+the same user's queries read from ``default`` (read-your-writes). The marker
+is kept in the cache, so with several processes share it via
+``CACHE_REDIS_URL``.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+_read_route = ContextVar("read_route", default=None)
+
+
+def _sticky_key(user_id):
+    return f"db-sticky:{user_id}"
+
+
+def _user_id(user):
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+def stick_to_primary(user):
+    """Read ``user``'s queries from the primary for the next REPLICA_STICKY_SECONDS."""
+    user_id = _user_id(user)
+    if settings.DATABASE_REPLICA_ALIAS and user_id is not None:
+        cache.set(_sticky_key(user_id), True, settings.REPLICA_STICKY_SECONDS)
+
+
+class ReadRoute:
+    """
+    Where one query's reads go. Decided lazily: with JWT authentication the
+    request's user is only known once the first field resolves.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self._decided_for = self._alias = None
+        self._decided = False
+
+    def alias(self):
+        user_id = _user_id(getattr(self.context, "user", None))
+        if not self._decided or user_id != self._decided_for:
+            sticky = user_id is not None and cache.get(_sticky_key(user_id))
+            self._alias = DEFAULT_DB_ALIAS if sticky else settings.DATABASE_REPLICA_ALIAS
+            self._decided_for, self._decided = user_id, True
+        return self._alias
+
+
+@contextmanager
+def reading_from(route):
+    token = _read_route.set(route)
+    try:
+        yield route
+    finally:
+        _read_route.reset(token)
+
+
+async def awaited_reading_from(route, awaitable):
+    """Await ``awaitable`` (an async query execution) with ``route`` in effect."""
+    with reading_from(route):
+        return await awaitable
+
+
+class ReplicaRouter:
+    """Reads under a ``ReadRoute`` go where it says; everything else to ``default``."""
+
+    def db_for_read(self, model, **hints):
+        route = _read_route.get()
+        if route is None or model._meta.app_label != "packagehandling" or model is get_user_model():
+            return None
+        return route.alias()
+
+    def db_for_write(self, model, **hints):
+        # Explicitly: an instance read from the replica would otherwise be saved back there.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
@@ -0,0 +1,62 @@
+"""
+Recurring django-q tasks. ``manage.py setup_schedules`` (run on every release)
+creates or updates one ``Schedule`` row per entry, keyed by name.
+"""
+
+from django_q.models import Schedule
+
+SCHEDULES = [
+    {
+        "name": "dispatch_webhooks",
+        "func": "packagehandling.outbox.dispatch_outbox",
+        "schedule_type": Schedule.MINUTES,
+        "minutes": 1,
+    },
+    {
+        "name": "prune_task_metrics",
+        "func": "packagehandling.queue_metrics.prune_task_metrics",
+        "schedule_type": Schedule.HOURLY,
+    },
+    {
+        "name": "prune_email_idempotency_keys",
+        "func": "packagehandling.utils.prune_email_idempotency_keys",
+        "schedule_type": Schedule.DAILY,
+    },
+    {
+        # Also backfills the counters on the first run after they are added.
+        "name": "repair_counters",
+        "func": "packagehandling.counters.repair_counters",
+        "schedule_type": Schedule.DAILY,
+    },
+    {
+        "name": "archive_consolidations",
+        "func": "packagehandling.archive.archive_consolidations",
+        "schedule_type": Schedule.DAILY,
+    },
+    {
+        # Only the days changed since the previous run; the first run builds everything.
+        "name": "refresh_rollups",
+        "func": "packagehandling.rollups.refresh_rollups",
+        "schedule_type": Schedule.MINUTES,
+        "minutes": 15,
+    },
+    {
+        # No-op unless DB_PARTITIONING is set on PostgreSQL.
+        "name": "ensure_partitions",
+        "func": "packagehandling.partitioning.ensure_partitions",
+        "schedule_type": Schedule.DAILY,
+    },
+]
+
+
+def ensure_schedules():
+    """Create or update every entry of ``SCHEDULES``; returns ``(created, updated)`` counts."""
+    created = updated = 0
+    for entry in SCHEDULES:
+        values = {key: value for key, value in entry.items() if key != "name"}
+        _, was_created = Schedule.objects.update_or_create(name=entry["name"], defaults={**values, "repeats": -1})
+        if was_created:
+            created += 1
+        else:
+            updated += 1
+    return created, updated
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from graphql import ExecutionContext, OperationType
+
+from ..routing import ReadRoute, awaited_reading_from, reading_from, stick_to_primary
+
+
+@lru_cache(maxsize=None)
+def _db_executor():
+    # One persistent database connection per pool thread, so the pool size bounds
+    # the connections a single ASGI process opens for concurrent field resolution.
+    return ThreadPoolExecutor(max_workers=settings.GRAPHQL_ASYNC_WORKERS, thread_name_prefix="graphql-db")
+
+
+def _resolve_in_db_thread(resolve, *args):
+    close_old_connections()
+    try:
+        return resolve(*args)
+    finally:
+        close_old_connections()
+
+
+class RoutedExecutionContext(ExecutionContext):
+    """
+    Reads queries from the replica and marks users who ran a mutation to read
+    from the primary for a while (``packagehandling.routing``).
+    """
+
+    def execute_operation(self, operation, root_value):
+        if operation.operation == OperationType.MUTATION:
+            try:
+                return super().execute_operation(operation, root_value)
+            finally:
+                stick_to_primary(getattr(self.context_value, "user", None))
+        if operation.operation != OperationType.QUERY or not settings.DATABASE_REPLICA_ALIAS:
+            return super().execute_operation(operation, root_value)
+
+        route = ReadRoute(self.context_value)
+        with reading_from(route):
+            result = super().execute_operation(operation, root_value)
+        if self.is_awaitable(result):
+            # Concurrent execution: the fields resolve once the result is awaited.
+            return awaited_reading_from(route, result)
+        return result
+
+
+class ConcurrentExecutionContext(RoutedExecutionContext):
+    """
+    Resolves each top-level field of a query in its own database thread.
+
+    Resolvers, the JWT middleware and the nested DjangoObjectType fields all use
+    the synchronous ORM, so every top-level field is resolved together with its
+    whole sub-selection inside a pool thread. The event loop only gathers the
+    results, letting independent fields such as ``me``, ``dashboard`` and
+    ``allPackages`` run concurrently instead of one after another. Mutations
+    keep graphene's serial, transactional execution.
+    """
+
+    def execute_field(self, parent_type, source, field_nodes, path):
+        if path.prev is not None or self.operation.operation != OperationType.QUERY:
+            return super().execute_field(parent_type, source, field_nodes, path)
+        return self._execute_field_in_db_thread(parent_type, source, field_nodes, path)
+
+    async def _execute_field_in_db_thread(self, parent_type, source, field_nodes, path):
+        resolve = sync_to_async(_resolve_in_db_thread, thread_sensitive=False, executor=_db_executor())
+        result = await resolve(super().execute_field, parent_type, source, field_nodes, path)
+        if self.is_awaitable(result):
+            result = await result
+        return result
@@ -13,6 +13,7 @@ from graphql_jwt.refresh_token.models import RefreshToken
 from graphql_jwt.refresh_token.shortcuts import create_refresh_token
 from graphql_jwt.shortcuts import get_token
 
+from ... import lanes
 from ...utils import send_email
 
 # Frontend URL for password reset links
@@ -80,6 +81,7 @@ class ForgotPassword(graphene.Mutation):
             subject="Reset Your Password",
             body=f"Click the following link to reset your password: {reset_url}",
             recipient_list=[user.email],
+            lane=lanes.TRANSACTIONAL,
         )
 
         return ForgotPassword(ok=True)
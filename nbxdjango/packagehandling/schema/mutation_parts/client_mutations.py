@@ -4,8 +4,9 @@ import graphene
 from django.contrib.auth import get_user_model
 from django.core.exceptions import PermissionDenied
 
-from ...models import Client
-from ..types import ClientType
+from ...deletion import start_client_deletion
+from ...models import Client, ClientDeletionJob
+from ..types import ClientDeletionJobType, ClientType
 
 
 class CreateClient(graphene.Mutation):
@@ -85,23 +86,23 @@ class DeleteClient(graphene.Mutation):
 
     ok = graphene.Boolean()
     message = graphene.String()
+    job = graphene.Field(lambda: ClientDeletionJobType)
 
     def mutate(self, info, id, delete_user=False):
         user = info.context.user
         if not user.is_superuser:
             raise PermissionDenied()
 
-        client = Client.objects.select_related("user").get(pk=id)
+        client = Client.objects.get(pk=id)
+        # Packages and consolidates are deleted in chunks, leaving tombstones for incremental sync and
+        # deletion events for webhooks; clients with many packages are deleted in the background.
+        job = start_client_deletion(client, delete_user=delete_user, requested_by=user)
 
-        if delete_user and client.user:
-            client.user.delete()  # Client will be cascade-deleted
+        if job.status != ClientDeletionJob.Status.COMPLETED:
+            message = "Client deletion started. User account deactivated; follow the job for progress."
+        elif delete_user and job.user_id:
             message = "Client and associated user deleted successfully."
         else:
-            # Preserve user account but deactivate it
-            if client.user:
-                client.user.is_active = False
-                client.user.save()
-            client.delete()
             message = "Client deleted. User account preserved but deactivated."
 
-        return DeleteClient(ok=True, message=message)
+        return DeleteClient(ok=True, message=message, job=job)
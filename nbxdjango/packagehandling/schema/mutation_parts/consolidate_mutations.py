@@ -6,6 +6,7 @@ from packagehandling.utils import send_email as send_consolidate_email
 
 from ...emails.messages import CONSOLIDATE_CREATED_MESSAGE, CONSOLIDATE_CREATED_SUBJECT
 from ...models import Consolidate, Package
+from ...realtime import publish_consolidate_status_changed
 from ..types import ConsolidateType
 
 logger = logging.getLogger(__name__)
@@ -73,14 +74,23 @@ class CreateConsolidate(graphene.Mutation):
             client=client,
         )
         consolidate.save()
-        consolidate.packages.set(packages)
+        consolidate.set_packages(packages)
 
         if send_email:
             subject = CONSOLIDATE_CREATED_SUBJECT
             message = CONSOLIDATE_CREATED_MESSAGE
             recipient_list = [client.email]
             try:
-                send_consolidate_email(subject, message, recipient_list)
+                send_consolidate_email(
+                    subject,
+                    message,
+                    recipient_list,
+                    idempotency={
+                        "template": "consolidate_created",
+                        "consolidate_id": consolidate.pk,
+                        "status": consolidate.status,
+                    },
+                )
             except Exception as e:
                 logger.error(f"Failed to send email for consolidate creation: {e}", exc_info=True)
 
@@ -108,6 +118,7 @@ class UpdateConsolidate(graphene.Mutation):
             consolidate = Consolidate.objects.get(pk=id)
         except Consolidate.DoesNotExist:
             raise ValidationError("Consolidate not found.")
+        previous_status = consolidate.status
 
         # Status validation
         if "status" in kwargs:
@@ -173,12 +184,14 @@ class UpdateConsolidate(graphene.Mutation):
                     raise ValidationError("All packages must belong to the same client as the consolidate.")
                 if package.consolidate is not None and package.consolidate != consolidate:
                     raise ValidationError(f"Package {package.id} already belongs to another consolidate.")
-            consolidate.packages.set(new_packages)
+            consolidate.set_packages(new_packages)
 
         for key, value in kwargs.items():
             setattr(consolidate, key, value)
 
         consolidate.save()
+        if consolidate.status != previous_status:
+            publish_consolidate_status_changed(consolidate, previous_status)
         return UpdateConsolidate(consolidate=consolidate)
 
 
@@ -195,8 +208,9 @@ class DeleteConsolidate(graphene.Mutation):
             raise PermissionDenied("You do not have permission to perform this action.")
 
         try:
-            Consolidate.objects.get(pk=id).delete()
-            success = True
+            consolidate = Consolidate.objects.get(pk=id)
         except Consolidate.DoesNotExist:
-            success = False
-        return DeleteConsolidate(success=success)
+            return DeleteConsolidate(success=False)
+
+        consolidate.delete()
+        return DeleteConsolidate(success=True)
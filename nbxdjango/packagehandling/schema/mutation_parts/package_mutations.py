@@ -3,6 +3,7 @@ from django.core.exceptions import PermissionDenied, ValidationError
 from graphql_jwt.decorators import login_required
 
 from ...models import Client, Package
+from ...realtime import publish_package_arrived
 from ..types import PackageType
 
 
@@ -40,6 +41,7 @@ class CreatePackage(graphene.Mutation):
             raise ValidationError("The provided client does not exist.")
 
         package = Package.objects.create(client=client, **kwargs)
+        publish_package_arrived(package)
         return CreatePackage(package=package)
 
 
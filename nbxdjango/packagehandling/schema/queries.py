@@ -4,8 +4,23 @@ from .query_parts.client_queries import ClientQueries
 from .query_parts.consolidate_queries import ConsolidateQueries
 from .query_parts.dashboard_queries import DashboardQueries
 from .query_parts.package_queries import PackageQueries
+from .query_parts.pricing_queries import PricingQueries
+from .query_parts.queue_queries import QueueQueries
+from .query_parts.stats_queries import StatsQueries
+from .query_parts.sync_queries import SyncQueries
 from .query_parts.user_queries import UserQueries
 
 
-class Query(UserQueries, ClientQueries, PackageQueries, ConsolidateQueries, DashboardQueries, graphene.ObjectType):
+class Query(
+    UserQueries,
+    ClientQueries,
+    PackageQueries,
+    ConsolidateQueries,
+    DashboardQueries,
+    SyncQueries,
+    QueueQueries,
+    PricingQueries,
+    StatsQueries,
+    graphene.ObjectType,
+):
     pass
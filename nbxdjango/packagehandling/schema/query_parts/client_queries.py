@@ -1,11 +1,59 @@
 import graphene
 from django.core.exceptions import PermissionDenied
-from django.db.models import Q
+from django.db.models import F, Max, OuterRef, Q, Subquery
 from django.db.models import Value as V
 from django.db.models.functions import Concat
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode
 
-from ...models import Client
-from ..types import ClientConnection, ClientType
+from ...models import Client, ClientDeletionJob, Package
+from ..types import ClientConnection, ClientDeletionJobType, ClientType
+
+# Package summary fields of ClientType computed per query -> the annotation filling them.
+PACKAGE_SUMMARY_FIELDS = {
+    "lastArrivalDate": "last_arrival_date",
+}
+# orderBy values sorting on the cached counters (packagehandling.counters) -> their indexed columns.
+COUNTER_ORDER_FIELDS = {
+    "package_count": "package_count",
+    "unconsolidated_package_count": "unconsolidated_count",
+}
+
+
+def _package_summary(annotation):
+    # Correlated per client, so only the page's clients are aggregated unless
+    # the summary is also the sort key; answered from the (client, ...) package indexes.
+    packages = Package.objects.filter(client=OuterRef("pk")).order_by().values("client")
+    aggregates = {"last_arrival_date": Max("arrival_date")}
+    return Subquery(packages.annotate(value=aggregates[annotation]).values("value"))
+
+
+def _selected_fields(selection_set, fragments):
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            yield selection
+        elif isinstance(selection, InlineFragmentNode):
+            yield from _selected_fields(selection.selection_set, fragments)
+        elif isinstance(selection, FragmentSpreadNode) and selection.name.value in fragments:
+            yield from _selected_fields(fragments[selection.name.value].selection_set, fragments)
+
+
+def _selected_summary_annotations(info):
+    """Annotations for the package summary fields selected under ``results``."""
+    field_nodes = getattr(info, "field_nodes", None)
+    if not isinstance(field_nodes, list):
+        return set()
+    fragments = info.fragments or {}
+    selected = set()
+    for node in field_nodes:
+        if node.selection_set is None:
+            continue
+        for field in _selected_fields(node.selection_set, fragments):
+            if field.name.value != "results" or field.selection_set is None:
+                continue
+            for result_field in _selected_fields(field.selection_set, fragments):
+                if result_field.name.value in PACKAGE_SUMMARY_FIELDS:
+                    selected.add(PACKAGE_SUMMARY_FIELDS[result_field.name.value])
+    return selected
 
 
 class ClientQueries(graphene.ObjectType):
@@ -17,6 +65,7 @@ class ClientQueries(graphene.ObjectType):
         order_by=graphene.String(),
     )
     client = graphene.Field(ClientType, id=graphene.ID(required=True))
+    client_deletion_job = graphene.Field(ClientDeletionJobType, id=graphene.ID(required=True))
 
     def resolve_all_clients(root, info, search=None, page=1, page_size=10, order_by=None):
         if page_size not in [10, 20, 50, 100]:
@@ -35,12 +84,24 @@ class ClientQueries(graphene.ObjectType):
                 | Q(mobile_phone_number__icontains=search)
             )
 
+        annotations = _selected_summary_annotations(info)
+
         if order_by:
             order_by_field = order_by.replace("-", "")
-            if order_by_field not in ["full_name", "email", "created_at"]:
+            allowed = ["full_name", "email", "created_at", *COUNTER_ORDER_FIELDS, *PACKAGE_SUMMARY_FIELDS.values()]
+            if order_by_field not in allowed:
                 raise ValueError("Invalid order_by value.")
 
-            if order_by_field == "full_name":
+            if order_by_field in COUNTER_ORDER_FIELDS:
+                column = COUNTER_ORDER_FIELDS[order_by_field]
+                queryset = queryset.order_by(f"-{column}" if order_by.startswith("-") else column, "id")
+            elif order_by_field in PACKAGE_SUMMARY_FIELDS.values():
+                annotations.discard(order_by_field)
+                queryset = queryset.annotate(**{order_by_field: _package_summary(order_by_field)})
+                sort_key = F(order_by_field)
+                sort_key = sort_key.desc(nulls_last=True) if order_by.startswith("-") else sort_key.asc(nulls_last=True)
+                queryset = queryset.order_by(sort_key, "id")
+            elif order_by_field == "full_name":
                 annotation_name = "search_full_name"
                 queryset = queryset.annotate(**{annotation_name: Concat("first_name", V(" "), "last_name")})
                 order_by_param = f"-{annotation_name}" if order_by.startswith("-") else annotation_name
@@ -51,6 +112,8 @@ class ClientQueries(graphene.ObjectType):
         total_count = queryset.count()
         start = (page - 1) * page_size
         end = start + page_size
+        if annotations:
+            queryset = queryset.annotate(**{name: _package_summary(name) for name in annotations})
         items = queryset[start:end]
         has_next = end < total_count
         has_previous = start > 0
@@ -76,3 +139,8 @@ class ClientQueries(graphene.ObjectType):
         if client.user != user:
             raise PermissionDenied()
         return client
+
+    def resolve_client_deletion_job(root, info, id):
+        if not info.context.user.is_superuser:
+            raise PermissionDenied()
+        return ClientDeletionJob.objects.get(pk=id)
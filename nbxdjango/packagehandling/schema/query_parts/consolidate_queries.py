@@ -1,9 +1,17 @@
 import graphene
 from django.core.exceptions import PermissionDenied
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 
-from ...models import Consolidate
-from ..types import ConsolidateConnection, ConsolidateType
+from ...archive import paginate_with_archive
+from ...models import ArchivedConsolidate, ArchivedPackage, Consolidate
+from ...partitioning import created_between
+from ...status_history import dwell_times, timeline
+from ..types import (
+    ConsolidateConnection,
+    ConsolidateStatusDwellType,
+    ConsolidateStatusEventType,
+    ConsolidateType,
+)
 
 
 class ConsolidateQueries(graphene.ObjectType):
@@ -14,52 +22,83 @@ class ConsolidateQueries(graphene.ObjectType):
         page_size=graphene.Int(),
         order_by=graphene.String(),
         status=graphene.String(),
+        include_archived=graphene.Boolean(default_value=False),
+        created_from=graphene.Date(),
+        created_to=graphene.Date(),
+    )
+    consolidate_by_id = graphene.Field(
+        ConsolidateType, id=graphene.ID(), include_archived=graphene.Boolean(default_value=False)
+    )
+    consolidate_timeline = graphene.List(ConsolidateStatusEventType, id=graphene.ID(required=True))
+    consolidate_status_dwell_times = graphene.List(ConsolidateStatusDwellType, days=graphene.Int())
+    search_archive = graphene.Field(
+        ConsolidateConnection,
+        search=graphene.String(required=True),
+        client_id=graphene.ID(),
+        page=graphene.Int(),
+        page_size=graphene.Int(),
     )
-    consolidate_by_id = graphene.Field(ConsolidateType, id=graphene.ID())
 
-    def resolve_all_consolidates(root, info, search=None, page=1, page_size=10, order_by=None, status=None):
+    def resolve_all_consolidates(
+        root,
+        info,
+        search=None,
+        page=1,
+        page_size=10,
+        order_by=None,
+        status=None,
+        include_archived=False,
+        created_from=None,
+        created_to=None,
+    ):
         # Validate page_size
         if page_size not in [10, 20, 50, 100]:
             raise ValueError("Invalid page_size. Valid values are 10, 20, 50, 100.")
 
         user = info.context.user
-        queryset = Consolidate.objects.select_related("client").prefetch_related("packages")
 
         # Permission checks
-        if user.is_superuser:
-            pass  # Admin can see all consolidates
-        elif hasattr(user, "client"):
-            queryset = queryset.filter(client=user.client)
-        else:
+        if not user.is_superuser and not hasattr(user, "client"):
             raise PermissionDenied("You do not have permission to view this resource.")
 
-        # Search filtering
-        if search:
-            queryset = queryset.filter(
-                Q(client__first_name__icontains=search)
-                | Q(client__last_name__icontains=search)
-                | Q(client__email__icontains=search)
-            )
+        def filtered(model):
+            queryset = model.objects.select_related("client").prefetch_related("packages")
+            if not user.is_superuser:
+                queryset = queryset.filter(client=user.client)
+
+            # Search filtering
+            if search:
+                queryset = queryset.filter(
+                    Q(client__first_name__icontains=search)
+                    | Q(client__last_name__icontains=search)
+                    | Q(client__email__icontains=search)
+                )
 
-        # Status filtering
-        if status:
-            queryset = queryset.filter(status=status)
+            # Status filtering
+            if status:
+                queryset = queryset.filter(status=status)
+            return created_between(queryset, created_from, created_to)
 
         # Ordering
         if order_by:
             order_by_field = order_by.replace("-", "")
             if order_by_field not in ["delivery_date", "created_at", "status"]:
                 raise ValueError("Invalid order_by value.")
-            queryset = queryset.order_by(order_by)
         else:
             # Default ordering: newest first
-            queryset = queryset.order_by("-created_at")
+            order_by = "-created_at"
 
         # Pagination
-        total_count = queryset.count()
         start = (page - 1) * page_size
         end = start + page_size
-        items = queryset[start:end]
+        if include_archived:
+            items, total_count = paginate_with_archive(
+                filtered(Consolidate), filtered(ArchivedConsolidate), [order_by], start, end
+            )
+        else:
+            queryset = filtered(Consolidate).order_by(order_by)
+            total_count = queryset.count()
+            items = queryset[start:end]
         has_next = end < total_count
         has_previous = start > 0
 
@@ -72,11 +111,14 @@ class ConsolidateQueries(graphene.ObjectType):
             has_previous=has_previous,
         )
 
-    def resolve_consolidate_by_id(self, info, id):
+    def resolve_consolidate_by_id(self, info, id, include_archived=False):
         user = info.context.user
-        try:
-            consolidate = Consolidate.objects.select_related("client").prefetch_related("packages").get(pk=id)
-        except Consolidate.DoesNotExist:
+        models = [Consolidate, ArchivedConsolidate] if include_archived else [Consolidate]
+        for model in models:
+            consolidate = model.objects.select_related("client").prefetch_related("packages").filter(pk=id).first()
+            if consolidate is not None:
+                break
+        else:
             return None
 
         if user.is_superuser:
@@ -84,3 +126,73 @@ class ConsolidateQueries(graphene.ObjectType):
         if hasattr(user, "client") and consolidate.client == user.client:
             return consolidate
         raise PermissionDenied("You do not have permission to view this resource.")
+
+    def resolve_consolidate_timeline(self, info, id):
+        """The statuses the consolidation (archived or not) went through, oldest first."""
+        user = info.context.user
+        for model in (Consolidate, ArchivedConsolidate):
+            client_id = model.objects.filter(pk=id).values_list("client_id", flat=True).first()
+            if client_id is not None:
+                break
+        else:
+            return None
+
+        if not user.is_superuser and not (hasattr(user, "client") and user.client.pk == client_id):
+            raise PermissionDenied("You do not have permission to view this resource.")
+        return timeline(id)
+
+    def resolve_consolidate_status_dwell_times(self, info, days=None):
+        if not info.context.user.is_superuser:
+            raise PermissionDenied("You do not have permission to view this resource.")
+        if days is not None and days < 1:
+            raise ValueError("days must be at least 1.")
+
+        averages = dwell_times(days)
+        return [
+            ConsolidateStatusDwellType(
+                status=status,
+                average_seconds=averages[status]["average"].total_seconds(),
+                transitions=averages[status]["count"],
+            )
+            for status in Consolidate.Status.values
+            if status in averages
+        ]
+
+    def resolve_search_archive(self, info, search, client_id=None, page=1, page_size=10):
+        """Archived consolidations matching ``search`` in a package barcode, the description or the client."""
+        if page_size not in [10, 20, 50, 100]:
+            raise ValueError("Invalid page_size. Valid values are 10, 20, 50, 100.")
+        search = search.strip()
+        if len(search) < 3:
+            raise ValueError("Search the archive with at least 3 characters.")
+
+        user = info.context.user
+        queryset = ArchivedConsolidate.objects.select_related("client").prefetch_related("packages")
+        if user.is_superuser:
+            if client_id:
+                queryset = queryset.filter(client_id=client_id)
+        elif hasattr(user, "client"):
+            queryset = queryset.filter(client=user.client)
+        else:
+            raise PermissionDenied("You do not have permission to view this resource.")
+
+        barcode_match = ArchivedPackage.objects.filter(consolidate=OuterRef("pk"), barcode__icontains=search)
+        queryset = queryset.filter(
+            Exists(barcode_match)
+            | Q(description__icontains=search)
+            | Q(client__first_name__icontains=search)
+            | Q(client__last_name__icontains=search)
+            | Q(client__email__icontains=search)
+        ).order_by("-created_at")
+
+        total_count = queryset.count()
+        start = (page - 1) * page_size
+        end = start + page_size
+        return ConsolidateConnection(
+            results=queryset[start:end],
+            total_count=total_count,
+            page=page,
+            page_size=page_size,
+            has_next=end < total_count,
+            has_previous=start > 0,
+        )
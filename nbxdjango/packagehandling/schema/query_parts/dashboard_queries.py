@@ -2,12 +2,14 @@ from datetime import timedelta
 
 import graphene
 from django.core.exceptions import PermissionDenied
-from django.db.models import Q, Sum
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
 
 from ...models import Client, Consolidate, Package
 from ..types import ConsolidateType, PackageType
 
+MAX_RECENT_ITEMS = 50
+
 
 class DashboardStatsType(graphene.ObjectType):
     """Dashboard statistics type."""
@@ -41,6 +43,17 @@ class DashboardType(graphene.ObjectType):
     recent_packages = graphene.List(PackageType, limit=graphene.Int(default_value=5))
     recent_consolidations = graphene.List(ConsolidateType, limit=graphene.Int(default_value=5))
 
+    def resolve_recent_packages(root, info, limit=5):
+        return root.resolve_recent_packages(limit)
+
+    def resolve_recent_consolidations(root, info, limit=5):
+        return root.resolve_recent_consolidations(limit)
+
+
+def _check_limit(limit):
+    if not 1 <= limit <= MAX_RECENT_ITEMS:
+        raise ValueError(f"Invalid limit. Valid values are 1 to {MAX_RECENT_ITEMS}.")
+
 
 class DashboardQueries(graphene.ObjectType):
     dashboard = graphene.Field(DashboardType)
@@ -94,16 +107,22 @@ class DashboardResolver:
         # Recent period (last 30 days)
         recent_date = timezone.now() - timedelta(days=30)
 
+        # Consolidation-based package stats read the denormalized consolidate_status
+        # column, so all package counts come from one scan without joining Consolidate.
+        package_counts = package_qs.aggregate(
+            total_packages=Count("id"),
+            recent_packages=Count("id", filter=Q(created_at__gte=recent_date)),
+            packages_pending=Count(
+                "id",
+                filter=Q(consolidate_status__isnull=True) | Q(consolidate_status=Consolidate.Status.PENDING),
+            ),
+            packages_in_transit=Count("id", filter=Q(consolidate_status=Consolidate.Status.IN_TRANSIT)),
+            packages_delivered=Count("id", filter=Q(consolidate_status=Consolidate.Status.DELIVERED)),
+        )
+
         stats_data = {
             # Package stats
-            "total_packages": package_qs.count(),
-            "recent_packages": package_qs.filter(created_at__gte=recent_date).count(),
-            # Consolidation-based package stats
-            "packages_pending": package_qs.filter(
-                Q(consolidate__isnull=True) | Q(consolidate__status=Consolidate.Status.PENDING)
-            ).count(),
-            "packages_in_transit": package_qs.filter(consolidate__status=Consolidate.Status.IN_TRANSIT).count(),
-            "packages_delivered": package_qs.filter(consolidate__status=Consolidate.Status.DELIVERED).count(),
+            **package_counts,
             # Consolidation stats
             "total_consolidations": consolidation_qs.count(),
             "consolidations_awaiting_payment": consolidation_qs.filter(
@@ -132,10 +151,12 @@ class DashboardResolver:
 
     def resolve_recent_packages(self, limit=5):
         """Get recent packages based on user type."""
+        _check_limit(limit)
         return self._get_package_queryset().select_related("client", "consolidate").order_by("-created_at")[:limit]
 
     def resolve_recent_consolidations(self, limit=5):
         """Get recent consolidations based on user type."""
+        _check_limit(limit)
         return (
             self._get_consolidation_queryset()
             .select_related("client")
@@ -1,8 +1,10 @@
 import graphene
 from django.core.exceptions import PermissionDenied
-from django.db.models import Q
+from django.db.models import F, Q
 
-from ...models import Package
+from ...archive import paginate_with_archive
+from ...models import ArchivedPackage, Consolidate, Package
+from ...partitioning import created_between
 from ..types import PackageConnection, PackageType
 
 
@@ -15,47 +17,102 @@ class PackageQueries(graphene.ObjectType):
         order_by=graphene.String(),
         client_id=graphene.ID(),
         not_in_consolidate=graphene.Boolean(default_value=True),
+        consolidate_status=graphene.String(),
+        min_weight_kg=graphene.Float(),
+        max_weight_kg=graphene.Float(),
+        min_volume_cm3=graphene.Float(),
+        max_volume_cm3=graphene.Float(),
+        include_archived=graphene.Boolean(default_value=False),
+        created_from=graphene.Date(),
+        created_to=graphene.Date(),
     )
     package = graphene.Field(PackageType, id=graphene.ID(required=True))
 
     def resolve_all_packages(
-        root, info, search=None, page=1, page_size=10, order_by=None, client_id=None, not_in_consolidate=True
+        root,
+        info,
+        search=None,
+        page=1,
+        page_size=10,
+        order_by=None,
+        client_id=None,
+        not_in_consolidate=True,
+        consolidate_status=None,
+        min_weight_kg=None,
+        max_weight_kg=None,
+        min_volume_cm3=None,
+        max_volume_cm3=None,
+        include_archived=False,
+        created_from=None,
+        created_to=None,
     ):
         if page_size not in [10, 20, 50, 100]:
             raise ValueError("Invalid page_size. Valid values are 10, 20, 50, 100.")
 
         user = info.context.user
-        queryset = Package.objects.select_related("client", "consolidate")
+        if not user.is_superuser and not hasattr(user, "client"):
+            raise PermissionDenied("You do not have permission to view this resource.")
+        if consolidate_status and consolidate_status not in Consolidate.Status.values:
+            raise ValueError("Invalid consolidate_status value.")
 
-        if user.is_superuser:
-            if client_id:
-                queryset = queryset.filter(client_id=client_id)
-        else:
-            if hasattr(user, "client"):
-                queryset = queryset.filter(client=user.client)
+        def filtered(queryset):
+            if user.is_superuser:
+                if client_id:
+                    queryset = queryset.filter(client_id=client_id)
             else:
-                raise PermissionDenied("You do not have permission to view this resource.")
+                queryset = queryset.filter(client=user.client)
+
+            if search:
+                queryset = queryset.filter(Q(barcode__icontains=search) | Q(description__icontains=search))
 
-        if search:
-            queryset = queryset.filter(Q(barcode__icontains=search) | Q(description__icontains=search))
+            if not_in_consolidate:
+                queryset = queryset.filter(consolidate__isnull=True)
 
-        if not_in_consolidate:
-            queryset = queryset.filter(consolidate__isnull=True)
+            if consolidate_status:
+                queryset = queryset.filter(consolidate_status=consolidate_status)
+
+            # Ranges over the unit-normalised columns; bounds are inclusive.
+            ranges = {
+                "weight_kg__gte": min_weight_kg,
+                "weight_kg__lte": max_weight_kg,
+                "volume_cm3__gte": min_volume_cm3,
+                "volume_cm3__lte": max_volume_cm3,
+            }
+            queryset = queryset.filter(**{lookup: bound for lookup, bound in ranges.items() if bound is not None})
+            return created_between(queryset, created_from, created_to)
 
         if order_by:
             order_by_field = order_by.replace("-", "")
-            if order_by_field not in ["barcode", "created_at", "status"]:
+            if order_by_field not in ["barcode", "created_at", "status", "weight_kg", "volume_cm3"]:
                 raise ValueError("Invalid order_by value.")
-            queryset = queryset.order_by(order_by)
+            if order_by_field == "status":
+                # Packages have no status of their own; sort by their consolidate's (denormalized) status.
+                order_by = order_by.replace("status", "consolidate_status")
+            if order_by_field in ["weight_kg", "volume_cm3"]:
+                # Unweighed / unmeasured packages last in both directions.
+                column = F(order_by_field)
+                order_by = column.desc(nulls_last=True) if order_by.startswith("-") else column.asc(nulls_last=True)
+        else:
+            # Default ordering: newest first (served by the partial unconsolidated-package indexes)
+            order_by = "-created_at"
 
-        total_count = queryset.count()
+        queryset = filtered(Package.objects.select_related("client", "consolidate"))
+        querysets = [queryset]
         start = (page - 1) * page_size
         end = start + page_size
-        items = queryset[start:end]
+        if include_archived:
+            # Archived packages all belong to an archived consolidation, so notInConsolidate leaves them out.
+            archived = filtered(ArchivedPackage.objects.select_related("client"))
+            querysets.append(archived)
+            items, total_count = paginate_with_archive(queryset, archived, [order_by], start, end)
+        else:
+            queryset = queryset.order_by(order_by)
+            total_count = queryset.count()
+            items = queryset[start:end]
         has_next = end < total_count
         has_previous = start > 0
 
-        return PackageConnection(
+        connection = PackageConnection(
             results=items,
             total_count=total_count,
             page=page,
@@ -63,6 +120,8 @@ class PackageQueries(graphene.ObjectType):
             has_next=has_next,
             has_previous=has_previous,
         )
+        connection.querysets = querysets
+        return connection
 
     def resolve_package(root, info, id):
         user = info.context.user
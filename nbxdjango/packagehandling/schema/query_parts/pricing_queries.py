@@ -0,0 +1,56 @@
+import graphene
+from django.core.exceptions import PermissionDenied
+
+from ...models import Package
+from ...pricing import quote, quote_measurements
+
+MAX_QUOTED_PACKAGES = 100
+
+
+class PackageMeasurementsInput(graphene.InputObjectType):
+    """Measurements of a package that does not exist yet."""
+
+    length = graphene.Float()
+    width = graphene.Float()
+    height = graphene.Float()
+    dimension_unit = graphene.String()
+    weight = graphene.Float()
+    weight_unit = graphene.String()
+
+
+class PackageQuoteType(graphene.ObjectType):
+    """Price of one package under the current rate table. Weights are in kilograms."""
+
+    package_id = graphene.ID(description="Null for quoted measurements")
+    actual_weight = graphene.Float()
+    volumetric_weight = graphene.Float()
+    billable_weight = graphene.Float()
+    service_price = graphene.Float(description="Null when neither the weight nor all dimensions are known")
+    current_price = graphene.Float(description="The package's stored service price")
+
+
+class PricingQueries(graphene.ObjectType):
+    quote_packages = graphene.List(
+        PackageQuoteType,
+        package_ids=graphene.List(graphene.ID),
+        items=graphene.List(PackageMeasurementsInput),
+    )
+
+    def resolve_quote_packages(root, info, package_ids=None, items=None):
+        user = info.context.user
+        if not user.is_authenticated:
+            raise PermissionDenied("You do not have permission to view this resource.")
+        if len(package_ids or []) + len(items or []) > MAX_QUOTED_PACKAGES:
+            raise ValueError(f"At most {MAX_QUOTED_PACKAGES} packages can be quoted at once.")
+
+        quotes = []
+        if package_ids:
+            packages = Package.objects.filter(pk__in=package_ids)
+            if not user.is_superuser:
+                if not hasattr(user, "client"):
+                    raise PermissionDenied("You do not have permission to view this resource.")
+                packages = packages.filter(client=user.client)
+            quotes += [PackageQuoteType(**row._asdict()) for row in quote(packages)]
+        if items:
+            quotes += [PackageQuoteType(**row) for row in quote_measurements([dict(item) for item in items])]
+        return quotes
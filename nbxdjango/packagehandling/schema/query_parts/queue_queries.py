@@ -0,0 +1,77 @@
+import graphene
+from django.core.exceptions import PermissionDenied
+
+from ...queue_metrics import queue_stats
+
+
+class QueueTimingType(graphene.ObjectType):
+    """Average, 95th percentile and maximum of a task timing, in milliseconds."""
+
+    avg = graphene.Float()
+    p95 = graphene.Float()
+    max = graphene.Float()
+
+
+class QueueFunctionStatsType(graphene.ObjectType):
+    """Timing and failures of one task function."""
+
+    func = graphene.String()
+    tasks = graphene.Int()
+    failures = graphene.Int()
+    failure_rate = graphene.Float()
+    avg_queued_ms = graphene.Float()
+    avg_run_ms = graphene.Float()
+    max_run_ms = graphene.Float()
+
+
+class QueueLaneStatsType(graphene.ObjectType):
+    """Queue depth, latency and failures of one task lane."""
+
+    lane = graphene.String()
+    enabled = graphene.Boolean(description="Whether the lane has its own queue and cluster")
+    queue_depth = graphene.Int()
+    tasks = graphene.Int()
+    failures = graphene.Int()
+    failure_rate = graphene.Float()
+    avg_queued_ms = graphene.Float()
+    p95_queued_ms = graphene.Float()
+    avg_run_ms = graphene.Float()
+
+
+class QueueStatsType(graphene.ObjectType):
+    """Background task queue health (admin only)."""
+
+    queue_depth = graphene.Int()
+    in_flight = graphene.Int()
+    clusters = graphene.Int()
+    workers = graphene.Int()
+    window_minutes = graphene.Int()
+    tasks = graphene.Int()
+    failures = graphene.Int()
+    failure_rate = graphene.Float()
+    throughput_per_minute = graphene.Float()
+    queued_ms = graphene.Field(QueueTimingType)
+    run_ms = graphene.Field(QueueTimingType)
+    functions = graphene.List(QueueFunctionStatsType)
+    lanes = graphene.List(QueueLaneStatsType)
+
+
+class QueueQueries(graphene.ObjectType):
+    queue_stats = graphene.Field(QueueStatsType, minutes=graphene.Int(default_value=15))
+
+    def resolve_queue_stats(self, info, minutes=15):
+        if not info.context.user.is_superuser:
+            raise PermissionDenied("You do not have permission to view queue statistics.")
+        if minutes < 1:
+            raise ValueError("minutes must be at least 1.")
+
+        stats = queue_stats(minutes=minutes)
+        return QueueStatsType(
+            **{
+                **stats,
+                "queued_ms": QueueTimingType(**stats["queued_ms"]),
+                "run_ms": QueueTimingType(**stats["run_ms"]),
+                "functions": [QueueFunctionStatsType(**row) for row in stats["functions"]],
+                "lanes": [QueueLaneStatsType(**row) for row in stats["lanes"]],
+            }
+        )
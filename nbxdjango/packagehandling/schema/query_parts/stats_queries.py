@@ -0,0 +1,65 @@
+import graphene
+from django.core.exceptions import PermissionDenied
+
+from ...rollups import rollup_series
+
+
+class ArrivalStatsType(graphene.ObjectType):
+    """Arrivals and consolidations of one period (day, week or month)."""
+
+    period = graphene.Date(description="First day of the period")
+    packages_arrived = graphene.Int()
+    consolidates_created = graphene.Int()
+    consolidates_delivered = graphene.Int()
+
+
+class RevenueStatsType(graphene.ObjectType):
+    """Prices of the packages arrived in one period (day, week or month)."""
+
+    period = graphene.Date(description="First day of the period")
+    packages_arrived = graphene.Int()
+    real_price = graphene.Float()
+    service_price = graphene.Float()
+
+
+def stats_arguments():
+    return {
+        "from_": graphene.Date(required=True, name="from"),
+        "to": graphene.Date(required=True),
+        "granularity": graphene.String(default_value="day"),
+        "client_id": graphene.ID(),
+    }
+
+
+class StatsQueries(graphene.ObjectType):
+    arrival_stats = graphene.List(ArrivalStatsType, **stats_arguments())
+    revenue_stats = graphene.List(RevenueStatsType, **stats_arguments())
+
+    def resolve_arrival_stats(self, info, from_, to, granularity="day", client_id=None):
+        user = info.context.user
+        if not user.is_superuser:
+            if not hasattr(user, "client"):
+                raise PermissionDenied("You do not have permission to view this resource.")
+            client_id = user.client.pk
+
+        rows = rollup_series(
+            ("packages_arrived", "consolidates_created", "consolidates_delivered"), from_, to, granularity, client_id
+        )
+        return [ArrivalStatsType(**row) for row in rows]
+
+    def resolve_revenue_stats(self, info, from_, to, granularity="day", client_id=None):
+        if not info.context.user.is_superuser:
+            raise PermissionDenied("You do not have permission to view this resource.")
+
+        rows = rollup_series(
+            ("packages_arrived", "real_price_total", "service_price_total"), from_, to, granularity, client_id
+        )
+        return [
+            RevenueStatsType(
+                period=row["period"],
+                packages_arrived=row["packages_arrived"],
+                real_price=row["real_price_total"],
+                service_price=row["service_price_total"],
+            )
+            for row in rows
+        ]
@@ -0,0 +1,109 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+import graphene
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db.models import Q
+from django.utils import timezone
+
+from ...models import Consolidate, DeletionLog, Package
+from ..types import ConsolidateChangeFeed, PackageChangeFeed
+
+MAX_CHANGES = 500
+
+
+def encode_cursor(synced_at, updated_at, pk):
+    data = json.dumps([synced_at.isoformat(), updated_at.isoformat(), pk])
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        synced_at, updated_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(synced_at), datetime.fromisoformat(updated_at), int(pk)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor.")
+
+
+def change_feed(info, queryset, object_type, since, cursor, client_id, limit):
+    """
+    One page of rows changed after ``since``, oldest change first, keyset-paginated
+    on ``(updated_at, id)``.
+
+    The first page fixes ``synced_at`` (carried in the cursor) as the upper bound for
+    the whole sync and lists the tombstones deleted since ``since``; clients store
+    ``synced_at`` and pass it as ``since`` next time. ``synced_at`` lags the clock by
+    ``SYNC_SETTLE_SECONDS``: a transaction still open now may commit rows stamped
+    before it, which a bound of now would leave out of this sync and every later one.
+    """
+    if not 1 <= limit <= MAX_CHANGES:
+        raise ValueError(f"Invalid limit. Valid values are 1 to {MAX_CHANGES}.")
+
+    user = info.context.user
+    tombstones = DeletionLog.objects.filter(object_type=object_type)
+    if user.is_superuser:
+        if client_id:
+            queryset = queryset.filter(client_id=client_id)
+            tombstones = tombstones.filter(client_id=client_id)
+    elif hasattr(user, "client"):
+        queryset = queryset.filter(client_id=user.client.pk)
+        tombstones = tombstones.filter(client_id=user.client.pk)
+    else:
+        raise PermissionDenied("You do not have permission to view this resource.")
+
+    if since:
+        queryset = queryset.filter(updated_at__gt=since)
+
+    if cursor:
+        synced_at, after_updated_at, after_id = decode_cursor(cursor)
+        queryset = queryset.filter(Q(updated_at__gt=after_updated_at) | Q(updated_at=after_updated_at, id__gt=after_id))
+        deleted_ids = []
+    else:
+        synced_at = timezone.now() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+        # A full sync (no ``since``) starts from scratch, so there is nothing to delete.
+        deleted_ids = (
+            list(tombstones.filter(deleted_at__gt=since, deleted_at__lte=synced_at).values_list("object_id", flat=True))
+            if since
+            else []
+        )
+
+    rows = list(queryset.filter(updated_at__lte=synced_at).order_by("updated_at", "id")[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "results": rows,
+        "deleted_ids": deleted_ids,
+        "has_more": has_more,
+        "next_cursor": encode_cursor(synced_at, rows[-1].updated_at, rows[-1].pk) if has_more else None,
+        "synced_at": synced_at,
+    }
+
+
+class SyncQueries(graphene.ObjectType):
+    packages_updated_since = graphene.Field(
+        PackageChangeFeed,
+        since=graphene.DateTime(),
+        cursor=graphene.String(),
+        client_id=graphene.ID(),
+        limit=graphene.Int(default_value=100),
+    )
+    consolidates_updated_since = graphene.Field(
+        ConsolidateChangeFeed,
+        since=graphene.DateTime(),
+        cursor=graphene.String(),
+        client_id=graphene.ID(),
+        limit=graphene.Int(default_value=100),
+    )
+
+    def resolve_packages_updated_since(root, info, since=None, cursor=None, client_id=None, limit=100):
+        queryset = Package.objects.select_related("client")
+        feed = change_feed(info, queryset, DeletionLog.ObjectType.PACKAGE, since, cursor, client_id, limit)
+        return PackageChangeFeed(**feed)
+
+    def resolve_consolidates_updated_since(root, info, since=None, cursor=None, client_id=None, limit=100):
+        queryset = Consolidate.objects.select_related("client").prefetch_related("packages")
+        feed = change_feed(info, queryset, DeletionLog.ObjectType.CONSOLIDATE, since, cursor, client_id, limit)
+        return ConsolidateChangeFeed(**feed)
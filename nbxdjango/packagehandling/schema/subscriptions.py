@@ -0,0 +1,75 @@
+from datetime import date, datetime
+
+import graphene
+from django.core.exceptions import PermissionDenied
+
+from .. import realtime
+
+
+class ConsolidateStatusChangedEvent(graphene.ObjectType):
+    consolidate_id = graphene.ID()
+    client_id = graphene.ID()
+    previous_status = graphene.String()
+    status = graphene.String()
+    changed_at = graphene.DateTime()
+
+
+class PackageArrivedEvent(graphene.ObjectType):
+    package_id = graphene.ID()
+    client_id = graphene.ID()
+    barcode = graphene.String()
+    courier = graphene.String()
+    description = graphene.String()
+    arrival_date = graphene.Date()
+    created_at = graphene.DateTime()
+
+
+def _subscribed_client_id(info, client_id):
+    """
+    Clients only ever hear about their own shipments; admins may follow one
+    client or, without ``client_id``, all of them.
+    """
+    context = info.context
+    if context.user.is_superuser:
+        return int(client_id) if client_id is not None else None
+    if context.client_id is None:
+        raise PermissionDenied("You do not have permission to view this resource.")
+    if client_id is not None and int(client_id) != context.client_id:
+        raise PermissionDenied("You do not have permission to view this resource.")
+    return context.client_id
+
+
+async def _event_stream(topic, client_id, build):
+    async for payload in realtime.listen(topic, client_id):
+        yield build(payload)
+
+
+def _consolidate_status_changed(payload):
+    return ConsolidateStatusChangedEvent(**{**payload, "changed_at": datetime.fromisoformat(payload["changed_at"])})
+
+
+def _package_arrived(payload):
+    return PackageArrivedEvent(
+        **{
+            **payload,
+            "arrival_date": payload["arrival_date"] and date.fromisoformat(payload["arrival_date"]),
+            "created_at": datetime.fromisoformat(payload["created_at"]),
+        }
+    )
+
+
+class Subscription(graphene.ObjectType):
+    """Pushed over the ``graphql-transport-ws`` websocket at ``/graphql`` (see ``consumers.py``)."""
+
+    consolidate_status_changed = graphene.Field(ConsolidateStatusChangedEvent, client_id=graphene.ID())
+    package_arrived = graphene.Field(PackageArrivedEvent, client_id=graphene.ID())
+
+    # Permission checks run before the stream is returned, so a refused subscription
+    # is reported as a GraphQL error instead of an event stream that fails later.
+    def subscribe_consolidate_status_changed(root, info, client_id=None):
+        client_id = _subscribed_client_id(info, client_id)
+        return _event_stream(realtime.CONSOLIDATE_STATUS_CHANGED, client_id, _consolidate_status_changed)
+
+    def subscribe_package_arrived(root, info, client_id=None):
+        client_id = _subscribed_client_id(info, client_id)
+        return _event_stream(realtime.PACKAGE_ARRIVED, client_id, _package_arrived)
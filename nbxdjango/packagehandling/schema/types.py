@@ -1,8 +1,17 @@
 import graphene
 from django.contrib.auth import get_user_model
+from django.db.models import Count, Max, Sum
 from graphene_django import DjangoObjectType
 
-from ..models import Client, Consolidate, Package
+from ..models import (
+    ArchivedConsolidate,
+    ArchivedPackage,
+    Client,
+    ClientDeletionJob,
+    Consolidate,
+    Package,
+)
+from ..totals import ConsolidationTotals, consolidation_totals
 
 
 class UserType(DjangoObjectType):
@@ -26,6 +35,11 @@ class PackageType(DjangoObjectType):
             "dimension_unit",
             "weight",
             "weight_unit",
+            "weight_kg",
+            "length_cm",
+            "width_cm",
+            "height_cm",
+            "volume_cm3",
             "description",
             "purchase_link",
             "real_price",
@@ -35,8 +49,19 @@ class PackageType(DjangoObjectType):
             "updated_at",
             "client",
             "comments",
+            "consolidate_status",
         )
 
+    archived = graphene.Boolean(description="Moved to the archive with its consolidation")
+
+    @classmethod
+    def is_type_of(cls, root, info):
+        # Archived packages (packagehandling.archive) are served through the same type.
+        return isinstance(root, ArchivedPackage) or super().is_type_of(root, info)
+
+    def resolve_archived(self, info):
+        return isinstance(self, ArchivedPackage)
+
 
 class ClientType(DjangoObjectType):
     class Meta:
@@ -55,13 +80,25 @@ class ClientType(DjangoObjectType):
             "created_at",
             "updated_at",
             "user",
+            "package_count",
         )
 
     full_name = graphene.String()
+    unconsolidated_package_count = graphene.Int()
+    # allClients annotates this when selected; elsewhere it costs one query.
+    last_arrival_date = graphene.Date()
 
     def resolve_full_name(self, info):
         return self.full_name
 
+    def resolve_unconsolidated_package_count(self, info):
+        return self.unconsolidated_count
+
+    def resolve_last_arrival_date(self, info):
+        if hasattr(self, "last_arrival_date"):
+            return self.last_arrival_date
+        return self.packages.aggregate(value=Max("arrival_date"))["value"]
+
 
 class MeType(DjangoObjectType):
     class Meta:
@@ -82,6 +119,30 @@ class MeType(DjangoObjectType):
         return None
 
 
+class ClientDeletionJobType(DjangoObjectType):
+    progress = graphene.Float(description="Fraction of the client's packages and consolidations deleted so far")
+
+    class Meta:
+        model = ClientDeletionJob
+        fields = (
+            "id",
+            "client_id",
+            "delete_user",
+            "status",
+            "packages_total",
+            "packages_deleted",
+            "consolidates_total",
+            "consolidates_deleted",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        )
+
+    def resolve_progress(self, info):
+        return self.progress
+
+
 class ClientConnection(graphene.ObjectType):
     results = graphene.List(ClientType)
     total_count = graphene.Int()
@@ -91,6 +152,14 @@ class ClientConnection(graphene.ObjectType):
     has_previous = graphene.Boolean()
 
 
+class ConsolidationTotalsType(graphene.ObjectType):
+    """Totals computed live from a consolidation's packages."""
+
+    package_count = graphene.Int()
+    total_weight = graphene.Float(description="Kilograms")
+    total_cost = graphene.Float()
+
+
 class ConsolidateType(DjangoObjectType):
     class Meta:
         model = Consolidate
@@ -105,8 +174,40 @@ class ConsolidateType(DjangoObjectType):
             "updated_at",
             "client",
             "packages",
+            "package_count",
+            "total_weight",
+            "total_service_price",
         )
 
+    # One aggregate query per consolidation; the cached counters above cost none.
+    totals = graphene.Field(ConsolidationTotalsType)
+    archived = graphene.Boolean(description="Moved to the archive")
+
+    @classmethod
+    def is_type_of(cls, root, info):
+        # Archived consolidations (packagehandling.archive) are served through the same type.
+        return isinstance(root, ArchivedConsolidate) or super().is_type_of(root, info)
+
+    def resolve_totals(self, info):
+        if isinstance(self, ArchivedConsolidate):
+            # The packages can no longer change, so the counters frozen at archival are exact.
+            return ConsolidationTotals(self.package_count, self.total_weight, self.total_service_price)
+        return consolidation_totals(self)
+
+    def resolve_archived(self, info):
+        return isinstance(self, ArchivedConsolidate)
+
+
+class PackageMeasurementStatsType(graphene.ObjectType):
+    """Aggregates over the normalised measurements of every matching package (not just the page)."""
+
+    weighed_count = graphene.Int(description="Packages with a weight")
+    total_weight_kg = graphene.Float()
+    average_weight_kg = graphene.Float()
+    max_weight_kg = graphene.Float()
+    total_volume_cm3 = graphene.Float()
+    max_volume_cm3 = graphene.Float()
+
 
 class PackageConnection(graphene.ObjectType):
     results = graphene.List(PackageType)
@@ -115,6 +216,32 @@ class PackageConnection(graphene.ObjectType):
     page_size = graphene.Int()
     has_next = graphene.Boolean()
     has_previous = graphene.Boolean()
+    measurement_stats = graphene.Field(PackageMeasurementStatsType)
+
+    def resolve_measurement_stats(parent, info):
+        # Only aggregated when selected; ``querysets`` are the filtered, unpaginated result sets
+        # (the hot table, and the archive with includeArchived), one aggregate each.
+        parts = [
+            queryset.aggregate(
+                weighed_count=Count("weight_kg"),
+                total_weight_kg=Sum("weight_kg"),
+                max_weight_kg=Max("weight_kg"),
+                total_volume_cm3=Sum("volume_cm3"),
+                max_volume_cm3=Max("volume_cm3"),
+            )
+            for queryset in parent.querysets
+        ]
+
+        def combined(name, combine):
+            values = [part[name] for part in parts if part[name] is not None]
+            return combine(values) if values else None
+
+        stats = {name: combined(name, sum) for name in ("weighed_count", "total_weight_kg", "total_volume_cm3")}
+        stats.update({name: combined(name, max) for name in ("max_weight_kg", "max_volume_cm3")})
+        stats["average_weight_kg"] = (
+            stats["total_weight_kg"] / stats["weighed_count"] if stats["weighed_count"] else None
+        )
+        return stats
 
 
 class ConsolidateConnection(graphene.ObjectType):
@@ -124,3 +251,40 @@ class ConsolidateConnection(graphene.ObjectType):
     page_size = graphene.Int()
     has_next = graphene.Boolean()
     has_previous = graphene.Boolean()
+
+
+class ConsolidateStatusEventType(graphene.ObjectType):
+    """A status a consolidation entered (``packagehandling.status_history``)."""
+
+    status = graphene.String()
+    previous_status = graphene.String()
+    created_at = graphene.DateTime(description="When the status was entered")
+    left_at = graphene.DateTime(description="When the next status was entered; null for the current status")
+    dwell_seconds = graphene.Float(description="Time spent in the status; null for the current status")
+
+    def resolve_dwell_seconds(parent, info):
+        return (parent.left_at - parent.created_at).total_seconds() if parent.left_at else None
+
+
+class ConsolidateStatusDwellType(graphene.ObjectType):
+    """Average time consolidations spent in one status before moving on."""
+
+    status = graphene.String()
+    average_seconds = graphene.Float()
+    transitions = graphene.Int(description="Consolidations that entered the status and have since left it")
+
+
+class PackageChangeFeed(graphene.ObjectType):
+    results = graphene.List(PackageType)
+    deleted_ids = graphene.List(graphene.ID)
+    has_more = graphene.Boolean()
+    next_cursor = graphene.String()
+    synced_at = graphene.DateTime()
+
+
+class ConsolidateChangeFeed(graphene.ObjectType):
+    results = graphene.List(ConsolidateType)
+    deleted_ids = graphene.List(graphene.ID)
+    has_more = graphene.Boolean()
+    next_cursor = graphene.String()
+    synced_at = graphene.DateTime()
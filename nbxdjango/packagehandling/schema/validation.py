@@ -0,0 +1,237 @@
+"""
+Size limits on GraphQL operations, checked while the document is validated,
+before anything executes.
+
+- Depth: at most ``GRAPHQL_MAX_DEPTH`` nested field levels (introspection is
+  not counted).
+- Aliases: at most ``GRAPHQL_MAX_ALIASES`` aliased fields. Aliasing one field
+  many times runs its resolver as many times at the same level.
+- Cost: at most ``GRAPHQL_MAX_COST``, an estimate of the rows an operation
+  loads. Each object field costs 1, or its ``FIELD_COSTS`` entry for resolvers
+  that run aggregates; scalar fields are free. A list multiplies the cost of its
+  items by its size: the ``pageSize`` / ``limit`` argument of the list field,
+  or of the paginated field right above it (``results`` of a connection), and
+  ``GRAPHQL_DEFAULT_LIST_SIZE`` for lists without one, such as a
+  consolidation's ``packages``.
+- Selections: costing an operation visits at most ``GRAPHQL_MAX_SELECTIONS``
+  fields and fragments.
+
+Both the depth and the cost walk handle each fragment once (per list size, for
+the cost), so a document spreading fragments that spread each other several
+times is measured in time linear in its length, not in its expanded size.
+
+The GraphQL views report the cost of the operation they ran in the response's
+``extensions``.
+"""
+
+from django.conf import settings
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    get_named_type,
+    get_nullable_type,
+    is_composite_type,
+    is_list_type,
+    specified_rules,
+)
+from graphql.execution.values import get_argument_values
+from graphql.validation import ValidationRule
+
+# Arguments giving the size of the list a field returns (Python names).
+SIZE_ARGUMENTS = ("page_size", "limit")
+
+# Fields that cost more than the rows they return, by "Type.field".
+FIELD_COSTS = {
+    "Query.dashboard": 10,
+    "DashboardType.stats": 10,
+    "Query.queueStats": 10,
+    "Query.searchArchive": 10,
+    "Query.consolidateStatusDwellTimes": 5,
+    "PackageConnection.measurementStats": 5,
+    "ConsolidateType.totals": 2,
+}
+
+
+class _SelectionLimitReached(Exception):
+    pass
+
+
+class _CostWalk:
+    """
+    Costs the operations of one document. A fragment is costed once per list
+    size it is spread under, however often it is spread, and the walk stops
+    after ``max_selections`` selections.
+    """
+
+    def __init__(self, context, variables, max_selections):
+        self.context = context
+        self.variables = variables
+        self.max_selections = max_selections
+        self.selections = 0
+        self.fragments = {}
+
+    def operation(self, operation):
+        root_type = self.context.schema.get_root_type(operation.operation)
+        return self.selection_set(root_type, operation.selection_set) if root_type else 0
+
+    def selection_set(self, parent_type, selection_set, size=None, spread=()):
+        total = 0
+        for selection in selection_set.selections:
+            self.selections += 1
+            if self.selections > self.max_selections:
+                raise _SelectionLimitReached
+            if isinstance(selection, FieldNode):
+                total += self.field(parent_type, selection, size, spread)
+            elif isinstance(selection, InlineFragmentNode):
+                condition = selection.type_condition
+                fragment_type = self.context.schema.get_type(condition.name.value) if condition else parent_type
+                total += self.selection_set(fragment_type, selection.selection_set, size, spread)
+            elif isinstance(selection, FragmentSpreadNode):
+                total += self.fragment(selection.name.value, size, spread)
+        return total
+
+    def fragment(self, name, size, spread):
+        # The type condition fixes the fragment's type, so its cost only depends on the size.
+        if (name, size) not in self.fragments:
+            fragment = self.context.get_fragment(name)
+            # Unknown and cyclic fragments are reported by the standard rules.
+            if fragment is None or name in spread:
+                return 0
+            fragment_type = self.context.schema.get_type(fragment.type_condition.name.value)
+            self.fragments[name, size] = self.selection_set(
+                fragment_type, fragment.selection_set, size, (*spread, name)
+            )
+        return self.fragments[name, size]
+
+    def field(self, parent_type, node, size, spread):
+        fields = getattr(parent_type, "fields", None) or {}
+        field = fields.get(node.name.value)
+        if field is None:  # introspection, or an unknown field the standard rules report
+            return 0
+        try:
+            arguments = get_argument_values(field, node, self.variables)
+        except GraphQLError:
+            arguments = {}
+        own_size = next((arguments[name] for name in SIZE_ARGUMENTS if arguments.get(name) is not None), None)
+
+        field_type = get_named_type(field.type)
+        cost = FIELD_COSTS.get(f"{parent_type.name}.{node.name.value}", 1 if is_composite_type(field_type) else 0)
+        is_list = is_list_type(get_nullable_type(field.type))
+        if node.selection_set:
+            # A size given to a paginated field applies to the list right beneath it.
+            child_size = None if is_list else own_size
+            cost += self.selection_set(field_type, node.selection_set, child_size, spread)
+        if is_list:
+            # Out-of-range sizes fail in the resolver; a negative one must not lower the cost of its siblings.
+            cost *= max(own_size or size or settings.GRAPHQL_DEFAULT_LIST_SIZE, 1)
+        return cost
+
+
+def cost_limit_validator(max_cost, max_selections, variables=None, callback=None):
+    """
+    A validation rule rejecting operations that cost more than ``max_cost``
+    with ``variables``, or that take more than ``max_selections`` selections
+    to cost. ``callback`` gets ``{operation name: cost}``.
+    """
+
+    class CostLimitValidator(ValidationRule):
+        def enter_document(self, node, *args):
+            walk = _CostWalk(self.context, variables or {}, max_selections)
+            costs = {}
+            for definition in node.definitions:
+                if not isinstance(definition, OperationDefinitionNode):
+                    continue
+                name = definition.name.value if definition.name else None
+                try:
+                    costs[name] = walk.operation(definition)
+                except _SelectionLimitReached:
+                    self.report_error(
+                        GraphQLError(f"Operations may have at most {max_selections} selections.", definition)
+                    )
+                    # The limit holds for the whole document.
+                    break
+                if costs[name] > max_cost:
+                    self.report_error(
+                        GraphQLError(
+                            f"Operation cost {costs[name]} exceeds the limit of {max_cost}. "
+                            "Request smaller pages or fewer nested lists.",
+                            definition,
+                        )
+                    )
+            if callback is not None:
+                callback(costs)
+
+    return CostLimitValidator
+
+
+def depth_limit_validator(max_depth):
+    """
+    A validation rule rejecting operations nested deeper than ``max_depth``
+    field levels; introspection fields are not counted. Unlike graphene's
+    rule of the same name, each fragment is measured once, however often it
+    is spread.
+    """
+
+    class DepthLimitValidator(ValidationRule):
+        def enter_document(self, node, *args):
+            fragment_depths = {}
+
+            def selection_set_depth(selection_set, spread):
+                return max((selection_depth(selection, spread) for selection in selection_set.selections), default=0)
+
+            def selection_depth(selection, spread):
+                if isinstance(selection, FieldNode):
+                    if selection.name.value.startswith("__") or not selection.selection_set:
+                        return 0
+                    return 1 + selection_set_depth(selection.selection_set, spread)
+                if isinstance(selection, InlineFragmentNode):
+                    return selection_set_depth(selection.selection_set, spread)
+                name = selection.name.value
+                if name not in fragment_depths:
+                    fragment = self.context.get_fragment(name)
+                    # Unknown and cyclic fragments are reported by the standard rules.
+                    if fragment is None or name in spread:
+                        return 0
+                    fragment_depths[name] = selection_set_depth(fragment.selection_set, (*spread, name))
+                return fragment_depths[name]
+
+            for definition in node.definitions:
+                if not isinstance(definition, OperationDefinitionNode):
+                    continue
+                if selection_set_depth(definition.selection_set, ()) > max_depth:
+                    name = definition.name.value if definition.name else "anonymous"
+                    self.report_error(
+                        GraphQLError(f"'{name}' exceeds maximum operation depth of {max_depth}.", definition)
+                    )
+
+    return DepthLimitValidator
+
+
+def alias_limit_validator(max_aliases):
+    """A validation rule rejecting documents with more than ``max_aliases`` aliased fields."""
+
+    class AliasLimitValidator(ValidationRule):
+        def __init__(self, context):
+            super().__init__(context)
+            self.aliases = 0
+
+        def enter_field(self, node, *args):
+            if node.alias:
+                self.aliases += 1
+                if self.aliases == max_aliases + 1:
+                    self.report_error(GraphQLError(f"Operations may use at most {max_aliases} aliases.", node))
+
+    return AliasLimitValidator
+
+
+def query_limit_rules(variables=None, on_cost=None):
+    """The standard validation rules plus the depth, alias, cost and selection limits."""
+    return [
+        *specified_rules,
+        depth_limit_validator(settings.GRAPHQL_MAX_DEPTH),
+        alias_limit_validator(settings.GRAPHQL_MAX_ALIASES),
+        cost_limit_validator(settings.GRAPHQL_MAX_COST, settings.GRAPHQL_MAX_SELECTIONS, variables, on_cost),
+    ]
@@ -0,0 +1,231 @@
+"""
+Bulk seed-data engine.
+
+Builds model instances in memory with the factories' ``build`` strategy and
+inserts them in large ``bulk_create`` chunks (or ``COPY`` on PostgreSQL)
+instead of saving one row at a time. Every generated user shares one password
+hash, computed once, so PBKDF2 does not dominate the run.
+
+Because ``bulk_create`` and ``COPY`` skip ``post_save``, the engine adds new
+client users to the "Client" group itself, like ``signals.add_user_to_client_group``,
+records the initial status of new consolidations (``status_history``), and
+recomputes the cached package counters of the clients it added packages to.
+"""
+
+import multiprocessing
+import random
+import uuid
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .counters import recompute_counters
+from .factories import ClientFactory, ConsolidateFactory, PackageFactory, UserFactory
+from .models import Client, Consolidate, ConsolidateStatusEvent, CustomUser, Package
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Rows generated per unit of --scale: 1000 units is the 1M-package load-testing dataset.
+SCALE_UNIT = {"clients": 10, "consolidates": 30, "packages": 1000}
+CONSOLIDATED_RATIO = 0.5
+
+
+class SeedEngine:
+    """
+    Generate users, clients, consolidations and packages in bulk.
+
+    ``tag`` makes generated emails and barcodes unique per run, so the engine
+    can be pointed at a database that already holds seeded data.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, password="password", use_copy=False, using="default", tag=None):
+        self.batch_size = batch_size
+        self.password_hash = make_password(password)
+        self.using = using
+        self.use_copy = use_copy and connections[using].vendor == "postgresql"
+        self.tag = tag or uuid.uuid4().hex[:8]
+        self.stats: Counter = Counter()
+
+    def _chunks(self, items):
+        for start in range(0, len(items), self.batch_size):
+            yield items[start : start + self.batch_size]
+
+    def _insert(self, model, objs):
+        """Insert ``objs`` in chunks and return them (with primary keys when the backend reports them)."""
+        for chunk in self._chunks(objs):
+            with transaction.atomic(using=self.using):
+                model.objects.using(self.using).bulk_create(chunk, batch_size=self.batch_size)
+        return objs
+
+    def _copy(self, model, objs):
+        """Stream ``objs`` into ``model``'s table with PostgreSQL ``COPY``; primary keys are not returned."""
+        connection = connections[self.using]
+        fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+        table = connection.ops.quote_name(model._meta.db_table)
+        columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+        for chunk in self._chunks(objs):
+            with transaction.atomic(using=self.using), connection.cursor() as cursor:
+                with cursor.cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+                    for obj in chunk:
+                        copy.write_row(
+                            [field.get_db_prep_save(field.pre_save(obj, True), connection) for field in fields]
+                        )
+
+    def create_users(self, count, prefix="user", **fields):
+        users = []
+        for n in range(self.stats["users"], self.stats["users"] + count):
+            user = UserFactory.build(email=f"{prefix}-{self.tag}-{n}@example.com", **fields)
+            user.password = self.password_hash
+            users.append(user)
+        self._insert(CustomUser, users)
+        self.stats["users"] += count
+        return users
+
+    def create_clients(self, count):
+        users = self.create_users(count, prefix="client")
+        clients = self._insert(Client, [ClientFactory.build(user=user) for user in users])
+
+        client_group = Group.objects.using(self.using).filter(name="Client").first()
+        if client_group is not None:
+            memberships = [CustomUser.groups.through(customuser_id=user.pk, group_id=client_group.pk) for user in users]
+            self._insert(CustomUser.groups.through, memberships)
+
+        self.stats["clients"] += count
+        return clients
+
+    def create_consolidates(self, clients, count, status=None):
+        extra = {"status": status} if status else {}
+        consolidates = self._insert(
+            Consolidate,
+            [ConsolidateFactory.build(client=random.choice(clients), **extra) for _ in range(count)],
+        )
+        self._insert(
+            ConsolidateStatusEvent,
+            [
+                ConsolidateStatusEvent(consolidate_id=consolidate.pk, status=consolidate.status)
+                for consolidate in consolidates
+            ],
+        )
+        self.stats["consolidates"] += count
+        return consolidates
+
+    def _build_package(self, n, client, consolidate):
+        package = PackageFactory.build(
+            client=client,
+            consolidate=consolidate,
+            # bulk inserts skip Package.save(), which normally fills this in.
+            consolidate_status=consolidate.status if consolidate else None,
+            barcode=f"SEED{self.tag}{n:010d}",
+            dimension_unit="cm",
+            weight=round(random.uniform(0.2, 60.0), 2),
+            weight_unit="lb",
+            real_price=round(random.uniform(5.0, 800.0), 2),
+            service_price=round(random.uniform(3.0, 120.0), 2),
+            arrival_date=timezone.now().date() - timedelta(days=random.randint(0, 365)),
+        )
+        package.normalize_measurements()
+        return package
+
+    def create_packages(self, count, clients, consolidates=(), consolidated_ratio=CONSOLIDATED_RATIO, consolidate=None):
+        """
+        Create ``count`` packages for random ``clients``.
+
+        With ``consolidate`` every package goes into it (and belongs to its
+        client). Otherwise roughly ``consolidated_ratio`` of them are put in
+        one of their own client's ``consolidates``. Rows are generated and
+        inserted one chunk at a time, so memory stays flat at any scale.
+        """
+        by_client = defaultdict(list)
+        for item in consolidates:
+            by_client[item.client_id].append(item)
+
+        chunk = []
+        for n in range(count):
+            if consolidate is not None:
+                client, package_consolidate = consolidate.client, consolidate
+            else:
+                client = random.choice(clients)
+                own = by_client.get(client.pk)
+                package_consolidate = random.choice(own) if own and random.random() < consolidated_ratio else None
+            chunk.append(self._build_package(self.stats["packages"] + n, client, package_consolidate))
+            self.stats["consolidated_packages"] += package_consolidate is not None
+
+            if len(chunk) == self.batch_size:
+                self._write_packages(chunk)
+                chunk = []
+        if chunk:
+            self._write_packages(chunk)
+        self.stats["packages"] += count
+
+        client_ids = [consolidate.client_id] if consolidate is not None else [client.pk for client in clients]
+        recompute_counters(
+            clients=Client.objects.using(self.using).filter(pk__in=client_ids),
+            consolidates=Consolidate.objects.using(self.using).filter(client_id__in=client_ids),
+        )
+        return count
+
+    def _write_packages(self, packages):
+        if self.use_copy:
+            self._copy(Package, packages)
+        else:
+            self._insert(Package, packages)
+
+
+def volumes_for_scale(scale):
+    return {name: per_unit * scale for name, per_unit in SCALE_UNIT.items()}
+
+
+def seed_shard(volumes, batch_size=DEFAULT_BATCH_SIZE, password="password", use_copy=False, tag=None):
+    """Seed one independent slice of the dataset: its own clients, consolidations and packages."""
+    engine = SeedEngine(batch_size=batch_size, password=password, use_copy=use_copy, tag=tag)
+    clients = engine.create_clients(volumes["clients"])
+    consolidates = engine.create_consolidates(clients, volumes["consolidates"])
+    engine.create_packages(volumes["packages"], clients, consolidates)
+    return dict(engine.stats)
+
+
+def _split(volumes, parts):
+    # Every shard needs a client to own its packages and consolidations.
+    parts = max(1, min(parts, volumes["clients"]))
+    return [
+        {name: total // parts + (index < total % parts) for name, total in volumes.items()} for index in range(parts)
+    ]
+
+
+def _run_shard(arguments):
+    volumes, options = arguments
+    try:
+        return seed_shard(volumes, **options)
+    finally:
+        connections.close_all()
+
+
+def seed(scale, processes=1, batch_size=DEFAULT_BATCH_SIZE, password="password", use_copy=False):
+    """
+    Seed ``scale`` units of data, optionally split across ``processes`` worker
+    processes that each insert an independent shard. Returns the row counts.
+    """
+    volumes = volumes_for_scale(scale)
+    tag = uuid.uuid4().hex[:6]
+    if processes <= 1:
+        return seed_shard(volumes, batch_size=batch_size, password=password, use_copy=use_copy, tag=tag)
+
+    jobs = [
+        (shard, {"batch_size": batch_size, "password": password, "use_copy": use_copy, "tag": f"{tag}{index:02d}"})
+        for index, shard in enumerate(_split(volumes, processes))
+    ]
+    # Children must open their own connections; never share the parent's socket.
+    connections.close_all()
+    # Spawned children must set Django up before unpickling anything that imports models.
+    with multiprocessing.get_context("spawn").Pool(processes=len(jobs), initializer=django.setup) as pool:
+        results = pool.map(_run_shard, jobs)
+
+    totals: Counter = Counter()
+    for result in results:
+        totals.update(result)
+    return dict(totals)
@@ -1,8 +1,11 @@
 from django.contrib.auth.models import Group
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
+from django_q.signals import post_execute, pre_execute
 
-from .models import Client
+from . import counters, lanes, outbox, queue_metrics, rollups, status_history
+from .models import Client, Consolidate, ConsolidateStatusEvent, DeletionLog, Package
 
 
 @receiver(post_save, sender=Client)
@@ -13,3 +16,114 @@ def add_user_to_client_group(sender, instance, created, **kwargs):
             instance.user.groups.add(client_group)
         except Group.DoesNotExist:
             pass
+
+
+@receiver(post_save, sender=Consolidate)
+def sync_package_consolidate_status(sender, instance, created, **kwargs):
+    """Propagate a consolidate's status to the denormalized Package.consolidate_status column."""
+    if created:
+        return
+    instance.packages.exclude(consolidate_status=instance.status).update(
+        consolidate_status=instance.status, updated_at=timezone.now()
+    )
+
+
+@receiver(pre_delete, sender=Consolidate)
+def clear_package_consolidate_status(sender, instance, **kwargs):
+    """Packages are detached (SET_NULL) when their consolidate is deleted; clear their status copy too."""
+    counters.move_packages(instance.packages.all(), None)
+    instance.packages.update(consolidate_status=None, updated_at=timezone.now())
+
+
+@receiver(pre_save, sender=Package)
+def remember_counted_package(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance.saving_counted = None if instance._state.adding else counters.stored_counted(instance)
+
+
+@receiver(post_save, sender=Package)
+def update_package_counters(sender, instance, raw=False, **kwargs):
+    """Move the package's contribution to the cached Client/Consolidate counters."""
+    if raw:
+        return
+    counted = instance.counted_values()
+    counters.package_saved(instance.saving_counted, counted)
+    instance.loaded_counted = counted
+
+
+@receiver(pre_delete, sender=Package)
+def remove_package_from_counters(sender, instance, **kwargs):
+    """Runs for queryset and admin deletes too: the collector sends pre_delete for every package it removes."""
+    counted = counters.stored_counted(instance)
+    if counted is not None:
+        counters.package_deleted(counted)
+
+
+@receiver(post_save, sender=Package)
+def mark_moved_rollup_day(sender, instance, created, raw=False, **kwargs):
+    """A package moved to another day or client leaves its old rollup row behind: have it redone."""
+    if raw:
+        return
+    loaded = getattr(instance, "loaded_arrival", None)
+    arrival = (instance.client_id, instance.arrival_date)
+    if not created and loaded is not None and loaded != arrival:
+        rollups.mark_stale(*loaded)
+    instance.loaded_arrival = arrival
+
+
+@receiver(post_save, sender=Package)
+def record_package_event(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    event_type = "package.created" if created else "package.updated"
+    outbox.record_event(event_type, instance, outbox.package_payload(instance))
+
+
+# Registered before record_consolidate_event, which moves loaded_status on to the saved status.
+@receiver(post_save, sender=Consolidate)
+def record_status_history(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous_status = None if created else getattr(instance, "loaded_status", None)
+    if created or previous_status != instance.status:
+        status_history.record_status_change(instance, previous_status)
+
+
+@receiver(post_save, sender=Consolidate)
+def record_consolidate_event(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous_status = getattr(instance, "loaded_status", None)
+    if created:
+        event_type = "consolidate.created"
+    elif previous_status != instance.status:
+        event_type = "consolidate.status_changed"
+    else:
+        event_type = "consolidate.updated"
+    outbox.record_event(event_type, instance, outbox.consolidate_payload(instance, previous_status))
+    instance.loaded_status = instance.status
+
+
+@receiver(pre_delete, sender=Package)
+@receiver(pre_delete, sender=Consolidate)
+def record_deletion(sender, instance, **kwargs):
+    """
+    Sync tombstone and webhook event for a deleted package or consolidation, however it
+    is deleted: mutations, the admin, queryset deletes and cascades all go through here.
+    Bulk client deletion (``packagehandling.deletion``) bypasses signals and writes its own.
+    """
+    model_name = sender._meta.model_name
+    DeletionLog.objects.create(object_type=model_name, object_id=instance.pk, client_id=instance.client_id)
+    outbox.record_event(f"{model_name}.deleted", instance, {"id": instance.pk, "client_id": instance.client_id})
+
+
+@receiver(post_delete, sender=Consolidate)
+def delete_status_history(sender, instance, **kwargs):
+    ConsolidateStatusEvent.objects.filter(consolidate_id=instance.pk).delete()
+
+
+# Pacing runs first, so a throttled bulk task's pause is reported as queue wait.
+pre_execute.connect(lanes.throttle_bulk_lane, dispatch_uid="packagehandling.throttle_bulk_lane")
+pre_execute.connect(queue_metrics.mark_execution_started, dispatch_uid="packagehandling.task_execution_started")
+post_execute.connect(queue_metrics.record_task_metric, dispatch_uid="packagehandling.task_metric")
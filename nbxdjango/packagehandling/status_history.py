@@ -0,0 +1,92 @@
+"""
+Consolidation status history.
+
+Every status a consolidation enters, including the one it is created with, is
+appended to ``ConsolidateStatusEvent`` by a ``post_save`` handler, in the
+transaction that saved the transition (``ATOMIC_MUTATIONS`` for GraphQL, the
+admin's own transaction otherwise). Rows are never updated. Statuses a
+consolidation held before this table existed are not known.
+
+The time spent in a status (its dwell time) runs from entering it to entering
+the next one. ``timeline`` reads one consolidation's events through the
+``(consolidate_id, created_at)`` index; ``dwell_times`` averages the dwell
+time per status across all consolidations with a ``LEAD()`` window function,
+cached for ``STATUS_DWELL_CACHE_SECONDS``.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router
+from django.db.models import DurationField, ExpressionWrapper, F, Window
+from django.db.models.functions import Lead
+from django.utils import timezone
+
+from .models import ConsolidateStatusEvent
+
+
+def record_status_change(consolidate, previous_status=None):
+    """Append ``consolidate``'s current status to its history (in the caller's transaction)."""
+    return ConsolidateStatusEvent.objects.create(
+        consolidate_id=consolidate.pk, status=consolidate.status, previous_status=previous_status
+    )
+
+
+def _with_left_at(queryset):
+    """``queryset`` annotated with ``left_at``: when the consolidation entered its next status."""
+    return queryset.annotate(
+        left_at=Window(
+            Lead("created_at"),
+            partition_by=[F("consolidate_id")],
+            order_by=[F("created_at").asc(), F("id").asc()],
+        )
+    )
+
+
+def timeline(consolidate_id):
+    """The status events of one consolidation, oldest first, each with its ``left_at`` (None for the current one)."""
+    events = ConsolidateStatusEvent.objects.filter(consolidate_id=consolidate_id)
+    return list(_with_left_at(events).order_by("created_at", "id"))
+
+
+def _as_timedelta(value):
+    # AVG() over a duration is an interval on PostgreSQL and a number of microseconds on SQLite.
+    if value is None or isinstance(value, timedelta):
+        return value
+    return timedelta(microseconds=value)
+
+
+def _dwell_times(days):
+    events = ConsolidateStatusEvent.objects.all()
+    if days:
+        # Filtered before the window: the next status of an event in range is in range too.
+        events = events.filter(created_at__gte=timezone.now() - timedelta(days=days))
+    dwells = _with_left_at(events).annotate(
+        dwell=ExpressionWrapper(F("left_at") - F("created_at"), output_field=DurationField())
+    )
+    inner_sql, params = dwells.values_list("status", "dwell").query.sql_with_params()
+
+    # Aggregates can't wrap a window function directly, so average over it as a subquery.
+    # The statuses still held (and the final ones) have no next status and are left out.
+    connection = connections[router.db_for_read(ConsolidateStatusEvent)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT status, AVG(dwell), COUNT(dwell) FROM ({inner_sql}) dwells "
+            "WHERE dwell IS NOT NULL GROUP BY status",
+            params,
+        )
+        rows = cursor.fetchall()
+    return {status: {"average": _as_timedelta(average), "count": count} for status, average, count in rows}
+
+
+def dwell_times(days=None):
+    """
+    ``{status: {"average": timedelta, "count": int}}``: the average time
+    consolidations spent in each status they have since left, over the status
+    events of the last ``days`` days (all of them by default). Cached for
+    ``STATUS_DWELL_CACHE_SECONDS``.
+    """
+    return cache.get_or_set(
+        f"status-dwell:{days or 'all'}", lambda: _dwell_times(days), settings.STATUS_DWELL_CACHE_SECONDS
+    )
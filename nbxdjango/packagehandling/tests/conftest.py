@@ -3,10 +3,26 @@ Shared pytest fixtures for packagehandling tests.
 """
 
 import pytest
+from django.conf import settings
 from django.test import RequestFactory
 from graphql.type import GraphQLResolveInfo as ResolveInfo
 
 
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    """
+    A second test database standing in for the read replica, separate from
+    ``default`` so tests can tell which one a read went to. Tests opt in with
+    ``django_db(databases=["default", "replica"])`` and enable routing with
+    ``settings.DATABASE_REPLICA_ALIAS = "replica"`` (see test_routing.py).
+    """
+    default = settings.DATABASES["default"]
+    replica_test_name = None if "sqlite" in default["ENGINE"] else f"test_{default['NAME']}_replica"
+    test = {**default.get("TEST", {}), "NAME": replica_test_name, "MIRROR": None}
+    settings.DATABASES["replica"] = {**default, "TEST": test}
+    settings.DATABASE_REPLICA_ALIAS = None
+
+
 @pytest.fixture
 def info_with_user_factory():
     """
@@ -0,0 +1,112 @@
+from io import StringIO
+from unittest.mock import Mock
+
+import pytest
+from django.core.management import call_command
+from packagehandling.factories import (
+    ClientFactory,
+    ConsolidateFactory,
+    PackageFactory,
+    UserFactory,
+)
+from packagehandling.models import Consolidate, Package
+from packagehandling.schema.mutation_parts.consolidate_mutations import (
+    CreateConsolidate,
+    UpdateConsolidate,
+)
+from packagehandling.schema.queries import Query
+
+
+@pytest.mark.django_db
+class TestConsolidateStatusSync:
+    def test_package_save_copies_consolidate_status(self):
+        client = ClientFactory()
+        consolidate = ConsolidateFactory(client=client, status=Consolidate.Status.PROCESSING)
+
+        package = PackageFactory(client=client, consolidate=consolidate)
+        loose = PackageFactory(client=client)
+
+        assert package.consolidate_status == Consolidate.Status.PROCESSING
+        assert loose.consolidate_status is None
+
+    def test_consolidate_status_change_propagates(self):
+        client = ClientFactory()
+        consolidate = ConsolidateFactory(client=client, status=Consolidate.Status.PROCESSING)
+        package = PackageFactory(client=client, consolidate=consolidate)
+
+        consolidate.status = Consolidate.Status.IN_TRANSIT
+        consolidate.save()
+
+        package.refresh_from_db()
+        assert package.consolidate_status == Consolidate.Status.IN_TRANSIT
+
+    def test_set_packages_updates_added_and_removed(self):
+        client = ClientFactory()
+        consolidate = ConsolidateFactory(client=client, status=Consolidate.Status.PENDING)
+        removed = PackageFactory(client=client, consolidate=consolidate)
+        added = PackageFactory(client=client)
+
+        consolidate.set_packages([added])
+
+        removed.refresh_from_db()
+        added.refresh_from_db()
+        assert removed.consolidate is None
+        assert removed.consolidate_status is None
+        assert added.consolidate == consolidate
+        assert added.consolidate_status == Consolidate.Status.PENDING
+
+    def test_deleting_consolidate_clears_status(self):
+        client = ClientFactory()
+        consolidate = ConsolidateFactory(client=client, status=Consolidate.Status.PENDING)
+        package = PackageFactory(client=client, consolidate=consolidate)
+
+        consolidate.delete()
+
+        package.refresh_from_db()
+        assert package.consolidate is None
+        assert package.consolidate_status is None
+
+    def test_mutations_keep_status_in_sync(self, info_with_user_factory):
+        info = info_with_user_factory(UserFactory(is_superuser=True))
+        client = ClientFactory()
+        package = PackageFactory(client=client)
+
+        result = CreateConsolidate().mutate(info, description="d", status="pending", package_ids=[package.id])
+        package.refresh_from_db()
+        assert package.consolidate_status == Consolidate.Status.PENDING
+
+        UpdateConsolidate().mutate(info, id=result.consolidate.id, status="processing")
+        package.refresh_from_db()
+        assert package.consolidate_status == Consolidate.Status.PROCESSING
+
+    def test_backfill_command_repairs_stale_rows(self):
+        client = ClientFactory()
+        consolidate = ConsolidateFactory(client=client, status=Consolidate.Status.DELIVERED)
+        stale = PackageFactory(client=client, consolidate=consolidate)
+        orphan = PackageFactory(client=client)
+        Package.objects.filter(pk=stale.pk).update(consolidate_status=None)
+        Package.objects.filter(pk=orphan.pk).update(consolidate_status=Consolidate.Status.PENDING)
+
+        out = StringIO()
+        call_command("backfill_consolidate_status", "--batch-size", "1", stdout=out)
+
+        stale.refresh_from_db()
+        orphan.refresh_from_db()
+        assert stale.consolidate_status == Consolidate.Status.DELIVERED
+        assert orphan.consolidate_status is None
+        assert "Backfilled consolidate_status on 2 packages" in out.getvalue()
+
+    def test_all_packages_filters_on_consolidate_status(self):
+        superuser = UserFactory(is_superuser=True)
+        client = ClientFactory()
+        in_transit = ConsolidateFactory(client=client, status=Consolidate.Status.IN_TRANSIT)
+        PackageFactory(client=client, consolidate=in_transit)
+        PackageFactory(client=client)
+        info = Mock()
+        info.context.user = superuser
+
+        result = Query.resolve_all_packages(
+            None, info, not_in_consolidate=False, consolidate_status=Consolidate.Status.IN_TRANSIT, order_by="-status"
+        )
+
+        assert result.total_count == 1
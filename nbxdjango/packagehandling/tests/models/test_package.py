@@ -108,3 +108,28 @@ def test_package_nullable_fields(create_client):
     assert package.description is None
     assert package.purchase_link is None
     assert package.other_courier == "Some Other Courier"
+
+
+@pytest.mark.django_db
+def test_package_normalized_measurements(create_client):
+    package = Package.objects.create(
+        barcode="NORMALIZED",
+        courier="UPS",
+        length=10,
+        width=5,
+        height=2,
+        dimension_unit="in",
+        weight=2,
+        weight_unit="LB",
+        client=create_client,
+    )
+    assert package.weight_kg == pytest.approx(0.90718474)
+    assert (package.length_cm, package.width_cm, package.height_cm) == pytest.approx((25.4, 12.7, 5.08))
+    assert package.volume_cm3 == pytest.approx(100 * 2.54**3)
+
+    # Saving only the typed-in columns still refreshes the normalised copies.
+    package.weight, package.weight_unit, package.height = 500, "g", None
+    package.save(update_fields=["weight", "weight_unit", "height"])
+    package.refresh_from_db()
+    assert package.weight_kg == pytest.approx(0.5)
+    assert package.height_cm is None and package.volume_cm3 is None
@@ -64,6 +64,7 @@ class TestForgotPassword:
         assert result.ok is True
         mock_send_email.assert_called_once()
         assert "reset-password" in mock_send_email.call_args[1]["body"]
+        assert mock_send_email.call_args[1]["lane"] == "transactional"
 
     @patch("packagehandling.schema.mutation_parts.auth_mutations.send_email")
     def test_forgot_password_for_nonexistent_user(self, mock_send_email):
@@ -327,6 +327,11 @@ class TestCreateConsolidate:
             CONSOLIDATE_CREATED_SUBJECT,
             CONSOLIDATE_CREATED_MESSAGE,
             ["test.client@example.com"],
+            idempotency={
+                "template": "consolidate_created",
+                "consolidate_id": result.consolidate.pk,
+                "status": "pending",
+            },
         )
 
     @patch("packagehandling.schema.mutation_parts.consolidate_mutations.send_consolidate_email")  # Correct target
@@ -363,6 +368,11 @@ class TestCreateConsolidate:
             CONSOLIDATE_CREATED_SUBJECT,
             CONSOLIDATE_CREATED_MESSAGE,
             ["test.client@example.com"],
+            idempotency={
+                "template": "consolidate_created",
+                "consolidate_id": result.consolidate.pk,
+                "status": "pending",
+            },
         )
 
 
@@ -1,10 +1,35 @@
+from datetime import date
 from unittest.mock import Mock
 
 import pytest
 from django.core.exceptions import PermissionDenied
-from packagehandling.factories import ClientFactory, UserFactory
+from django.test import RequestFactory
+from packagehandling.factories import (
+    ClientFactory,
+    ConsolidateFactory,
+    PackageFactory,
+    UserFactory,
+)
+from packagehandling.schema import schema
 from packagehandling.schema.queries import Query
 
+PACKAGE_SUMMARY_QUERY = """
+query ($orderBy: String) {
+  allClients(orderBy: $orderBy) {
+    results { email ...Summary }
+  }
+}
+fragment Summary on ClientType { packageCount unconsolidatedPackageCount lastArrivalDate }
+"""
+
+
+def execute_as(user, query, **variables):
+    request = RequestFactory().post("/graphql/")
+    request.user = user
+    result = schema.execute(query, context_value=request, variable_values=variables)
+    assert result.errors is None
+    return result.data
+
 
 @pytest.mark.django_db
 class TestClientQueries:
@@ -207,6 +232,65 @@ class TestClientQueries:
         assert result.has_next
         assert not result.has_previous
 
+    def test_all_clients_package_summary_in_one_query(self, django_assert_num_queries):
+        superuser = UserFactory(is_superuser=True)
+        busy = ClientFactory(email="busy@example.com")
+        consolidate = ConsolidateFactory(client=busy)
+        PackageFactory(client=busy, arrival_date=date(2024, 1, 5), consolidate=consolidate)
+        PackageFactory.create_batch(2, client=busy, arrival_date=date(2024, 3, 1))
+        ClientFactory.create_batch(3)
+
+        # Count + page, however many clients are on the page.
+        with django_assert_num_queries(2):
+            data = execute_as(superuser, PACKAGE_SUMMARY_QUERY, orderBy="-unconsolidated_package_count")
+
+        results = data["allClients"]["results"]
+        assert results[0] == {
+            "email": "busy@example.com",
+            "packageCount": 3,
+            "unconsolidatedPackageCount": 2,
+            "lastArrivalDate": "2024-03-01",
+        }
+        assert results[1]["packageCount"] == 0
+        assert results[1]["lastArrivalDate"] is None
+
+    def test_all_clients_skips_package_summary_when_not_selected(self, django_assert_num_queries):
+        superuser = UserFactory(is_superuser=True)
+        PackageFactory.create_batch(2)
+        with django_assert_num_queries(2) as context:
+            execute_as(superuser, "{ allClients { results { email } } }")
+        assert all("packagehandling_package" not in query["sql"] for query in context.captured_queries)
+
+    @pytest.mark.parametrize(
+        "order_by,expected",
+        [
+            ("package_count", ["none@example.com", "one@example.com", "two@example.com"]),
+            ("-package_count", ["two@example.com", "one@example.com", "none@example.com"]),
+            ("-last_arrival_date", ["one@example.com", "two@example.com", "none@example.com"]),
+        ],
+    )
+    def test_resolve_all_clients_order_by_package_summary(self, order_by, expected):
+        superuser = UserFactory(is_superuser=True)
+        ClientFactory(email="none@example.com")
+        one = ClientFactory(email="one@example.com")
+        two = ClientFactory(email="two@example.com")
+        PackageFactory(client=one, arrival_date=date(2024, 6, 1))
+        PackageFactory.create_batch(2, client=two, arrival_date=date(2024, 2, 1))
+        info = Mock()
+        info.context.user = superuser
+        result = Query.resolve_all_clients(None, info, order_by=order_by)
+        assert [client.email for client in result.results] == expected
+
+    def test_client_package_summary_without_annotation(self):
+        superuser = UserFactory(is_superuser=True)
+        client = ClientFactory()
+        PackageFactory(client=client, arrival_date=date(2024, 4, 2))
+        data = execute_as(
+            superuser,
+            f"{{ client(id: {client.id}) {{ packageCount unconsolidatedPackageCount lastArrivalDate }} }}",
+        )
+        assert data["client"] == {"packageCount": 1, "unconsolidatedPackageCount": 1, "lastArrivalDate": "2024-04-02"}
+
     def test_resolve_client_as_superuser(self):
         superuser = UserFactory(is_superuser=True)
         client = ClientFactory()
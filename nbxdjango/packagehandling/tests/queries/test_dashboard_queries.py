@@ -14,8 +14,10 @@ from packagehandling.factories import (
     PackageFactory,
     UserFactory,
 )
+from packagehandling.graphql_schema import schema
 from packagehandling.models import Consolidate
 from packagehandling.schema.query_parts.dashboard_queries import (
+    MAX_RECENT_ITEMS,
     DashboardQueries,
     DashboardResolver,
 )
@@ -141,6 +143,24 @@ class TestDashboardQueries:
         assert pkg1.id in package_ids
         assert pkg2.id in package_ids
 
+    def test_recent_items_through_the_schema_and_limit_bounds(self):
+        user = UserFactory()
+        package = PackageFactory(client=ClientFactory(user=user))
+
+        result = schema.execute(
+            "{ dashboard { recentPackages(limit: 2) { id } recentConsolidations { id } } }",
+            context_value=Mock(user=user),
+        )
+
+        assert result.errors is None
+        assert result.data["dashboard"] == {"recentPackages": [{"id": str(package.pk)}], "recentConsolidations": []}
+        dashboard = DashboardResolver(user)
+        for limit in (0, -100000, MAX_RECENT_ITEMS + 1):
+            with pytest.raises(ValueError, match="Invalid limit"):
+                dashboard.resolve_recent_packages(limit=limit)
+            with pytest.raises(ValueError, match="Invalid limit"):
+                dashboard.resolve_recent_consolidations(limit=limit)
+
     def test_dashboard_recent_consolidations(self):
         """Test recent consolidations retrieval."""
         user = UserFactory()
@@ -1,9 +1,13 @@
+from io import StringIO
 from unittest.mock import Mock
 
 import pytest
 from django.core.exceptions import PermissionDenied
+from django.core.management import call_command
 from packagehandling.factories import ClientFactory, PackageFactory, UserFactory
+from packagehandling.models import Package
 from packagehandling.schema.queries import Query
+from packagehandling.schema.types import PackageConnection
 
 
 @pytest.mark.django_db
@@ -142,3 +146,31 @@ class TestResolveAllPackages:
         self.info.context.user = user
         with pytest.raises(PermissionDenied):
             Query.resolve_all_packages(None, self.info)
+
+    def test_weight_and_volume_ranges_ordering_and_stats(self):
+        self.info.context.user = UserFactory(is_superuser=True)
+        light = PackageFactory(weight=1, weight_unit="kg", length=10, width=10, height=10, dimension_unit="cm")
+        heavy = PackageFactory(weight=22, weight_unit="lb", length=1, width=1, height=1, dimension_unit="m")
+        unweighed = PackageFactory(weight=None, length=None)
+
+        result = Query.resolve_all_packages(None, self.info, min_weight_kg=5, max_volume_cm3=1_000_000)
+        assert [package.pk for package in result.results] == [heavy.pk]
+
+        result = Query.resolve_all_packages(None, self.info, order_by="-weight_kg")
+        assert [package.pk for package in result.results] == [heavy.pk, light.pk, unweighed.pk]
+
+        stats = PackageConnection.resolve_measurement_stats(result, self.info)
+        assert stats["weighed_count"] == 2
+        assert stats["total_weight_kg"] == pytest.approx(1 + 22 * 0.45359237)
+        assert stats["max_volume_cm3"] == pytest.approx(1_000_000)
+
+    def test_backfill_package_measurements(self):
+        package = PackageFactory(weight=3, weight_unit="lb", length=2, width=3, height=4, dimension_unit="mm")
+        Package.objects.update(weight_kg=None, length_cm=None, volume_cm3=None)
+
+        call_command("backfill_package_measurements", batch_size=1, stdout=StringIO())
+
+        package.refresh_from_db()
+        assert package.weight_kg == pytest.approx(3 * 0.45359237)
+        assert package.length_cm == pytest.approx(0.2)
+        assert package.volume_cm3 == pytest.approx(0.024)
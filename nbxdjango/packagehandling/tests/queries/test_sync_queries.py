@@ -0,0 +1,149 @@
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+from django.core.exceptions import PermissionDenied
+from django.utils import timezone
+from packagehandling.factories import (
+    ClientFactory,
+    ConsolidateFactory,
+    PackageFactory,
+    UserFactory,
+)
+from packagehandling.models import Consolidate, DeletionLog, OutboxEvent, Package
+from packagehandling.schema.mutation_parts.client_mutations import DeleteClient
+from packagehandling.schema.mutation_parts.consolidate_mutations import (
+    DeleteConsolidate,
+)
+from packagehandling.schema.mutation_parts.package_mutations import DeletePackage
+from packagehandling.schema.queries import Query
+
+
+@pytest.fixture(autouse=True)
+def no_settle_window(settings):
+    settings.SYNC_SETTLE_SECONDS = 0
+
+
+def _info(user):
+    info = Mock()
+    info.context.user = user
+    return info
+
+
+@pytest.mark.django_db
+class TestSyncQueries:
+    def test_returns_only_rows_changed_since(self):
+        client = ClientFactory()
+        old, changed = PackageFactory.create_batch(2, client=client)
+        since = timezone.now() - timedelta(hours=1)
+        Package.objects.filter(pk=old.pk).update(updated_at=since - timedelta(minutes=5))
+
+        result = Query.resolve_packages_updated_since(None, _info(client.user), since=since)
+
+        assert [package.pk for package in result.results] == [changed.pk]
+        assert result.has_more is False
+        assert result.next_cursor is None
+
+    def test_client_only_sees_own_rows(self):
+        client = ClientFactory()
+        PackageFactory(client=client)
+        PackageFactory(client=ClientFactory())
+
+        result = Query.resolve_packages_updated_since(None, _info(client.user))
+
+        assert len(result.results) == 1
+
+    def test_cursor_pages_through_changes_in_order(self):
+        client = ClientFactory()
+        packages = PackageFactory.create_batch(5, client=client)
+        base = timezone.now() - timedelta(minutes=10)
+        for offset, package in enumerate(packages):
+            # Two rows share each timestamp, so paging must tie-break on id.
+            Package.objects.filter(pk=package.pk).update(updated_at=base + timedelta(seconds=offset // 2))
+        info = _info(client.user)
+
+        seen = []
+        cursor = None
+        while True:
+            page = Query.resolve_packages_updated_since(None, info, cursor=cursor, limit=2)
+            seen += [package.pk for package in page.results]
+            if not page.has_more:
+                break
+            cursor = page.next_cursor
+
+        assert seen == [package.pk for package in packages]
+
+    def test_deleted_package_is_reported_as_tombstone(self, info_with_user_factory):
+        admin = UserFactory(is_superuser=True)
+        client = ClientFactory()
+        package = PackageFactory(client=client)
+        since = timezone.now() - timedelta(seconds=1)
+
+        DeletePackage().mutate(info_with_user_factory(admin), id=package.pk)
+        result = Query.resolve_packages_updated_since(None, _info(client.user), since=since)
+
+        assert result.results == []
+        assert result.deleted_ids == [package.pk]
+
+    def test_deleted_consolidate_is_reported_as_tombstone(self, info_with_user_factory):
+        admin = UserFactory(is_superuser=True)
+        client = ClientFactory()
+        consolidate = ConsolidateFactory(client=client)
+        since = timezone.now() - timedelta(seconds=1)
+
+        DeleteConsolidate().mutate(info_with_user_factory(admin), id=consolidate.pk)
+        result = Query.resolve_consolidates_updated_since(None, _info(admin), since=since, client_id=client.pk)
+
+        assert result.deleted_ids == [consolidate.pk]
+
+    def test_queryset_deletes_leave_tombstones_and_webhook_events(self):
+        client = ClientFactory()
+        package = PackageFactory(client=client)
+        consolidate = ConsolidateFactory(client=client)
+        since = timezone.now() - timedelta(seconds=1)
+
+        # As the admin's delete_selected action does.
+        Package.objects.filter(pk=package.pk).delete()
+        Consolidate.objects.filter(pk=consolidate.pk).delete()
+
+        assert Query.resolve_packages_updated_since(None, _info(client.user), since=since).deleted_ids == [package.pk]
+        deleted = Query.resolve_consolidates_updated_since(None, _info(client.user), since=since).deleted_ids
+        assert deleted == [consolidate.pk]
+        events = OutboxEvent.objects.filter(event_type__endswith=".deleted").values_list("event_type", "aggregate_id")
+        assert set(events) == {("package.deleted", package.pk), ("consolidate.deleted", consolidate.pk)}
+
+    def test_synced_at_trails_the_clock(self, settings):
+        settings.SYNC_SETTLE_SECONDS = 60
+        client = ClientFactory()
+        settled, recent = PackageFactory.create_batch(2, client=client)
+        Package.objects.filter(pk=settled.pk).update(updated_at=timezone.now() - timedelta(minutes=5))
+
+        result = Query.resolve_packages_updated_since(None, _info(client.user))
+
+        # The recent row may have been saved by a transaction committing after this read: it is left for next time.
+        assert [package.pk for package in result.results] == [settled.pk]
+        assert result.synced_at <= timezone.now() - timedelta(seconds=60)
+
+    def test_delete_client_logs_cascaded_rows(self, info_with_user_factory):
+        admin = UserFactory(is_superuser=True)
+        client = ClientFactory()
+        consolidate = ConsolidateFactory(client=client, status=Consolidate.Status.PENDING)
+        packages = PackageFactory.create_batch(2, client=client, consolidate=consolidate)
+
+        DeleteClient().mutate(info_with_user_factory(admin), id=client.pk)
+
+        logged = set(DeletionLog.objects.filter(client_id=client.pk).values_list("object_type", "object_id"))
+        assert logged == {
+            ("consolidate", consolidate.pk),
+            *(("package", package.pk) for package in packages),
+        }
+
+    def test_invalid_cursor_is_rejected(self):
+        client = ClientFactory()
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            Query.resolve_packages_updated_since(None, _info(client.user), cursor="not-a-cursor")
+
+    def test_user_without_client_is_denied(self):
+        with pytest.raises(PermissionDenied):
+            Query.resolve_consolidates_updated_since(None, _info(UserFactory()))
@@ -0,0 +1,173 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock
+
+import pytest
+from django.core.exceptions import PermissionDenied
+from django.core.management import call_command
+from django.utils import timezone
+from packagehandling.archive import archive_consolidations
+from packagehandling.deletion import start_client_deletion
+from packagehandling.factories import (
+    ClientFactory,
+    ConsolidateFactory,
+    PackageFactory,
+    UserFactory,
+)
+from packagehandling.graphql_schema import schema
+from packagehandling.models import (
+    ArchivedConsolidate,
+    ArchivedPackage,
+    Consolidate,
+    Package,
+)
+from packagehandling.schema.queries import Query
+
+pytestmark = pytest.mark.django_db
+
+
+def consolidation(client, status, days_ago, packages=2):
+    consolidate = ConsolidateFactory(client=client, status=status)
+    for _ in range(packages):
+        PackageFactory(client=client, consolidate=consolidate, weight=1, weight_unit="kg")
+    # updated_at is auto_now: age the row behind the model's back.
+    aged = timezone.now() - timedelta(days=days_ago)
+    Consolidate.objects.filter(pk=consolidate.pk).update(created_at=aged, updated_at=aged)
+    consolidate.refresh_from_db()
+    return consolidate
+
+
+@pytest.fixture
+def history():
+    client = ClientFactory()
+    old = consolidation(client, Consolidate.Status.DELIVERED, 400)
+    cancelled = consolidation(client, Consolidate.Status.CANCELLED, 200, packages=1)
+    recent = consolidation(client, Consolidate.Status.DELIVERED, 10)
+    still_open = consolidation(client, Consolidate.Status.IN_TRANSIT, 400)
+    loose = PackageFactory(client=client)
+    return client, old, cancelled, recent, still_open, loose
+
+
+def info_for(user):
+    info = Mock()
+    info.context.user = user
+    return info
+
+
+def test_archive_moves_closed_consolidations_with_their_packages(history, settings):
+    settings.ARCHIVE_AFTER_DAYS = 180
+    client, old, cancelled, recent, still_open, loose = history
+    client.refresh_from_db()
+    assert client.package_count == 8
+    old_packages = set(old.packages.values_list("pk", flat=True))
+
+    assert archive_consolidations(batch_size=1) == {"consolidates": 2, "packages": 3}
+
+    assert set(ArchivedConsolidate.objects.values_list("pk", flat=True)) == {old.pk, cancelled.pk}
+    assert set(Consolidate.objects.values_list("pk", flat=True)) == {recent.pk, still_open.pk}
+    archived = ArchivedConsolidate.objects.get(pk=old.pk)
+    assert (archived.package_count, archived.status, archived.client_id) == (2, "delivered", client.pk)
+    assert archived.created_at == old.created_at
+    assert set(archived.packages.values_list("pk", flat=True)) == old_packages
+    assert Package.objects.filter(client=client).count() == 5
+    client.refresh_from_db()
+    assert client.package_count == 5
+
+    # Nothing left to move on the next run.
+    assert archive_consolidations() == {"consolidates": 0, "packages": 0}
+
+
+def test_command_dry_run_only_counts(history):
+    out = StringIO()
+    call_command("archive_consolidations", "--dry-run", "--days", "100", stdout=out)
+
+    assert "Would archive 2 consolidations and 3 packages." in out.getvalue()
+    assert not ArchivedConsolidate.objects.exists()
+
+    call_command("archive_consolidations", "--days", "300", stdout=out)
+    assert "Archived 1 consolidations and 2 packages." in out.getvalue()
+
+
+def test_list_queries_include_the_archive_on_request(history):
+    client, old, cancelled, recent, still_open, loose = history
+    archive_consolidations(days=100)
+    info = info_for(client.user)
+
+    hot = Query.resolve_all_consolidates(None, info)
+    assert {consolidate.pk for consolidate in hot.results} == {recent.pk, still_open.pk}
+
+    # Newest first across both tables, paginated over the union.
+    everything = Query.resolve_all_consolidates(None, info, include_archived=True)
+    expected = sorted([old, cancelled, recent, still_open], key=lambda c: (c.created_at, c.pk), reverse=True)
+    assert everything.total_count == 4
+    assert [consolidate.pk for consolidate in everything.results] == [c.pk for c in expected]
+
+    packages = Query.resolve_all_packages(
+        None, info, not_in_consolidate=False, include_archived=True, order_by="created_at"
+    )
+    assert packages.total_count == 8
+    assert sum(isinstance(package, ArchivedPackage) for package in packages.results) == 3
+    assert [package.created_at for package in packages.results] == sorted(p.created_at for p in packages.results)
+    assert Query.resolve_all_packages(None, info, not_in_consolidate=False).total_count == 5
+
+
+def test_archived_rows_resolve_through_the_live_types(history):
+    client, old, *_ = history
+    archive_consolidations(days=100)
+    query = """
+        query ($id: ID) {
+            allConsolidates(includeArchived: true) {
+                results { id archived totals { packageCount } }
+            }
+            allPackages(notInConsolidate: false, includeArchived: true) {
+                totalCount
+                measurementStats { weighedCount totalWeightKg }
+                results { id archived }
+            }
+            hot: consolidateById(id: $id) { id }
+            archived: consolidateById(id: $id, includeArchived: true) { id archived packages { id } }
+        }
+    """
+    context = Mock(user=client.user)
+
+    result = schema.execute(query, variable_values={"id": old.pk}, context_value=context)
+
+    assert result.errors is None
+    data = result.data
+    flags = {row["id"]: row["archived"] for row in data["allConsolidates"]["results"]}
+    assert flags[str(old.pk)] is True and list(flags.values()).count(True) == 2
+    # Every package but the loose one is weighed; the stats cover both tables.
+    assert data["allPackages"]["totalCount"] == 8
+    assert data["allPackages"]["measurementStats"] == {"weighedCount": 7, "totalWeightKg": 7.0}
+    assert data["hot"] is None
+    assert data["archived"]["archived"] is True and len(data["archived"]["packages"]) == 2
+
+
+def test_search_archive(history):
+    client, old, cancelled, *_ = history
+    barcode = old.packages.first().barcode
+    archive_consolidations(days=100)
+    other = ClientFactory()
+
+    admin = info_for(UserFactory(is_superuser=True))
+    result = Query.resolve_search_archive(None, admin, search=barcode)
+    assert [consolidate.pk for consolidate in result.results] == [old.pk]
+    assert Query.resolve_search_archive(None, admin, search=client.email, client_id=other.pk).total_count == 0
+    assert Query.resolve_search_archive(None, info_for(client.user), search=client.email).total_count == 2
+    assert Query.resolve_search_archive(None, info_for(other.user), search=barcode).total_count == 0
+
+    with pytest.raises(ValueError):
+        Query.resolve_search_archive(None, admin, search="ab")
+    with pytest.raises(PermissionDenied):
+        Query.resolve_search_archive(None, info_for(UserFactory()), search=barcode)
+
+
+def test_client_deletion_clears_the_archive(history):
+    client, *_ = history
+    archive_consolidations(days=100)
+
+    job = start_client_deletion(client)
+
+    assert (job.packages_total, job.packages_deleted) == (8, 8)
+    assert (job.consolidates_total, job.consolidates_deleted) == (4, 4)
+    assert not ArchivedConsolidate.objects.exists() and not ArchivedPackage.objects.exists()
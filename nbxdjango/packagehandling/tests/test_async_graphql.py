@@ -0,0 +1,92 @@
+import json
+import threading
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+from graphql_jwt.middleware import JSONWebTokenMiddleware
+from graphql_jwt.shortcuts import get_token
+from packagehandling.factories import ClientFactory, PackageFactory, UserFactory
+from packagehandling.models import Package
+from packagehandling.views import AsyncGraphQLView
+
+DASHBOARD_QUERY = """
+{
+  me { email }
+  dashboard { stats { totalPackages } }
+  allPackages(notInConsolidate: false) { totalCount }
+}
+"""
+
+
+class SlowRootFields:
+    """Graphene middleware that makes every top-level field take a while and records its thread."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.threads = set()
+
+    def resolve(self, next, root, info, **kwargs):
+        if info.path.prev is None:
+            self.threads.add(threading.get_ident())
+            time.sleep(self.delay)
+        return next(root, info, **kwargs)
+
+
+def _post(view, query, user):
+    request = AsyncRequestFactory().post(
+        "/graphql",
+        data=json.dumps({"query": query}),
+        content_type="application/json",
+        headers={"Authorization": f"JWT {get_token(user)}"},
+    )
+    response = async_to_sync(view)(request)
+    return response.status_code, json.loads(response.content)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncGraphQLView:
+    def test_queries_match_sync_view(self):
+        client = ClientFactory()
+        PackageFactory.create_batch(3, client=client)
+        view = AsyncGraphQLView.as_view()
+
+        status, body = _post(view, DASHBOARD_QUERY, client.user)
+
+        assert status == 200
+        assert "errors" not in body
+        assert body["data"] == {
+            "me": {"email": client.user.email},
+            "dashboard": {"stats": {"totalPackages": 3}},
+            "allPackages": {"totalCount": 3},
+        }
+
+    def test_top_level_fields_resolve_concurrently(self):
+        client = ClientFactory()
+        slow = SlowRootFields(delay=0.3)
+        view = AsyncGraphQLView.as_view(middleware=[JSONWebTokenMiddleware(), slow])
+
+        started = time.perf_counter()
+        status, body = _post(view, DASHBOARD_QUERY, client.user)
+        elapsed = time.perf_counter() - started
+
+        assert status == 200
+        assert "errors" not in body
+        assert len(slow.threads) == 3
+        assert elapsed < 3 * 0.3
+
+    def test_mutations_run_through_the_sync_path(self):
+        admin = UserFactory(is_superuser=True)
+        client = ClientFactory()
+        view = AsyncGraphQLView.as_view()
+        mutation = (
+            'mutation { createPackage(barcode: "ASYNC-1", courier: "DHL", clientId: %d) { package { barcode } } }'
+            % client.pk
+        )
+
+        status, body = _post(view, mutation, admin)
+
+        assert status == 200
+        assert body["data"]["createPackage"]["package"]["barcode"] == "ASYNC-1"
+        assert Package.objects.filter(barcode="ASYNC-1").exists()
@@ -0,0 +1,56 @@
+"""
+Tests for the offline benchmark suite.
+"""
+
+import pytest
+from benchmarks import report, runner, scenarios
+from benchmarks.seed import seed
+
+
+def test_percentile_uses_nearest_rank():
+    samples = list(range(1, 101))
+    assert runner.percentile(samples, 50) == 50
+    assert runner.percentile(samples, 95) == 95
+    assert runner.percentile(samples, 99) == 99
+    assert runner.percentile([], 50) is None
+
+
+def test_select_rejects_unknown_scenario():
+    with pytest.raises(ValueError):
+        scenarios.select(["allPackages", "nope"])
+
+
+def test_compare_reports_relative_change():
+    baseline = {"results": [{"scenario": "dashboard", "mode": "test_client", "concurrency": 1, "p50_ms": 10.0}]}
+    candidate = {"results": [{"scenario": "dashboard", "mode": "test_client", "concurrency": 1, "p50_ms": 12.0}]}
+
+    rows = report.compare(baseline, candidate)
+
+    assert rows[0]["p50_ms"] == 20.0
+
+
+@pytest.mark.django_db
+def test_run_test_client_measures_every_scenario_without_errors():
+    seeded = seed("tiny")
+
+    results = runner.run_test_client(scenarios.select(), seeded, iterations=3, warmup=1)
+
+    assert {row["scenario"] for row in results} == set(scenarios.SCENARIOS)
+    for row in results:
+        assert row["errors"] == 0
+        assert row["iterations"] == 3
+        assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"]
+
+
+def test_summarize_queue_counts_missing_tasks_as_errors():
+    from benchmarks.queue import summarize_queue
+
+    row = summarize_queue(
+        "orm", 4, 20, 4, [(5.0, 20.0), (10.0, 20.0), (15.0, 20.0)], 1, enqueue_elapsed=0.5, elapsed=2.0
+    )
+
+    assert row["mode"] == "qcluster:orm"
+    assert row["errors"] == 2
+    assert row["p50_ms"] == 30.0
+    assert row["queued_p95_ms"] == 15.0
+    assert row["throughput_rps"] == 1.5
@@ -0,0 +1,183 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from packagehandling.counters import recompute_counters
+from packagehandling.factories import ClientFactory, ConsolidateFactory, PackageFactory
+from packagehandling.models import Client, Consolidate, Package
+from packagehandling.seeding import SeedEngine
+
+pytestmark = pytest.mark.django_db
+
+
+def counters(obj):
+    obj.refresh_from_db()
+    if isinstance(obj, Client):
+        return obj.package_count, obj.unconsolidated_count
+    return obj.package_count, round(obj.total_weight, 4), round(obj.total_service_price, 2)
+
+
+def test_creating_packages_counts_them_as_unconsolidated():
+    client = ClientFactory()
+    PackageFactory.create_batch(3, client=client)
+    assert counters(client) == (3, 3)
+
+
+def test_set_packages_moves_totals_into_the_consolidation():
+    client = ClientFactory()
+    heavy = PackageFactory(client=client, weight=2, weight_unit="kg", service_price=10)
+    light = PackageFactory(client=client, weight=500, weight_unit="g", service_price=2.5)
+    PackageFactory(client=client)
+    consolidate = ConsolidateFactory(client=client)
+
+    consolidate.set_packages([heavy, light])
+
+    assert (consolidate.package_count, consolidate.total_weight) == (2, 2.5)
+    assert counters(consolidate) == (2, 2.5, 12.5)
+    assert counters(client) == (3, 1)
+
+    consolidate.set_packages([light])
+    assert counters(consolidate) == (1, 0.5, 2.5)
+    assert counters(client) == (3, 2)
+
+
+def test_missing_weight_unit_counts_as_pounds():
+    client = ClientFactory()
+    consolidate = ConsolidateFactory(client=client)
+    PackageFactory(client=client, consolidate=consolidate, weight=10, weight_unit=None, service_price=None)
+    assert counters(consolidate) == (1, 4.5359, 0.0)
+
+
+def test_saving_a_package_moves_its_contribution():
+    client = ClientFactory()
+    consolidate = ConsolidateFactory(client=client)
+    package = PackageFactory(client=client, consolidate=consolidate, weight=1, weight_unit="kg", service_price=5)
+
+    package = Package.objects.get(pk=package.pk)
+    package.weight = 3
+    package.service_price = 7
+    package.save()
+    assert counters(consolidate) == (1, 3.0, 7.0)
+
+    package.consolidate = None
+    package.save()
+    assert counters(consolidate) == (0, 0.0, 0.0)
+    assert counters(client) == (1, 1)
+
+    other = ClientFactory()
+    package.client = other
+    package.save()
+    assert counters(client) == (0, 0)
+    assert counters(other) == (1, 1)
+
+
+def test_saving_a_package_loaded_with_deferred_fields():
+    client = ClientFactory()
+    consolidate = ConsolidateFactory(client=client)
+    package = PackageFactory(client=client, consolidate=consolidate, weight=1, weight_unit="kg", service_price=5)
+
+    package = Package.objects.only("id", "description").get(pk=package.pk)
+    package.weight = 4
+    package.save()
+    assert counters(consolidate) == (1, 4.0, 5.0)
+
+
+def test_deleting_a_package_and_a_consolidation():
+    client = ClientFactory()
+    consolidate = ConsolidateFactory(client=client)
+    kept, deleted = PackageFactory.create_batch(2, client=client, consolidate=consolidate, service_price=1)
+
+    deleted.delete()
+    assert counters(consolidate)[0] == 1
+    assert counters(client) == (1, 0)
+
+    consolidate.delete()
+    assert counters(client) == (1, 1)
+
+
+def test_queryset_deletes_take_packages_off_the_counters():
+    client = ClientFactory()
+    consolidate = ConsolidateFactory(client=client)
+    PackageFactory(client=client, consolidate=consolidate, weight=2, weight_unit="kg", service_price=1)
+    loose = PackageFactory(client=client)
+
+    # As the admin's delete_selected action does.
+    Package.objects.filter(pk__in=[loose.pk, *consolidate.packages.values_list("pk", flat=True)]).delete()
+
+    assert counters(client) == (0, 0)
+    assert counters(consolidate) == (0, 0.0, 0.0)
+
+
+def test_saving_a_stale_consolidation_keeps_the_counters():
+    client = ClientFactory()
+    consolidate = ConsolidateFactory(client=client)
+    stale = Consolidate.objects.get(pk=consolidate.pk)
+    PackageFactory(client=client, consolidate=consolidate, service_price=3)
+
+    stale.comment = "Updated"
+    stale.save()
+    stale.client.save()
+
+    assert counters(consolidate)[0] == 1
+    assert counters(client) == (1, 0)
+    assert Consolidate.objects.get(pk=consolidate.pk).comment == "Updated"
+
+
+def test_recompute_counters_repairs_drift():
+    client = ClientFactory()
+    consolidate = ConsolidateFactory(client=client)
+    PackageFactory(client=client, consolidate=consolidate, weight=1, weight_unit="kg", service_price=4)
+    PackageFactory(client=client)
+    ClientFactory()
+    Client.objects.update(package_count=9, unconsolidated_count=9)
+    Consolidate.objects.update(total_weight=0)
+
+    assert recompute_counters(dry_run=True) == {"clients": 2, "consolidates": 1}
+    assert counters(client) == (9, 9)
+
+    assert recompute_counters() == {"clients": 2, "consolidates": 1}
+    assert counters(client) == (2, 1)
+    assert counters(consolidate) == (1, 1.0, 4.0)
+    assert recompute_counters() == {"clients": 0, "consolidates": 0}
+
+
+def test_counter_changes_bump_updated_at():
+    client = ClientFactory()
+    consolidate = ConsolidateFactory(client=client)
+    past = timezone.now() - timedelta(days=1)
+    Client.objects.update(updated_at=past)
+    Consolidate.objects.update(updated_at=past)
+
+    # The sync feeds resend rows by updated_at, so they must pick up new counters.
+    PackageFactory(client=client, consolidate=consolidate)
+    assert Client.objects.get(pk=client.pk).updated_at > past
+    assert Consolidate.objects.get(pk=consolidate.pk).updated_at > past
+
+    Client.objects.update(package_count=9, updated_at=past)
+    recompute_counters()
+    assert Client.objects.get(pk=client.pk).updated_at > past
+
+
+def test_repair_counters_command():
+    clients = ClientFactory.create_batch(3)
+    for client in clients:
+        PackageFactory(client=client)
+    Client.objects.update(package_count=0)
+
+    out = StringIO()
+    call_command("repair_counters", "--batch-size", "2", stdout=out)
+
+    assert "Repaired counters on 3 clients and 0 consolidations." in out.getvalue()
+    assert [counters(client) for client in clients] == [(1, 1)] * 3
+
+
+def test_seed_engine_recomputes_counters():
+    engine = SeedEngine(batch_size=10)
+    clients = engine.create_clients(2)
+    consolidates = engine.create_consolidates(clients, 3)
+    engine.create_packages(30, clients, consolidates)
+
+    assert recompute_counters(dry_run=True) == {"clients": 0, "consolidates": 0}
+    assert sum(Client.objects.values_list("package_count", flat=True)) == 30
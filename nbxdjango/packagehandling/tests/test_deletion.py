@@ -0,0 +1,131 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from django.core.exceptions import PermissionDenied
+from packagehandling.deletion import run_client_deletion, start_client_deletion
+from packagehandling.factories import (
+    ClientFactory,
+    ConsolidateFactory,
+    PackageFactory,
+    UserFactory,
+)
+from packagehandling.models import (
+    Client,
+    ClientDeletionJob,
+    Consolidate,
+    ConsolidateStatusEvent,
+    CustomUser,
+    DeletionLog,
+    OutboxEvent,
+    Package,
+)
+from packagehandling.schema.mutations import DeleteClient
+from packagehandling.schema.queries import Query
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client_with_history():
+    client = ClientFactory()
+    for consolidate in ConsolidateFactory.create_batch(3, client=client, status=Consolidate.Status.PENDING):
+        PackageFactory.create_batch(4, client=client, consolidate=consolidate)
+    PackageFactory.create_batch(5, client=client)
+    return client
+
+
+@pytest.fixture
+def other_client():
+    other = ClientFactory()
+    PackageFactory(client=other, consolidate=ConsolidateFactory(client=other))
+    return other
+
+
+def test_inline_deletion_reports_progress_and_tombstones(client_with_history, other_client, settings):
+    settings.CLIENT_DELETE_CHUNK_SIZE = 5
+    user = client_with_history.user
+
+    job = start_client_deletion(client_with_history)
+
+    assert (job.status, job.progress) == (ClientDeletionJob.Status.COMPLETED, 1.0)
+    assert (job.packages_total, job.packages_deleted) == (17, 17)
+    assert (job.consolidates_total, job.consolidates_deleted) == (3, 3)
+    assert not Client.objects.filter(pk=client_with_history.pk).exists()
+    assert not Package.objects.filter(client_id=client_with_history.pk).exists()
+    user.refresh_from_db()
+    assert user.is_active is False
+    assert DeletionLog.objects.filter(client_id=client_with_history.pk).count() == 20
+    assert OutboxEvent.objects.filter(client_id=client_with_history.pk, event_type__endswith=".deleted").count() == 20
+    # Another client's rows are untouched.
+    assert Package.objects.filter(client=other_client).count() == 1
+    assert Consolidate.objects.filter(client=other_client).count() == 1
+    # So is the status history: only the other client's consolidation has any left.
+    other_consolidate = Consolidate.objects.get(client=other_client)
+    assert list(ConsolidateStatusEvent.objects.values_list("consolidate_id", flat=True)) == [other_consolidate.pk]
+
+
+def test_query_count_grows_per_chunk_not_per_row(client_with_history, settings, django_assert_max_num_queries):
+    settings.CLIENT_DELETE_INLINE_LIMIT = 0
+    job = start_client_deletion(client_with_history)
+    assert job.status == ClientDeletionJob.Status.PENDING
+
+    # 17 packages and 3 consolidations in chunks of 10: 2 + 1 chunks of a handful of queries each,
+    # plus one probe per (here empty) archive table.
+    with django_assert_max_num_queries(45):
+        run_client_deletion(job.pk, chunk_size=10)
+
+    assert not Package.objects.filter(client_id=client_with_history.pk).exists()
+
+
+def test_large_client_is_deleted_in_the_background(client_with_history, settings, django_capture_on_commit_callbacks):
+    settings.CLIENT_DELETE_INLINE_LIMIT = 10
+    user = client_with_history.user
+
+    with patch("packagehandling.deletion.lanes.enqueue") as enqueue:
+        with django_capture_on_commit_callbacks(execute=True):
+            job = start_client_deletion(client_with_history, delete_user=True)
+        # A second request while the job is pending returns the same job.
+        assert start_client_deletion(client_with_history, delete_user=True) == job
+
+    enqueue.assert_called_once_with("packagehandling.deletion.run_client_deletion", job.pk)
+    user.refresh_from_db()
+    assert user.is_active is False and Client.objects.filter(pk=client_with_history.pk).exists()
+
+    run_client_deletion(job.pk)
+
+    assert not CustomUser.objects.filter(pk=user.pk).exists()
+    assert not Client.objects.filter(pk=client_with_history.pk).exists()
+
+
+def test_failed_job_can_be_resumed(client_with_history):
+    job = ClientDeletionJob.objects.create(client_id=client_with_history.pk, packages_total=17, consolidates_total=3)
+
+    with patch("packagehandling.deletion.outbox.record_deletions", side_effect=[None, RuntimeError("boom")]):
+        with pytest.raises(RuntimeError):
+            run_client_deletion(job.pk, chunk_size=10)
+
+    job.refresh_from_db()
+    assert (job.status, job.error, job.packages_deleted) == (ClientDeletionJob.Status.FAILED, "boom", 10)
+
+    job = run_client_deletion(job.pk, chunk_size=10)
+    assert (job.status, job.packages_deleted, job.error) == (ClientDeletionJob.Status.COMPLETED, 17, "")
+
+
+def test_delete_client_mutation_and_job_query(client_with_history, settings, info_with_user_factory):
+    settings.CLIENT_DELETE_INLINE_LIMIT = 0
+    admin = UserFactory(is_superuser=True)
+
+    with patch("packagehandling.deletion.lanes.enqueue"):
+        result = DeleteClient().mutate(info_with_user_factory(admin), id=client_with_history.pk)
+
+    assert result.ok is True and "started" in result.message
+    assert result.job.requested_by == admin
+
+    info = Mock()
+    info.context.user = admin
+    job = Query.resolve_client_deletion_job(None, info, id=result.job.pk)
+    assert (job.status, job.progress) == (ClientDeletionJob.Status.PENDING, 0.0)
+
+    info.context.user = client_with_history.user
+    with pytest.raises(PermissionDenied):
+        Query.resolve_client_deletion_job(None, info, id=result.job.pk)
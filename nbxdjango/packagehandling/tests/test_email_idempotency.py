@@ -0,0 +1,127 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core import mail
+from django.db import transaction
+from django.utils import timezone
+from django_q.models import OrmQ
+from django_q.signing import SignedPackage
+from packagehandling.factories import ClientFactory, ConsolidateFactory
+from packagehandling.models import Consolidate, EmailIdempotencyKey
+from packagehandling.utils import (
+    deliver_email,
+    prune_email_idempotency_keys,
+    send_consolidation_notification_email,
+    send_email,
+)
+
+IDEMPOTENCY = {"template": "consolidate_created", "consolidate_id": 7, "status": "pending"}
+
+
+def _send(recipient="client@example.com", **idempotency):
+    return send_email("Subject", "Body", [recipient], idempotency={**IDEMPOTENCY, **idempotency})
+
+
+def _queued():
+    return [SignedPackage.loads(row.payload) for row in OrmQ.objects.all()]
+
+
+@pytest.mark.django_db
+class TestEnqueueDeduplication:
+    def test_repeat_is_not_enqueued(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            assert _send() is True
+            assert _send("CLIENT@example.com ") is False
+
+        (task,) = _queued()
+        assert task["func"] == "packagehandling.utils.deliver_email"
+        assert task["args"] == (EmailIdempotencyKey.objects.get().key,)
+
+    def test_new_status_or_recipient_is_a_new_email(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            _send()
+            _send(status="in_transit")
+            _send("other@example.com")
+
+        assert len(_queued()) == 3
+
+    def test_expired_reservation_allows_resend(self, django_capture_on_commit_callbacks):
+        _send()
+        EmailIdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert _send() is True
+
+        assert EmailIdempotencyKey.objects.count() == 1
+
+    def test_rolled_back_request_releases_the_key(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    _send()
+                    raise RuntimeError
+
+        assert callbacks == []
+        assert not EmailIdempotencyKey.objects.exists()
+        assert _send() is True
+
+    def test_consolidation_notification_is_sent_once_per_status(self, django_capture_on_commit_callbacks):
+        consolidate = ConsolidateFactory(client=ClientFactory(), status=Consolidate.Status.PENDING)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            send_consolidation_notification_email(consolidate)
+            send_consolidation_notification_email(consolidate)
+            consolidate.status = Consolidate.Status.IN_TRANSIT
+            send_consolidation_notification_email(consolidate)
+
+        assert len(_queued()) == 2
+
+
+@pytest.mark.django_db
+class TestDeliverEmail:
+    def _reserve(self):
+        return EmailIdempotencyKey.reserve(recipient_list=["client@example.com"], **IDEMPOTENCY)
+
+    def test_sends_once_per_key(self):
+        reservation = self._reserve()
+        message = {"subject": "Hi", "message": "Body", "from_email": None, "recipient_list": ["client@example.com"]}
+
+        assert deliver_email(reservation.key, **message) is True
+        assert deliver_email(reservation.key, **message) is False
+
+        assert len(mail.outbox) == 1
+        reservation.refresh_from_db()
+        assert reservation.sent_at is not None
+
+    def test_failed_send_releases_claim_for_retry(self):
+        reservation = self._reserve()
+
+        with patch("packagehandling.utils.send_mail", side_effect=ConnectionError):
+            with pytest.raises(ConnectionError):
+                deliver_email(reservation.key, subject="Hi", message="Body", recipient_list=["client@example.com"])
+
+        reservation.refresh_from_db()
+        assert reservation.sent_at is None
+
+    def test_missing_key_is_skipped_with_a_warning(self, caplog):
+        reservation = self._reserve()
+        reservation.delete()
+
+        assert (
+            deliver_email(reservation.key, subject="Hi", message="Body", recipient_list=["client@example.com"]) is False
+        )
+
+        assert mail.outbox == []
+        assert [record.levelname for record in caplog.records] == ["WARNING"]
+        assert "expired before delivery" in caplog.records[0].getMessage()
+
+
+@pytest.mark.django_db
+def test_prune_deletes_long_expired_keys():
+    EmailIdempotencyKey.reserve(recipient_list=["a@example.com"], **IDEMPOTENCY)
+    EmailIdempotencyKey.reserve(recipient_list=["b@example.com"], **IDEMPOTENCY)
+    EmailIdempotencyKey.objects.filter(recipients="a@example.com").update(expires_at=timezone.now() - timedelta(days=2))
+
+    assert prune_email_idempotency_keys() == 1
+    assert list(EmailIdempotencyKey.objects.values_list("recipients", flat=True)) == ["b@example.com"]
@@ -0,0 +1,26 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from packagehandling.factories import ClientFactory, PackageFactory
+from packagehandling.management.commands.explain_hot_queries import hot_queries
+from packagehandling.models import Consolidate, Package
+
+
+def test_every_hot_query_names_a_declared_index():
+    declared = {index.name for model in (Package, Consolidate) for index in model._meta.indexes}
+
+    for name, index_name, queryset in hot_queries(client_id=1):
+        assert index_name in declared, name
+
+
+@pytest.mark.django_db
+def test_command_reports_each_hot_query():
+    PackageFactory.create_batch(3, client=ClientFactory())
+    out = StringIO()
+
+    call_command("explain_hot_queries", stdout=out)
+
+    output = out.getvalue()
+    for name, index_name, queryset in hot_queries(client_id=1):
+        assert f"{name}: {index_name}" in output
@@ -0,0 +1,59 @@
+import runpy
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from django.db import OperationalError
+
+GUNICORN_CONF = Path(__file__).resolve().parents[2] / "gunicorn.conf.py"
+
+
+@pytest.mark.django_db
+def test_health_check_reports_database(client):
+    response = client.get("/health/")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "healthy", "database": "ok"}
+
+
+@pytest.mark.django_db
+def test_health_check_fails_when_database_is_down(client):
+    with patch("packagehandling.views.connection.cursor", side_effect=OperationalError("down")):
+        response = client.get("/health/")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "unhealthy"
+
+
+def test_liveness_check_does_not_touch_database(client):
+    response = client.get("/health/live/")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "worker_class, threads",
+    [("sync", 1), ("gthread", 4), ("gevent", 1)],
+)
+def test_gunicorn_profile_defaults(monkeypatch, worker_class, threads):
+    for name in ("WEB_CONCURRENCY", "GUNICORN_THREADS", "PORT"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("GUNICORN_WORKER_CLASS", worker_class)
+
+    config = runpy.run_path(str(GUNICORN_CONF))
+
+    assert config["worker_class"] == worker_class
+    assert config["threads"] == threads
+    assert config["workers"] >= 1
+    assert config["bind"] == "0.0.0.0:8000"
+
+
+def test_gunicorn_profile_reads_environment(monkeypatch):
+    monkeypatch.setenv("GUNICORN_WORKER_CLASS", "gthread")
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    monkeypatch.setenv("GUNICORN_THREADS", "8")
+    monkeypatch.setenv("PORT", "5000")
+
+    config = runpy.run_path(str(GUNICORN_CONF))
+
+    assert (config["workers"], config["threads"], config["bind"]) == (3, 8, "0.0.0.0:5000")
@@ -0,0 +1,96 @@
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+from django_q.models import OrmQ
+from django_q.signing import SignedPackage
+from packagehandling import lanes
+from packagehandling.factories import ClientFactory, ConsolidateFactory, PackageFactory
+from packagehandling.models import TaskMetric
+from packagehandling.queue_metrics import queue_stats, record_task_metric
+from packagehandling.utils import send_consolidation_notification_email, send_email
+
+
+def _queued_tasks(key):
+    return [SignedPackage.loads(row.payload) for row in OrmQ.objects.filter(key=key)]
+
+
+@pytest.mark.django_db
+class TestLaneRouting:
+    def test_enabled_lane_gets_its_own_queue(self, settings):
+        settings.Q_LANES = ["transactional"]
+
+        send_email("Reset", "link", ["user@example.com"], lane=lanes.TRANSACTIONAL)
+
+        (task,) = _queued_tasks("transactional")
+        assert task["func"] == "django.core.mail.send_mail"
+        assert task["kwargs"]["recipient_list"] == ["user@example.com"]
+
+    def test_lane_without_cluster_falls_back_to_default_queue(self, settings):
+        settings.Q_LANES = []
+
+        send_email("Reset", "link", ["user@example.com"], lane=lanes.TRANSACTIONAL)
+
+        assert not OrmQ.objects.filter(key="transactional").exists()
+        assert len(_queued_tasks(settings.Q_CLUSTER["name"])) == 1
+
+    def test_consolidation_notification_uses_bulk_lane(self, settings, django_capture_on_commit_callbacks):
+        settings.Q_LANES = ["transactional", "bulk"]
+        consolidate = ConsolidateFactory(client=ClientFactory())
+        PackageFactory(client=consolidate.client, consolidate=consolidate)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            send_consolidation_notification_email(consolidate)
+
+        assert len(_queued_tasks("bulk")) == 1
+
+    def test_unknown_lane_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown task lane"):
+            lanes.cluster_for("express")
+
+
+class TestBulkThrottle:
+    def test_paces_consecutive_bulk_tasks(self, settings):
+        settings.BULK_LANE_MIN_INTERVAL_SECONDS = 0.2
+        task = {"cluster": lanes.BULK}
+
+        with patch("packagehandling.lanes.time.sleep") as sleep:
+            lanes.throttle_bulk_lane(sender="django_q", func=None, task=task)
+            lanes.throttle_bulk_lane(sender="django_q", func=None, task=task)
+
+        assert sleep.call_count >= 1
+        assert 0 < sleep.call_args[0][0] <= 0.2
+
+    def test_other_lanes_are_not_paced(self, settings):
+        settings.BULK_LANE_MIN_INTERVAL_SECONDS = 60
+        lanes._last_bulk_task = time.monotonic()
+
+        with patch("packagehandling.lanes.time.sleep") as sleep:
+            lanes.throttle_bulk_lane(sender="django_q", func=None, task={"cluster": lanes.TRANSACTIONAL})
+            lanes.throttle_bulk_lane(sender="django_q", func=None, task={})
+
+        sleep.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_queue_stats_reports_each_lane(settings):
+    settings.Q_LANES = ["transactional", "bulk"]
+    now = timezone.now()
+    for cluster, queued_ms in ((None, 10), ("transactional", 20), ("bulk", 3000), ("bulk", 5000)):
+        task = {"id": "t", "func": "django.core.mail.send_mail", "started": now, "success": True, "cluster": cluster}
+        task["execution_started"] = now + timedelta(milliseconds=queued_ms)
+        task["stopped"] = task["execution_started"] + timedelta(milliseconds=100)
+        record_task_metric(sender="django_q", task=task)
+    lanes.enqueue("math.floor", 1.5, lane=lanes.BULK)
+
+    stats = {row["lane"]: row for row in queue_stats()["lanes"]}
+
+    assert set(TaskMetric.objects.values_list("lane", flat=True)) == {"default", "transactional", "bulk"}
+    assert stats["transactional"]["tasks"] == 1
+    assert stats["transactional"]["avg_queued_ms"] == pytest.approx(20)
+    assert stats["bulk"]["tasks"] == 2
+    assert stats["bulk"]["p95_queued_ms"] == pytest.approx(5000)
+    assert stats["bulk"]["queue_depth"] == 1
+    assert stats["default"]["queue_depth"] == 0
@@ -0,0 +1,246 @@
+import hashlib
+import hmac
+import json
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+from django_q.models import Schedule
+from packagehandling import outbox
+from packagehandling.factories import (
+    ClientFactory,
+    ConsolidateFactory,
+    PackageFactory,
+    UserFactory,
+)
+from packagehandling.models import Consolidate, OutboxEvent, WebhookEndpoint
+from packagehandling.outbox import _claim, dispatch_outbox, prune_outbox
+from packagehandling.schema.mutation_parts.package_mutations import DeletePackage
+
+
+class WebhookStub:
+    """Local HTTP endpoint recording the batches it receives."""
+
+    def __init__(self, status=200, delay=0):
+        self.status = status
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                with stub.lock:
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                time.sleep(stub.delay)
+                with stub.lock:
+                    stub.in_flight -= 1
+                    stub.requests.append((dict(self.headers), body))
+                self.send_response(stub.status)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def events(self):
+        return [event for _, body in self.requests for event in json.loads(body)["events"]]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def webhook_stub():
+    stubs = []
+
+    def factory(**kwargs):
+        stub = WebhookStub(**kwargs)
+        stubs.append(stub)
+        return stub
+
+    yield factory
+    for stub in stubs:
+        stub.close()
+
+
+@pytest.fixture(autouse=True)
+def settled_outbox(settings):
+    settings.OUTBOX_SETTLE_SECONDS = 0
+
+
+@pytest.mark.django_db
+class TestOutboxEvents:
+    def test_package_changes_write_events(self):
+        package = PackageFactory()
+        package.description = "updated"
+        package.save()
+
+        assert list(OutboxEvent.objects.order_by("pk").values_list("event_type", flat=True)) == [
+            "package.created",
+            "package.updated",
+        ]
+
+    def test_events_roll_back_with_the_change(self):
+        client = ClientFactory()
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                PackageFactory(client=client)
+                raise RuntimeError
+
+        assert not OutboxEvent.objects.filter(event_type="package.created").exists()
+
+    def test_status_transition_records_previous_status(self):
+        consolidate = ConsolidateFactory(status=Consolidate.Status.PENDING)
+        consolidate = Consolidate.objects.get(pk=consolidate.pk)
+
+        consolidate.status = Consolidate.Status.PROCESSING
+        consolidate.save()
+
+        event = OutboxEvent.objects.filter(event_type="consolidate.status_changed").get()
+        assert event.payload["previous_status"] == "pending"
+        assert event.payload["status"] == "processing"
+
+    def test_delete_mutation_records_deleted_event(self, info_with_user_factory):
+        package = PackageFactory()
+
+        DeletePackage().mutate(info_with_user_factory(UserFactory(is_superuser=True)), id=package.pk)
+
+        event = OutboxEvent.objects.get(event_type="package.deleted")
+        assert event.aggregate_id == package.pk
+        assert event.client_id == package.client_id
+
+
+@pytest.mark.django_db
+class TestDispatchOutbox:
+    def test_delivers_signed_batches_and_advances_cursor(self, webhook_stub):
+        stub = webhook_stub()
+        endpoint = WebhookEndpoint.objects.create(name="partner", url=stub.url, secret="s3cret")
+        PackageFactory.create_batch(3)
+
+        summary = dispatch_outbox(batch_size=2)
+
+        endpoint.refresh_from_db()
+        assert summary["delivered"] == 3
+        assert len(stub.requests) == 2
+        assert [event["type"] for event in stub.events()] == ["package.created"] * 3
+        headers, body = stub.requests[0]
+        expected = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+        assert headers["X-Webhook-Signature"] == f"sha256={expected}"
+        assert endpoint.last_event_id == OutboxEvent.objects.latest("pk").pk
+        assert dispatch_outbox()["delivered"] == 0
+
+    def test_failing_endpoint_backs_off_without_blocking_others(self, webhook_stub):
+        healthy = webhook_stub()
+        broken = webhook_stub(status=500)
+        WebhookEndpoint.objects.create(name="healthy", url=healthy.url)
+        failing = WebhookEndpoint.objects.create(name="broken", url=broken.url)
+        PackageFactory()
+
+        dispatch_outbox()
+        dispatch_outbox()
+
+        failing.refresh_from_db()
+        assert len(healthy.events()) == 1
+        assert len(broken.requests) == 1  # second run is inside the backoff window
+        assert failing.failures == 1
+        assert failing.last_event_id == 0
+        assert failing.next_attempt_at is not None
+        assert failing.last_error == "HTTP 500"
+
+    def test_per_endpoint_concurrency_limit(self, webhook_stub):
+        stub = webhook_stub(delay=0.2)
+        WebhookEndpoint.objects.create(name="partner", url=stub.url, max_concurrency=2)
+        PackageFactory.create_batch(4)
+
+        dispatch_outbox(batch_size=1)
+
+        assert stub.max_in_flight == 2
+        assert len(stub.requests) == 2  # batch_size x max_concurrency events per run
+
+    def test_claim_rereads_the_cursor_moved_by_another_run(self, webhook_stub):
+        stub = webhook_stub()
+        listed = WebhookEndpoint.objects.create(name="partner", url=stub.url)
+        PackageFactory.create_batch(2)
+        # Another run delivers everything and releases the lease after this one listed the endpoint.
+        WebhookEndpoint.objects.filter(pk=listed.pk).update(last_event_id=OutboxEvent.objects.latest("pk").pk)
+
+        claimed = _claim(listed, timezone.now())
+
+        assert claimed.last_event_id == OutboxEvent.objects.latest("pk").pk
+        assert _claim(listed, timezone.now()) is None
+
+    def test_lease_covers_requests_queued_for_the_workers(self, webhook_stub, settings, monkeypatch):
+        settings.WEBHOOK_DISPATCH_WORKERS = 1
+        settings.WEBHOOK_TIMEOUT_SECONDS = 10
+        stub = webhook_stub()
+        endpoint = WebhookEndpoint.objects.create(name="partner", url=stub.url, max_concurrency=4)
+        PackageFactory.create_batch(4)
+        leases = []
+        record_outcome = outbox._record_outcome
+
+        def recording_outcome(endpoint, *args):
+            leases.append(WebhookEndpoint.objects.values_list("locked_until", flat=True).get(pk=endpoint.pk))
+            return record_outcome(endpoint, *args)
+
+        monkeypatch.setattr(outbox, "_record_outcome", recording_outcome)
+        started = timezone.now()
+        assert dispatch_outbox(batch_size=1)["delivered"] == 4
+
+        # Four requests one after another on a single worker: four rounds plus the margin.
+        assert leases[0] >= started + timedelta(seconds=60)
+        endpoint.refresh_from_db()
+        assert endpoint.locked_until is None
+
+    def test_endpoint_only_receives_subscribed_event_types(self, webhook_stub):
+        stub = webhook_stub()
+        endpoint = WebhookEndpoint.objects.create(
+            name="status", url=stub.url, event_types=["consolidate.status_changed"]
+        )
+        consolidate = Consolidate.objects.get(pk=ConsolidateFactory(status=Consolidate.Status.PENDING).pk)
+        PackageFactory(client=consolidate.client)
+        consolidate.status = Consolidate.Status.PROCESSING
+        consolidate.save()
+
+        dispatch_outbox()
+
+        endpoint.refresh_from_db()
+        assert [event["type"] for event in stub.events()] == ["consolidate.status_changed"]
+        assert endpoint.last_event_id == OutboxEvent.objects.latest("pk").pk
+
+    def test_prunes_only_consumed_events_past_retention(self, webhook_stub, settings):
+        settings.OUTBOX_RETENTION_DAYS = 1
+        stub = webhook_stub()
+        endpoint = WebhookEndpoint.objects.create(name="partner", url=stub.url)
+        consumed, pending = PackageFactory.create_batch(2)
+        OutboxEvent.objects.update(created_at=timezone.now() - timedelta(days=2))
+        WebhookEndpoint.objects.filter(pk=endpoint.pk).update(
+            last_event_id=OutboxEvent.objects.get(aggregate_id=consumed.pk).pk
+        )
+
+        assert prune_outbox() == 1
+        assert list(OutboxEvent.objects.values_list("aggregate_id", flat=True)) == [pending.pk]
+
+
+@pytest.mark.django_db
+def test_setup_schedules_is_idempotent():
+    call_command("setup_schedules", stdout=StringIO())
+    call_command("setup_schedules", stdout=StringIO())
+
+    schedule = Schedule.objects.get(name="dispatch_webhooks")
+    assert schedule.func == "packagehandling.outbox.dispatch_outbox"
+    assert schedule.schedule_type == Schedule.MINUTES
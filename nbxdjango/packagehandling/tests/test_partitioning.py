@@ -0,0 +1,99 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import Mock
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.utils import timezone
+from packagehandling.archive import archivable
+from packagehandling.factories import ClientFactory, ConsolidateFactory, PackageFactory
+from packagehandling.models import Consolidate, Package
+from packagehandling.partitioning import (
+    add_months,
+    create_partition_sql,
+    created_between,
+    ensure_partitions,
+    month_ranges,
+    partition_name,
+)
+from packagehandling.schema.queries import Query
+
+pytestmark = pytest.mark.django_db
+
+
+def test_month_ranges_cross_year_boundaries():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert month_ranges(date(2025, 11, 20), date(2026, 1, 3)) == [
+        (date(2025, 11, 1), date(2025, 12, 1)),
+        (date(2025, 12, 1), date(2026, 1, 1)),
+        (date(2026, 1, 1), date(2026, 2, 1)),
+    ]
+    assert partition_name("packagehandling_package", date(2026, 1, 1)) == "packagehandling_package_p202601"
+
+
+def test_create_partition_sql():
+    sql = create_partition_sql(connection, "packagehandling_package", date(2026, 1, 1), date(2026, 2, 1))
+    assert sql == (
+        'CREATE TABLE IF NOT EXISTS "packagehandling_package_p202601" PARTITION OF "packagehandling_package" '
+        "FOR VALUES FROM ('2026-01-01 00:00:00+00') TO ('2026-02-01 00:00:00+00')"
+    )
+
+
+def test_partitioning_is_a_no_op_off_postgresql(settings):
+    settings.DB_PARTITIONING = True
+    assert ensure_partitions() == []
+
+    out = StringIO()
+    call_command("partition_tables", stdout=out)
+    assert "not PostgreSQL" in out.getvalue()
+    with pytest.raises(CommandError):
+        call_command("partition_tables", "--convert", stdout=out)
+
+
+def test_barcode_is_checked_when_the_table_cannot_enforce_it(settings):
+    package = PackageFactory()
+    settings.DB_PARTITIONING = True
+
+    with pytest.raises(ValidationError):
+        PackageFactory(barcode=package.barcode)
+    package.description = "edited"
+    package.save()  # an unchanged barcode isn't its own duplicate
+
+    other = Package.objects.get(pk=PackageFactory().pk)
+    other.barcode = package.barcode
+    with pytest.raises(ValidationError):
+        other.save()
+
+
+def test_created_range_is_a_plain_created_at_bound():
+    today = timezone.localdate()
+    queryset = created_between(Package.objects.all(), today - timedelta(days=7), today)
+    sql = str(queryset.query)
+
+    assert sql.count('"packagehandling_package"."created_at" >=') == 1
+    assert sql.count('"packagehandling_package"."created_at" <') == 1
+    assert "django_datetime_cast_date" not in sql
+    assert '"created_at" <' in str(archivable().query)
+
+
+def test_list_queries_filter_on_creation_dates():
+    client = ClientFactory()
+    old_package, new_package = PackageFactory.create_batch(2, client=client)
+    old_consolidate, new_consolidate = ConsolidateFactory.create_batch(2, client=client)
+    last_month = timezone.now() - timedelta(days=40)
+    Package.objects.filter(pk=old_package.pk).update(created_at=last_month)
+    Consolidate.objects.filter(pk=old_consolidate.pk).update(created_at=last_month)
+    info = Mock()
+    info.context.user = client.user
+    week_ago = timezone.localdate() - timedelta(days=7)
+
+    packages = Query.resolve_all_packages(None, info, created_from=week_ago)
+    assert [package.pk for package in packages.results] == [new_package.pk]
+    packages = Query.resolve_all_packages(None, info, created_to=week_ago, include_archived=True)
+    assert [package.pk for package in packages.results] == [old_package.pk]
+
+    consolidates = Query.resolve_all_consolidates(None, info, created_from=week_ago, created_to=timezone.localdate())
+    assert [consolidate.pk for consolidate in consolidates.results] == [new_consolidate.pk]
@@ -0,0 +1,155 @@
+from io import StringIO
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from django.core.exceptions import PermissionDenied
+from django.core.management import call_command
+from packagehandling.factories import (
+    ClientFactory,
+    ConsolidateFactory,
+    PackageFactory,
+    UserFactory,
+)
+from packagehandling.models import Consolidate, Package
+from packagehandling.pricing import price_arrays, rate_table, reprice_packages
+from packagehandling.schema.queries import Query
+
+NAN = float("nan")
+
+
+@pytest.fixture(autouse=True)
+def tariff(settings):
+    settings.PRICING_RATE_TABLE = [[5, 8.0], [20, 6.5], [None, 5.0]]
+    settings.PRICING_VOLUMETRIC_DIVISOR = 5000
+    settings.PRICING_WEIGHT_INCREMENT_KG = 0.5
+    settings.PRICING_MINIMUM_CHARGE = 5.0
+
+
+def measured(**fields):
+    defaults = {"length": None, "width": None, "height": None, "dimension_unit": "cm", "weight": None}
+    return {"weight_unit": "kg", **defaults, **fields}
+
+
+class TestPriceArrays:
+    def test_billable_weight_is_the_larger_of_actual_and_volumetric(self):
+        priced = price_arrays(
+            length=[50, 10],
+            width=[40, 10],
+            height=[30, 10],
+            dimension_unit=["cm", "cm"],
+            weight=[3, 3],
+            weight_unit=["kg", "kg"],
+        )
+        np.testing.assert_allclose(priced["volumetric_weight"], [12.0, 0.2])
+        np.testing.assert_allclose(priced["billable_weight"], [12.0, 3.0])
+        # 12 kg falls in the 5-20 kg bracket; 3 kg in the first one.
+        np.testing.assert_allclose(priced["service_price"], [78.0, 24.0])
+
+    def test_units_are_normalised(self):
+        priced = price_arrays(
+            length=[10, 1],
+            width=[10, 1],
+            height=[10, 1],
+            dimension_unit=["in", "M"],
+            weight=[2.2046226, 16],
+            weight_unit=["lb", "oz"],
+        )
+        np.testing.assert_allclose(priced["actual_weight"], [1.0, 0.45359237])
+        np.testing.assert_allclose(priced["volumetric_weight"], [16387.064 / 5000, 200.0])
+
+    def test_rounding_minimum_charge_and_missing_measurements(self):
+        priced = price_arrays(
+            length=[NAN, NAN, 30, NAN],
+            width=[NAN, NAN, 30, NAN],
+            height=[NAN, NAN, 30, NAN],
+            dimension_unit=[None, None, None, None],
+            weight=[0.1, 5.01, NAN, NAN],
+            weight_unit=["kg", "kg", None, None],
+        )
+        np.testing.assert_allclose(priced["billable_weight"], [0.5, 5.5, 5.5, NAN])
+        np.testing.assert_allclose(priced["service_price"], [5.0, 35.75, 35.75, NAN])
+
+    @pytest.mark.parametrize("brackets", [[], [[5, 8.0]], [[20, 6.5], [5, 8.0], [None, 5.0]]])
+    def test_invalid_rate_table(self, brackets):
+        with pytest.raises(ValueError):
+            rate_table(brackets)
+
+
+@pytest.mark.django_db
+class TestRepricePackages:
+    def test_updates_only_changed_prices_in_chunks(self, django_assert_num_queries):
+        client = ClientFactory()
+        consolidate = ConsolidateFactory(client=client, status=Consolidate.Status.PENDING)
+        stale = PackageFactory.create_batch(
+            3, client=client, consolidate=consolidate, **measured(weight=3), service_price=1
+        )
+        current = PackageFactory(client=client, **measured(weight=3), service_price=24.0)
+        unpriceable = PackageFactory(client=client, **measured(), service_price=9)
+        before = Package.objects.get(pk=current.pk).updated_at
+
+        # Read + 2 chunks of bulk_update (each wrapped in a savepoint) + consolidation counter repair.
+        with django_assert_num_queries(8):
+            assert reprice_packages(Package.objects.all(), chunk_size=2) == (4, 3)
+
+        assert {package.service_price for package in Package.objects.filter(pk__in=[p.pk for p in stale])} == {24.0}
+        assert Package.objects.get(pk=current.pk).updated_at == before
+        assert Package.objects.get(pk=unpriceable.pk).service_price == 9
+        consolidate.refresh_from_db()
+        assert consolidate.total_service_price == 72.0
+
+    def test_dry_run(self):
+        PackageFactory(**measured(weight=3), service_price=1)
+        assert reprice_packages(Package.objects.all(), dry_run=True) == (1, 1)
+        assert Package.objects.get().service_price == 1
+
+    def test_command_skips_closed_consolidations(self):
+        client = ClientFactory()
+        open_package = PackageFactory(client=client, **measured(weight=3), service_price=1)
+        delivered = ConsolidateFactory(client=client, status=Consolidate.Status.DELIVERED)
+        closed_package = PackageFactory(client=client, consolidate=delivered, **measured(weight=3), service_price=1)
+
+        out = StringIO()
+        call_command("reprice_packages", stdout=out)
+
+        assert "Priced 1 packages" in out.getvalue()
+        assert Package.objects.get(pk=open_package.pk).service_price == 24.0
+        assert Package.objects.get(pk=closed_package.pk).service_price == 1
+
+
+@pytest.mark.django_db
+class TestQuotePackagesQuery:
+    def test_superuser_quotes_packages_and_measurements(self):
+        info = Mock()
+        info.context.user = UserFactory(is_superuser=True)
+        package = PackageFactory(**measured(weight=3), service_price=20)
+
+        quotes = Query.resolve_quote_packages(
+            None, info, package_ids=[package.pk], items=[measured(length=50, width=40, height=30)]
+        )
+
+        assert [(q.package_id, q.billable_weight, q.service_price, q.current_price) for q in quotes] == [
+            (package.pk, 3.0, 24.0, 20),
+            (None, 12.0, 78.0, None),
+        ]
+
+    def test_client_only_quotes_own_packages(self):
+        user = UserFactory()
+        own = PackageFactory(client=ClientFactory(user=user), **measured(weight=3))
+        other = PackageFactory(**measured(weight=3))
+        info = Mock()
+        info.context.user = user
+
+        quotes = Query.resolve_quote_packages(None, info, package_ids=[own.pk, other.pk])
+
+        assert [q.package_id for q in quotes] == [own.pk]
+
+    def test_anonymous_and_oversized_requests(self):
+        info = Mock()
+        info.context.user.is_authenticated = False
+        with pytest.raises(PermissionDenied):
+            Query.resolve_quote_packages(None, info, items=[measured(weight=1)])
+
+        info.context.user = UserFactory(is_superuser=True)
+        with pytest.raises(ValueError):
+            Query.resolve_quote_packages(None, info, items=[measured(weight=1)] * 101)
@@ -0,0 +1,126 @@
+import json
+import time
+
+import pytest
+from django.test import RequestFactory
+from graphql import parse, validate
+from graphql_jwt.middleware import JSONWebTokenMiddleware
+from graphql_jwt.shortcuts import get_token
+from packagehandling.factories import ClientFactory, ConsolidateFactory
+from packagehandling.graphql_schema import schema
+from packagehandling.schema.validation import query_limit_rules
+from packagehandling.views import RoutedGraphQLView
+
+pytestmark = pytest.mark.django_db
+
+FAN_OUT = "{ allConsolidates(pageSize: 100) { results { packages { client { user { email } } } } } }"
+
+
+@pytest.fixture(autouse=True)
+def limits(settings):
+    settings.GRAPHQL_MAX_DEPTH = 10
+    settings.GRAPHQL_MAX_ALIASES = 3
+    settings.GRAPHQL_MAX_COST = 5000
+    settings.GRAPHQL_DEFAULT_LIST_SIZE = 20
+    settings.GRAPHQL_MAX_SELECTIONS = 1000
+
+
+def check(query, variables=None):
+    costs = {}
+    errors = validate(schema.graphql_schema, parse(query), query_limit_rules(variables, costs.update))
+    return costs, [error.message for error in errors]
+
+
+def _post(query, user, variables=None):
+    request = RequestFactory().post(
+        "/graphql",
+        data=json.dumps({"query": query, "variables": variables}),
+        content_type="application/json",
+        headers={"Authorization": f"JWT {get_token(user)}"},
+    )
+    response = RoutedGraphQLView.as_view(middleware=[JSONWebTokenMiddleware()])(request)
+    return response.status_code, json.loads(response.content)
+
+
+def test_lists_multiply_by_page_size():
+    # 1 for the page, and 100 consolidations of 20 packages, each with a client and a user.
+    assert check(FAN_OUT) == (
+        {None: 6101},
+        ["Operation cost 6101 exceeds the limit of 5000. Request smaller pages or fewer nested lists."],
+    )
+    paged = "query Paged($size: Int) { allPackages(pageSize: $size) { totalCount results { client { fullName } } } }"
+    assert check(paged, {"size": 50}) == ({"Paged": 101}, [])
+    assert check(paged) == ({"Paged": 41}, [])
+    # Fragments count wherever they are spread; introspection is free.
+    spread = """
+    { me { ...Ids } dashboard { ...Stats } }
+    fragment Ids on MeType { id }
+    fragment Stats on DashboardType { stats { totalPackages } }
+    """
+    assert check(spread) == ({None: 1 + 10 + 10}, [])
+    assert check("{ __schema { types { fields { type { ofType { name } } } } } }") == ({None: 0}, [])
+
+
+def test_negative_sizes_do_not_lower_the_cost():
+    offset = "dashboard { recentPackages(limit: -100000) { id client { id } } }"
+    costs, errors = check(FAN_OUT.replace("{ allConsolidates", "{ " + offset + " allConsolidates"))
+    # The fan-out, the dashboard and one recent package with its client.
+    assert costs == {None: 6101 + 10 + 2}
+    assert errors == ["Operation cost 6113 exceeds the limit of 5000. Request smaller pages or fewer nested lists."]
+
+
+def test_depth_and_aliases_are_limited(settings):
+    settings.GRAPHQL_MAX_DEPTH = 4
+    assert check(FAN_OUT.replace("100", "1"))[1] == ["'anonymous' exceeds maximum operation depth of 4."]
+    nested = """
+    query Nested { ...Page }
+    fragment Page on Query { allConsolidates { results { ...Packages } } }
+    fragment Packages on ConsolidateType { packages { client { user { email } } } }
+    """
+    assert check(nested)[1] == ["'Nested' exceeds maximum operation depth of 4."]
+    assert check("{ a: me { id } b: me { id } c: me { id } d: me { id } }")[1] == [
+        "Operations may use at most 3 aliases."
+    ]
+
+
+def test_repeated_fragment_spreads_are_measured_once():
+    # About 1 KB that expands to 2^20 selections: each fragment spreads the next one twice.
+    levels = 20
+    query = "{ ...F0 }\n" + "".join(f"fragment F{n} on Query {{ ...F{n + 1} ...F{n + 1} }}\n" for n in range(levels))
+    query += f"fragment F{levels} on Query {{ me {{ id }} }}"
+
+    started = time.monotonic()
+    costs, errors = check(query)
+
+    assert time.monotonic() - started < 1
+    assert costs == {None: 2**levels}
+    assert errors == [
+        f"Operation cost {2**levels} exceeds the limit of 5000. Request smaller pages or fewer nested lists."
+    ]
+
+
+def test_selections_are_limited(settings):
+    settings.GRAPHQL_MAX_SELECTIONS = 5
+    assert check("{ me { id email firstName lastName isSuperuser } }") == (
+        {},
+        ["Operations may have at most 5 selections."],
+    )
+    assert check("{ me { id email firstName lastName } }") == ({None: 1}, [])
+
+
+def test_view_rejects_over_budget_operations_and_reports_cost():
+    client = ClientFactory()
+    ConsolidateFactory(client=client)
+
+    status, body = _post(FAN_OUT, client.user)
+    assert status == 400
+    assert "data" not in body
+    assert body["errors"][0]["message"].startswith("Operation cost 6101 exceeds the limit of 5000.")
+    assert body["extensions"] == {"cost": {"requested": 6101, "limit": 5000}}
+
+    status, body = _post(
+        "query ($size: Int) { allConsolidates(pageSize: $size) { totalCount } }", client.user, {"size": 10}
+    )
+    assert status == 200
+    assert body["data"] == {"allConsolidates": {"totalCount": 1}}
+    assert body["extensions"] == {"cost": {"requested": 1, "limit": 5000}}
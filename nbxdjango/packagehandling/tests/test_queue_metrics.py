@@ -0,0 +1,129 @@
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock
+
+import pytest
+from django.core.exceptions import PermissionDenied
+from django.core.management import call_command
+from django.utils import timezone
+from django_q.tasks import async_task
+from packagehandling.factories import UserFactory
+from packagehandling.models import TaskMetric
+from packagehandling.queue_metrics import (
+    prune_task_metrics,
+    queue_stats,
+    record_task_metric,
+)
+from packagehandling.schema.queries import Query
+
+
+def _metric(func="packagehandling.tasks.send", success=True, queued_ms=10.0, run_ms=100.0, age=timedelta()):
+    return TaskMetric.objects.create(
+        task_id="x",
+        func=func,
+        success=success,
+        queued_ms=queued_ms,
+        run_ms=run_ms,
+        finished_at=timezone.now() - age,
+    )
+
+
+@pytest.mark.django_db
+class TestTaskMetricRecording:
+    def test_executed_task_records_timing(self):
+        async_task("math.floor", 1.5, group="metrics", sync=True)
+
+        metric = TaskMetric.objects.get()
+        assert metric.func == "math.floor"
+        assert metric.group == "metrics"
+        assert metric.success is True
+        assert metric.queued_ms >= 0
+        assert metric.run_ms >= 0
+
+    def test_failed_task_is_recorded_as_failure(self):
+        enqueued = timezone.now()
+        task = {"id": "abc", "func": "math.sqrt", "started": enqueued, "success": False}
+        task["execution_started"] = enqueued + timedelta(milliseconds=40)
+        task["stopped"] = enqueued + timedelta(milliseconds=50)
+
+        record_task_metric(sender="django_q", task=task)
+
+        metric = TaskMetric.objects.get()
+        assert metric.success is False
+        assert metric.queued_ms == pytest.approx(40)
+        assert metric.run_ms == pytest.approx(10)
+
+    def test_recording_errors_do_not_propagate(self):
+        record_task_metric(sender="django_q", task={"id": "abc"})
+
+        assert not TaskMetric.objects.exists()
+
+
+@pytest.mark.django_db
+class TestQueueStats:
+    def test_aggregates_window_and_functions(self):
+        for run_ms in range(10, 110, 10):
+            _metric(run_ms=run_ms)
+        _metric(func="packagehandling.outbox.dispatch_outbox", success=False, queued_ms=50.0)
+        _metric(run_ms=9999.0, age=timedelta(hours=1))  # outside the window
+
+        stats = queue_stats(minutes=15)
+
+        assert stats["queue_depth"] == 0
+        assert stats["tasks"] == 11
+        assert stats["failures"] == 1
+        assert stats["failure_rate"] == round(1 / 11, 4)
+        assert stats["run_ms"]["max"] == 100.0
+        assert stats["run_ms"]["p95"] == 100.0
+        assert stats["queued_ms"]["max"] == 50.0
+        send, dispatch = stats["functions"]
+        assert (send["func"], send["tasks"], send["failure_rate"]) == ("packagehandling.tasks.send", 10, 0.0)
+        assert send["avg_run_ms"] == 55.0
+        assert (dispatch["tasks"], dispatch["failure_rate"]) == (1, 1.0)
+
+    def test_empty_window(self):
+        stats = queue_stats()
+
+        assert stats["tasks"] == 0
+        assert stats["failure_rate"] == 0.0
+        assert stats["run_ms"] == {"avg": None, "p95": None, "max": None}
+        assert stats["functions"] == []
+
+    def test_prune_keeps_recent_metrics(self, settings):
+        settings.TASK_METRICS_RETENTION_HOURS = 1
+        recent = _metric()
+        _metric(age=timedelta(hours=2))
+
+        assert prune_task_metrics() == 1
+        assert list(TaskMetric.objects.all()) == [recent]
+
+    def test_qstats_command(self):
+        _metric(success=False)
+        out = StringIO()
+
+        call_command("qstats", "--json", stdout=out)
+        call_command("qstats", stdout=StringIO())
+
+        assert json.loads(out.getvalue())["failures"] == 1
+
+
+@pytest.mark.django_db
+class TestQueueStatsQuery:
+    def test_superuser_gets_stats(self):
+        _metric()
+        info = Mock()
+        info.context.user = UserFactory(is_superuser=True)
+
+        result = Query.resolve_queue_stats(None, info, minutes=5)
+
+        assert result.tasks == 1
+        assert result.run_ms.avg == 100.0
+        assert result.functions[0].func == "packagehandling.tasks.send"
+
+    def test_non_superuser_is_denied(self):
+        info = Mock()
+        info.context.user = UserFactory()
+
+        with pytest.raises(PermissionDenied):
+            Query.resolve_queue_stats(None, info)
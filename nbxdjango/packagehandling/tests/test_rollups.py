@@ -0,0 +1,157 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import Mock
+
+import pytest
+from django.core.exceptions import PermissionDenied
+from django.core.management import call_command
+from django.utils import timezone
+from packagehandling.factories import (
+    ClientFactory,
+    ConsolidateFactory,
+    PackageFactory,
+    UserFactory,
+)
+from packagehandling.graphql_schema import schema
+from packagehandling.models import (
+    Consolidate,
+    ConsolidateStatusEvent,
+    DailyRollup,
+    Package,
+)
+from packagehandling.rollups import (
+    ROLLUP_FIELDS,
+    compute_figures,
+    periods,
+    refresh_rollups,
+)
+from packagehandling.schema.mutation_parts.consolidate_mutations import (
+    UpdateConsolidate,
+)
+from packagehandling.schema.mutation_parts.package_mutations import DeletePackage
+from packagehandling.schema.queries import Query
+
+pytestmark = pytest.mark.django_db
+
+ARRIVAL_STATS = """
+query ($from: Date!, $to: Date!, $granularity: String, $clientId: ID) {
+  arrivalStats(from: $from, to: $to, granularity: $granularity, clientId: $clientId) {
+    period packagesArrived consolidatesCreated consolidatesDelivered
+  }
+}
+"""
+
+
+def info_for(user):
+    info = Mock()
+    info.context.user = user
+    return info
+
+
+@pytest.fixture
+def activity():
+    """Two clients' packages over three days and one consolidation delivered today."""
+    today = timezone.localdate()
+    first, second = ClientFactory.create_batch(2)
+    for client, day, prices in [
+        (first, today - timedelta(days=2), (10.0, 4.0)),
+        (first, today - timedelta(days=2), (20.0, 6.0)),
+        (second, today - timedelta(days=2), (5.0, 1.0)),
+        (second, today - timedelta(days=1), (7.0, 2.0)),
+        (first, today, (1.0, 1.0)),
+    ]:
+        PackageFactory(client=client, arrival_date=day, real_price=prices[0], service_price=prices[1])
+    consolidate = ConsolidateFactory(client=first, status="in_transit")
+    UpdateConsolidate().mutate(info_for(UserFactory(is_superuser=True)), id=consolidate.pk, status="delivered")
+    return {"today": today, "first": first, "second": second}
+
+
+def stored_figures():
+    rows = DailyRollup.objects.filter(client_id__isnull=False).values("client_id", "day", *ROLLUP_FIELDS)
+    return {(row.pop("client_id"), row.pop("day")): row for row in rows}
+
+
+def test_full_refresh_and_arrival_stats(activity):
+    today, first = activity["today"], activity["first"]
+    out = StringIO()
+    call_command("refresh_rollups", stdout=out)
+    assert "Recomputed 3 days (4 client rows)." in out.getvalue()
+
+    result = schema.execute(
+        ARRIVAL_STATS,
+        variable_values={"from": str(today - timedelta(days=3)), "to": str(today)},
+        context_value=Mock(user=UserFactory(is_superuser=True)),
+    )
+    assert result.errors is None
+    assert [
+        (row["packagesArrived"], row["consolidatesCreated"], row["consolidatesDelivered"])
+        for row in result.data["arrivalStats"]
+    ] == [(0, 0, 0), (3, 0, 0), (1, 0, 0), (1, 1, 1)]
+
+    # A client only sees its own figures, whatever clientId it passes.
+    own = Query.resolve_arrival_stats(
+        None, info_for(first.user), from_=today - timedelta(days=2), to=today, client_id=activity["second"].pk
+    )
+    assert [row.packages_arrived for row in own] == [2, 0, 1]
+
+
+def test_revenue_stats_by_week_and_month(activity):
+    refresh_rollups()
+    today = activity["today"]
+    admin = info_for(UserFactory(is_superuser=True))
+
+    monthly = Query.resolve_revenue_stats(
+        None, admin, from_=today - timedelta(days=2), to=today, granularity="month", client_id=activity["first"].pk
+    )
+    months = {row.period: (row.packages_arrived, row.real_price, row.service_price) for row in monthly}
+    assert sum(count for count, _, _ in months.values()) == 3
+    assert sum(real for _, real, _ in months.values()) == 31.0
+    assert sum(service for _, _, service in months.values()) == 11.0
+
+    with pytest.raises(PermissionDenied):
+        Query.resolve_revenue_stats(None, info_for(activity["first"].user), from_=today, to=today)
+    with pytest.raises(ValueError):
+        Query.resolve_revenue_stats(None, admin, from_=today, to=today, granularity="year")
+    with pytest.raises(ValueError):
+        Query.resolve_revenue_stats(None, admin, from_=today - timedelta(days=500), to=today)
+
+
+def test_periods():
+    assert periods(date(2026, 1, 30), date(2026, 3, 2), "month") == [
+        date(2026, 1, 1),
+        date(2026, 2, 1),
+        date(2026, 3, 1),
+    ]
+    assert periods(date(2026, 10, 21), date(2026, 10, 27), "week") == [date(2026, 10, 19), date(2026, 10, 26)]
+
+
+def test_incremental_refresh_redoes_only_changed_days(activity, info_with_user_factory, monkeypatch):
+    today, first, second = activity["today"], activity["first"], activity["second"]
+    PackageFactory(client=second, arrival_date=today - timedelta(days=10))
+    refresh_rollups()
+    # As if the data was last changed before a refresh an hour ago.
+    an_hour_ago = timezone.now() - timedelta(hours=1)
+    DailyRollup.objects.update(refreshed_at=an_hour_ago)
+    Package.objects.update(updated_at=an_hour_ago - timedelta(hours=1))
+    Consolidate.objects.update(updated_at=an_hour_ago - timedelta(hours=1))
+    ConsolidateStatusEvent.objects.update(created_at=an_hour_ago - timedelta(hours=1))
+
+    # A package moved from two days ago to yesterday, one deleted and one added.
+    moved = Package.objects.get(client=second, arrival_date=today - timedelta(days=2))
+    moved.arrival_date = today - timedelta(days=1)
+    moved.save()
+    deleted = Package.objects.get(client=first, arrival_date=today)
+    DeletePackage().mutate(info_with_user_factory(UserFactory(is_superuser=True)), id=deleted.pk)
+    PackageFactory(client=second, arrival_date=today - timedelta(days=1), real_price=3.0, service_price=1.0)
+
+    # One day per batch, so each day is redone for exactly the clients found changed on it.
+    monkeypatch.setattr("packagehandling.rollups.DAYS_PER_BATCH", 1)
+    refresh_rollups()
+
+    days = [today - timedelta(days=offset) for offset in (0, 1, 2, 10)]
+    assert stored_figures() == compute_figures(days)
+    assert DailyRollup.objects.get(client_id__isnull=True, day=today - timedelta(days=1)).packages_arrived == 3
+    # Days without changes are left alone.
+    untouched = DailyRollup.objects.filter(day=today - timedelta(days=10))
+    assert {row.refreshed_at for row in untouched} == {an_hour_ago}
+    assert DailyRollup.objects.filter(refreshed_at=an_hour_ago).count() == 2
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncRequestFactory
+from graphql_jwt.shortcuts import get_token
+from packagehandling.factories import ClientFactory, UserFactory
+from packagehandling.models import Client
+from packagehandling.routing import ReplicaRouter
+from packagehandling.views import AsyncGraphQLView
+
+pytestmark = pytest.mark.django_db(databases=["default", "replica"])
+
+CLIENT_QUERY = "query ($id: ID!) { client(id: $id) { fullName } }"
+UPDATE_CLIENT = 'mutation ($id: ID!) { updateClient(id: $id, firstName: "Updated") { client { fullName } } }'
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICA_ALIAS = "replica"
+    settings.REPLICA_STICKY_SECONDS = 60
+    cache.clear()
+    yield "replica"
+    cache.clear()
+
+
+@pytest.fixture
+def lagging_client():
+    """A client whose replica copy still has its old name."""
+    client = ClientFactory(first_name="Primary", last_name="Client")
+    replica_copy = Client(pk=client.pk, first_name="Replica", last_name="Client", email=client.email)
+    Client.objects.using("replica").bulk_create([replica_copy])
+    return client
+
+
+def post(http_client, query, variables):
+    response = http_client.post(
+        "/graphql", json.dumps({"query": query, "variables": variables}), content_type="application/json"
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert "errors" not in body, body
+    return body["data"]
+
+
+def full_name(http_client, client):
+    return post(http_client, CLIENT_QUERY, {"id": client.pk})["client"]["fullName"]
+
+
+def test_queries_read_from_the_replica_and_mutations_write_to_the_primary(replica, lagging_client, client):
+    admin, other_admin = UserFactory.create_batch(2, is_superuser=True)
+    client.force_login(other_admin)
+    assert full_name(client, lagging_client) == "Replica Client"
+
+    client.force_login(admin)
+    assert full_name(client, lagging_client) == "Replica Client"
+    post(client, UPDATE_CLIENT, {"id": lagging_client.pk})
+
+    assert Client.objects.get(pk=lagging_client.pk).first_name == "Updated"
+    assert Client.objects.using("replica").get(pk=lagging_client.pk).first_name == "Replica"
+    # Read-your-writes: the admin who just wrote reads from the primary...
+    assert full_name(client, lagging_client) == "Updated Client"
+    # ...others keep reading the (lagging) replica...
+    client.force_login(other_admin)
+    assert full_name(client, lagging_client) == "Replica Client"
+    # ...and so does the admin once the sticky window is over.
+    cache.clear()
+    client.force_login(admin)
+    assert full_name(client, lagging_client) == "Replica Client"
+
+
+def test_without_a_replica_everything_reads_from_the_primary(lagging_client, client, settings):
+    assert settings.DATABASE_REPLICA_ALIAS is None
+    client.force_login(UserFactory(is_superuser=True))
+    assert full_name(client, lagging_client) == "Primary Client"
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_concurrent_queries_read_from_the_replica(replica, lagging_client):
+    admin = UserFactory(is_superuser=True)
+    request = AsyncRequestFactory().post(
+        "/graphql",
+        data=json.dumps({"query": CLIENT_QUERY, "variables": {"id": lagging_client.pk}}),
+        content_type="application/json",
+        headers={"Authorization": f"JWT {get_token(admin)}"},
+    )
+
+    response = async_to_sync(AsyncGraphQLView.as_view())(request)
+
+    # The JWT user is looked up on the primary, the client on the replica.
+    assert json.loads(response.content)["data"] == {"client": {"fullName": "Replica Client"}}
+
+
+def test_router_outside_graphql_queries():
+    router = ReplicaRouter()
+    assert router.db_for_read(Client) is None
+    assert router.db_for_write(Client) == "default"
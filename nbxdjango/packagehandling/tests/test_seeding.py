@@ -0,0 +1,93 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from packagehandling.models import Client, Consolidate, CustomUser, Package
+from packagehandling.seeding import SeedEngine, _split, seed, volumes_for_scale
+
+
+@pytest.mark.django_db
+class TestSeedEngine:
+    def test_users_share_one_password_hash(self):
+        engine = SeedEngine(password="secret123")
+
+        users = engine.create_users(3)
+
+        assert CustomUser.objects.count() == 3
+        assert len({user.password for user in CustomUser.objects.all()}) == 1
+        assert users[0].check_password("secret123")
+
+    def test_clients_are_added_to_client_group(self):
+        group = Group.objects.create(name="Client")
+
+        clients = SeedEngine().create_clients(2)
+
+        assert Client.objects.count() == 2
+        for client in clients:
+            assert group in client.user.groups.all()
+
+    def test_emails_stay_unique_across_calls(self):
+        engine = SeedEngine()
+
+        engine.create_clients(2)
+        engine.create_clients(2)
+
+        assert Client.objects.count() == 4
+
+    def test_packages_only_join_their_own_clients_consolidates(self):
+        engine = SeedEngine(batch_size=7)
+        clients = engine.create_clients(3)
+        consolidates = engine.create_consolidates(clients, 6)
+
+        engine.create_packages(40, clients, consolidates, consolidated_ratio=0.5)
+
+        assert Package.objects.count() == 40
+        assert Package.objects.filter(consolidate__isnull=False).count() == engine.stats["consolidated_packages"]
+        for package in Package.objects.filter(consolidate__isnull=False).select_related("consolidate"):
+            assert package.client_id == package.consolidate.client_id
+
+    def test_packages_into_single_consolidate(self):
+        engine = SeedEngine()
+        clients = engine.create_clients(1)
+        consolidate = engine.create_consolidates(clients, 1)[0]
+
+        engine.create_packages(5, [], consolidate=consolidate)
+
+        assert Package.objects.filter(consolidate=consolidate).count() == 5
+
+
+@pytest.mark.django_db
+def test_seed_generates_scale_volumes():
+    stats = seed(1, batch_size=250)
+
+    volumes = volumes_for_scale(1)
+    assert stats["clients"] == Client.objects.count() == volumes["clients"]
+    assert stats["consolidates"] == Consolidate.objects.count() == volumes["consolidates"]
+    assert stats["packages"] == Package.objects.count() == volumes["packages"]
+
+
+def test_split_distributes_remainders():
+    shards = _split({"clients": 10, "consolidates": 31, "packages": 1001}, 3)
+
+    assert sum(shard["packages"] for shard in shards) == 1001
+    assert sum(shard["consolidates"] for shard in shards) == 31
+    assert [shard["clients"] for shard in shards] == [4, 3, 3]
+
+
+def test_split_never_makes_shards_without_clients():
+    shards = _split({"clients": 2, "consolidates": 5, "packages": 9}, 4)
+
+    assert [shard["clients"] for shard in shards] == [1, 1]
+    assert sum(shard["packages"] for shard in shards) == 9
+    assert sum(shard["consolidates"] for shard in shards) == 5
+
+
+@pytest.mark.django_db
+def test_seed_data_command():
+    out = StringIO()
+
+    call_command("seed_data", "--scale", "1", stdout=out)
+
+    assert Package.objects.count() == volumes_for_scale(1)["packages"]
+    assert "Seeded dataset" in out.getvalue()
@@ -0,0 +1,126 @@
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.utils import timezone
+from packagehandling.archive import archive_batch
+from packagehandling.factories import ClientFactory, ConsolidateFactory, UserFactory
+from packagehandling.graphql_schema import schema
+from packagehandling.models import Consolidate, ConsolidateStatusEvent
+from packagehandling.schema.mutation_parts.consolidate_mutations import (
+    DeleteConsolidate,
+    UpdateConsolidate,
+)
+from packagehandling.schema.queries import Query
+from packagehandling.status_history import dwell_times
+
+pytestmark = pytest.mark.django_db
+
+PENDING, PROCESSING, IN_TRANSIT = "pending", "processing", "in_transit"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def info_for(user):
+    info = Mock()
+    info.context.user = user
+    return info
+
+
+def history(consolidate, *steps):
+    """Replace ``consolidate``'s history with ``steps``: (status, hours ago) pairs, oldest first."""
+    ConsolidateStatusEvent.objects.filter(consolidate_id=consolidate.pk).delete()
+    now = timezone.now()
+    previous = None
+    for status, hours_ago in steps:
+        event = ConsolidateStatusEvent.objects.create(
+            consolidate_id=consolidate.pk, status=status, previous_status=previous
+        )
+        ConsolidateStatusEvent.objects.filter(pk=event.pk).update(created_at=now - timedelta(hours=hours_ago))
+        previous = status
+
+
+def test_transitions_are_appended_in_the_saving_transaction():
+    admin = UserFactory(is_superuser=True)
+    consolidate = ConsolidateFactory(status=PENDING)
+
+    UpdateConsolidate().mutate(info_for(admin), id=consolidate.pk, status=PROCESSING)
+    UpdateConsolidate().mutate(info_for(admin), id=consolidate.pk, comment="No status change")
+    UpdateConsolidate().mutate(info_for(admin), id=consolidate.pk, status=IN_TRANSIT)
+
+    events = Query.resolve_consolidate_timeline(None, info_for(admin), id=consolidate.pk)
+    assert [(event.status, event.previous_status) for event in events] == [
+        (PENDING, None),
+        (PROCESSING, PENDING),
+        (IN_TRANSIT, PROCESSING),
+    ]
+    assert [event.left_at for event in events] == [events[1].created_at, events[2].created_at, None]
+
+
+def test_timeline_permissions_and_archived_consolidations():
+    consolidate = ConsolidateFactory(status=PENDING)
+    history(consolidate, (PENDING, 30), (Consolidate.Status.DELIVERED, 20))
+    archive_batch(Consolidate.objects.filter(pk=consolidate.pk))
+
+    result = schema.execute(
+        "query ($id: ID!) { consolidateTimeline(id: $id) { status previousStatus dwellSeconds } }",
+        variable_values={"id": consolidate.pk},
+        context_value=Mock(user=consolidate.client.user),
+    )
+    assert result.errors is None
+    assert result.data["consolidateTimeline"] == [
+        {"status": PENDING, "previousStatus": None, "dwellSeconds": 10 * 3600.0},
+        {"status": "delivered", "previousStatus": PENDING, "dwellSeconds": None},
+    ]
+    assert Query.resolve_consolidate_timeline(None, info_for(UserFactory(is_superuser=True)), id=0) is None
+    with pytest.raises(PermissionDenied):
+        Query.resolve_consolidate_timeline(None, info_for(ClientFactory().user), id=consolidate.pk)
+
+
+def test_average_dwell_time_per_status():
+    first, second, current = ConsolidateFactory.create_batch(3)
+    history(first, (PENDING, 50), (PROCESSING, 40), (IN_TRANSIT, 10))
+    history(second, (PENDING, 30), (PROCESSING, 28), (IN_TRANSIT, 8))
+    history(current, (PENDING, 5))  # still pending: not counted
+    admin = UserFactory(is_superuser=True)
+
+    rows = Query.resolve_consolidate_status_dwell_times(None, info_for(admin))
+
+    assert [(row.status, round(row.average_seconds), row.transitions) for row in rows] == [
+        (PENDING, 6 * 3600, 2),
+        (PROCESSING, 25 * 3600, 2),
+    ]
+    # Over the last two days: the first consolidation's pending stay started before them.
+    recent = Query.resolve_consolidate_status_dwell_times(None, info_for(admin), days=2)
+    assert [(row.status, round(row.average_seconds), row.transitions) for row in recent] == [
+        (PENDING, 2 * 3600, 1),
+        (PROCESSING, 25 * 3600, 2),
+    ]
+    with pytest.raises(PermissionDenied):
+        Query.resolve_consolidate_status_dwell_times(None, info_for(first.client.user))
+
+
+def test_dwell_times_are_cached(settings, django_assert_num_queries):
+    settings.STATUS_DWELL_CACHE_SECONDS = 60
+    consolidate = ConsolidateFactory()
+    history(consolidate, (PENDING, 3), (PROCESSING, 1))
+
+    assert dwell_times()[PENDING]["count"] == 1
+    history(ConsolidateFactory(), (PENDING, 3), (PROCESSING, 1))
+    with django_assert_num_queries(0):
+        assert dwell_times()[PENDING]["count"] == 1
+
+
+def test_deleting_a_consolidation_deletes_its_history():
+    first, second = ConsolidateFactory.create_batch(2)
+
+    DeleteConsolidate().mutate(info_for(UserFactory(is_superuser=True)), id=first.pk)
+
+    assert list(ConsolidateStatusEvent.objects.values_list("consolidate_id", flat=True)) == [second.pk]
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from graphql_jwt.shortcuts import get_token
+from packagehandling import realtime
+from packagehandling.consumers import PROTOCOL, GraphQLSubscriptionConsumer
+from packagehandling.factories import ClientFactory, ConsolidateFactory, UserFactory
+from packagehandling.models import Consolidate
+from packagehandling.schema.mutation_parts.consolidate_mutations import (
+    UpdateConsolidate,
+)
+from packagehandling.schema.mutation_parts.package_mutations import CreatePackage
+
+STATUS_SUBSCRIPTION = """
+subscription($clientId: ID) {
+  consolidateStatusChanged(clientId: $clientId) { consolidateId previousStatus status }
+}
+"""
+PACKAGE_SUBSCRIPTION = "subscription { packageArrived { barcode clientId arrivalDate } }"
+
+
+async def _connect(token):
+    communicator = WebsocketCommunicator(GraphQLSubscriptionConsumer.as_asgi(), "/graphql", subprotocols=[PROTOCOL])
+    connected, _ = await communicator.connect()
+    assert connected
+    await communicator.send_json_to({"type": "connection_init", "payload": {"Authorization": f"JWT {token}"}})
+    return communicator
+
+
+async def _subscribe(communicator, query, group, variables=None):
+    await communicator.send_json_to(
+        {"type": "subscribe", "id": "1", "payload": {"query": query, "variables": variables}}
+    )
+    # Events are only delivered once the subscription has joined its channel layer group.
+    layer = get_channel_layer()
+    for _ in range(100):
+        if layer.groups.get(group):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Subscription never joined {group}")
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSubscriptions:
+    def test_client_receives_own_consolidate_status_changes(self, info_with_user_factory):
+        admin = UserFactory(is_superuser=True)
+        client = ClientFactory()
+        consolidate = ConsolidateFactory(client=client, status=Consolidate.Status.PENDING)
+        token = get_token(client.user)
+        info = info_with_user_factory(admin)
+
+        async def scenario():
+            communicator = await _connect(token)
+            assert (await communicator.receive_json_from())["type"] == "connection_ack"
+            await _subscribe(
+                communicator, STATUS_SUBSCRIPTION, realtime.group_name(realtime.CONSOLIDATE_STATUS_CHANGED, client.pk)
+            )
+
+            await database_sync_to_async(UpdateConsolidate().mutate)(info, id=consolidate.pk, status="processing")
+
+            message = await communicator.receive_json_from(timeout=2)
+            await communicator.disconnect()
+            return message
+
+        message = async_to_sync(scenario)()
+
+        assert message["type"] == "next"
+        assert message["payload"]["data"]["consolidateStatusChanged"] == {
+            "consolidateId": str(consolidate.pk),
+            "previousStatus": "pending",
+            "status": "processing",
+        }
+
+    def test_package_arrivals_are_scoped_to_the_client(self, info_with_user_factory):
+        admin = UserFactory(is_superuser=True)
+        client = ClientFactory()
+        other = ClientFactory()
+        token = get_token(client.user)
+        info = info_with_user_factory(admin)
+
+        async def scenario():
+            communicator = await _connect(token)
+            await communicator.receive_json_from()
+            await _subscribe(
+                communicator, PACKAGE_SUBSCRIPTION, realtime.group_name(realtime.PACKAGE_ARRIVED, client.pk)
+            )
+
+            create = database_sync_to_async(CreatePackage().mutate)
+            await create(info, barcode="OTHER-1", courier="DHL", client_id=other.pk)
+            await create(info, barcode="MINE-1", courier="DHL", client_id=client.pk)
+
+            message = await communicator.receive_json_from(timeout=2)
+            nothing_else = await communicator.receive_nothing(timeout=0.2)
+            await communicator.disconnect()
+            return message, nothing_else
+
+        message, nothing_else = async_to_sync(scenario)()
+
+        assert message["payload"]["data"]["packageArrived"] == {
+            "barcode": "MINE-1",
+            "clientId": str(client.pk),
+            "arrivalDate": None,
+        }
+        assert nothing_else
+
+    def test_client_cannot_follow_another_client(self):
+        client = ClientFactory()
+        other = ClientFactory()
+        token = get_token(client.user)
+
+        async def scenario():
+            communicator = await _connect(token)
+            await communicator.receive_json_from()
+            await communicator.send_json_to(
+                {
+                    "type": "subscribe",
+                    "id": "1",
+                    "payload": {"query": STATUS_SUBSCRIPTION, "variables": {"clientId": other.pk}},
+                }
+            )
+            message = await communicator.receive_json_from(timeout=2)
+            await communicator.disconnect()
+            return message
+
+        message = async_to_sync(scenario)()
+
+        assert message["type"] == "error"
+        assert "permission" in message["payload"][0]["message"]
+
+    def test_connection_without_valid_token_is_closed(self):
+        async def scenario():
+            communicator = await _connect("not-a-token")
+            output = await communicator.receive_output(timeout=2)
+            await communicator.wait()
+            return output
+
+        output = async_to_sync(scenario)()
+
+        assert output == {"type": "websocket.close", "code": 4403}
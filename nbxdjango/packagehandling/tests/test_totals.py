@@ -0,0 +1,58 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from packagehandling.factories import ClientFactory, ConsolidateFactory, PackageFactory
+from packagehandling.schema.types import ConsolidateType
+from packagehandling.totals import ConsolidationTotals, consolidation_totals
+from packagehandling.utils import send_consolidation_notification_email
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def consolidate():
+    client = ClientFactory(first_name="Ana", last_name="Pérez")
+    consolidate = ConsolidateFactory(client=client)
+    PackageFactory(
+        client=client, consolidate=consolidate, barcode="PKG-1", weight=1, weight_unit="kg", service_price=12.5
+    )
+    PackageFactory(
+        client=client, consolidate=consolidate, barcode="PKG-2", weight=2.2, weight_unit=None, service_price=None
+    )
+    PackageFactory(client=client, barcode="NOT-IN-IT", weight=50, weight_unit="kg", service_price=99)
+    return consolidate
+
+
+def test_consolidation_totals_in_one_query(consolidate, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        totals = consolidation_totals(consolidate.pk)
+
+    assert totals.package_count == 2
+    assert totals.total_weight == pytest.approx(1 + 2.2 * 0.45359237)
+    assert totals.total_cost == 12.5
+
+
+def test_consolidation_totals_of_an_empty_consolidation():
+    assert consolidation_totals(ConsolidateFactory()) == ConsolidationTotals(0, 0.0, 0.0)
+
+
+def test_notification_email_uses_totals_and_only_rendered_columns(consolidate, django_assert_max_num_queries):
+    with patch("packagehandling.utils.send_email") as send_email:
+        with django_assert_max_num_queries(2) as context:
+            send_consolidation_notification_email(consolidate)
+
+    package_queries = [query["sql"] for query in context.captured_queries if "packagehandling_package" in query["sql"]]
+    assert len(package_queries) == 2
+    assert all('"description"' not in sql and '"purchase_link"' not in sql for sql in package_queries)
+
+    body = send_email.call_args.kwargs["body"]
+    assert "TRACKING PKG-1" in body and "TRACKING PKG-2" in body
+    assert "NOT-IN-IT" not in body
+    assert "Total: 2 paquetes - Peso total: 4.40 lb" in body
+    assert "El total a cancelar será de $12.50" in body
+    assert "Peso total: 4.40 lb" in send_email.call_args.kwargs["html_message"]
+
+
+def test_consolidate_type_totals(consolidate):
+    totals = ConsolidateType.resolve_totals(consolidate, Mock())
+    assert (totals.package_count, totals.total_cost) == (2, 12.5)
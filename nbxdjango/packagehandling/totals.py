@@ -0,0 +1,58 @@
+"""
+Consolidation totals: package count, total weight (kg, normalised across
+``weight_unit``) and total service price, computed in one aggregate query over
+the consolidation's packages.
+
+Used by the notification email and the ``totals`` field of ``ConsolidateType``.
+The cached counters on ``Consolidate`` (see ``packagehandling.counters``) hold
+the same numbers and are recomputed from the same expressions, but can lag
+behind writes that bypass the models; anything quoting an amount owed reads
+these instead.
+"""
+
+from collections import namedtuple
+
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Package
+from .units import weight_in_kg_expression
+
+ConsolidationTotals = namedtuple("ConsolidationTotals", ["package_count", "total_weight", "total_cost"])
+
+# Package columns the consolidation notification email renders.
+NOTIFICATION_PACKAGE_FIELDS = (
+    "id",
+    "barcode",
+    "courier",
+    "other_courier",
+    "weight",
+    "weight_unit",
+    "length",
+    "width",
+    "height",
+    "dimension_unit",
+    "service_price",
+)
+
+
+def package_total_aggregates():
+    """Aggregate expressions over a package queryset, shared with the counter repair."""
+    return {
+        "package_count": Count("id"),
+        "total_weight": Coalesce(Sum(weight_in_kg_expression()), 0.0),
+        "total_cost": Coalesce(Sum("service_price"), 0.0),
+    }
+
+
+def consolidation_totals(consolidate):
+    """``ConsolidationTotals`` of ``consolidate`` (an instance or a primary key), in one query."""
+    consolidate_id = getattr(consolidate, "pk", consolidate)
+    totals = Package.objects.filter(consolidate_id=consolidate_id).aggregate(**package_total_aggregates())
+    return ConsolidationTotals(**totals)
+
+
+def notification_packages(consolidate):
+    """The consolidation's packages, with only the columns the notification email renders."""
+    consolidate_id = getattr(consolidate, "pk", consolidate)
+    return Package.objects.filter(consolidate_id=consolidate_id).only(*NOTIFICATION_PACKAGE_FIELDS).order_by("id")
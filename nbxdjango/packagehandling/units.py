@@ -0,0 +1,71 @@
+"""
+Unit conversion for package measurements.
+
+Packages keep the weight and dimensions in the units they were typed in
+(``weight_unit`` / ``dimension_unit``). Totals are computed in kilograms and
+centimetres. A missing or unrecognised unit is read the way the notification
+emails print it: pounds and centimetres.
+
+``Package`` also stores the converted values (``weight_kg``, ``length_cm``,
+``width_cm``, ``height_cm``, ``volume_cm3``), filled in on save with the Python
+helpers below and backfilled with the matching SQL expressions.
+"""
+
+from django.db.models import Case, F, FloatField, Value, When
+
+KG_PER = {"kg": 1.0, "g": 0.001, "lb": 0.45359237, "lbs": 0.45359237, "oz": 0.028349523125}
+CM_PER = {"cm": 1.0, "mm": 0.1, "m": 100.0, "in": 2.54, "ft": 30.48}
+
+DEFAULT_WEIGHT_UNIT = "lb"
+DEFAULT_DIMENSION_UNIT = "cm"
+
+
+def _factor(table, unit, default):
+    return table.get((unit or "").strip().lower(), table[default])
+
+
+def weight_in_kg(weight, unit):
+    if weight is None:
+        return 0.0
+    return weight * _factor(KG_PER, unit, DEFAULT_WEIGHT_UNIT)
+
+
+def weight_from_kg(weight_kg, unit):
+    return weight_kg / _factor(KG_PER, unit, DEFAULT_WEIGHT_UNIT)
+
+
+def length_in_cm(length, unit):
+    if length is None:
+        return None
+    return length * _factor(CM_PER, unit, DEFAULT_DIMENSION_UNIT)
+
+
+def volume_in_cm3(length, width, height, unit):
+    if length is None or width is None or height is None:
+        return None
+    return length * width * height * _factor(CM_PER, unit, DEFAULT_DIMENSION_UNIT) ** 3
+
+
+def _converted(value, unit, table, default, power=1):
+    """SQL expression multiplying ``value`` by the ``power`` of the factor of the unit in column ``unit``."""
+    return Case(
+        *[When(**{f"{unit}__iexact": name}, then=value * Value(factor**power)) for name, factor in table.items()],
+        default=value * Value(table[default] ** power),
+        output_field=FloatField(),
+    )
+
+
+def weight_in_kg_expression(prefix=""):
+    """SQL expression converting ``{prefix}weight`` to kilograms, for aggregates and updates."""
+    return _converted(F(f"{prefix}weight"), f"{prefix}weight_unit", KG_PER, DEFAULT_WEIGHT_UNIT)
+
+
+def length_in_cm_expression(field, prefix=""):
+    """SQL expression converting the ``{prefix}{field}`` dimension to centimetres."""
+    return _converted(F(f"{prefix}{field}"), f"{prefix}dimension_unit", CM_PER, DEFAULT_DIMENSION_UNIT)
+
+
+def volume_in_cm3_expression(prefix=""):
+    """SQL expression for ``{prefix}length × width × height`` in cubic centimetres."""
+    volume = F(f"{prefix}length") * F(f"{prefix}width") * F(f"{prefix}height")
+    return _converted(volume, f"{prefix}dimension_unit", CM_PER, DEFAULT_DIMENSION_UNIT, power=3)
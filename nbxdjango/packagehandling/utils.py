@@ -1,23 +1,82 @@
+import logging
+from datetime import timedelta
+
 from django.conf import settings
+from django.core.mail import send_mail
+from django.db import transaction
 from django.template.loader import render_to_string
-from django_q.tasks import async_task
+from django.utils import timezone
 
+from . import lanes
 from .emails.messages import CONSOLIDATION_NOTIFICATION_SUBJECT
+from .models import EmailIdempotencyKey
+from .totals import consolidation_totals, notification_packages
+from .units import DEFAULT_WEIGHT_UNIT, weight_from_kg
+
+logger = logging.getLogger(__name__)
 
 
-def send_email(subject, body, recipient_list, html_message=None):
+def send_email(subject, body, recipient_list, html_message=None, lane=lanes.DEFAULT, idempotency=None):
     """
-    A utility function to send emails asynchronously.
+    A utility function to send emails asynchronously on the given task lane
+    (``lanes.TRANSACTIONAL`` for mail a user is waiting for, ``lanes.BULK`` for
+    notification batches).
+
+    ``idempotency`` (``{"template": ..., "consolidate_id": ..., "status": ...}``)
+    makes the email idempotent for those values and the recipients: a repeat
+    within ``EMAIL_IDEMPOTENCY_TTL_HOURS`` is not enqueued, and the worker skips
+    a task whose email was already delivered. Such emails are enqueued when the
+    current transaction commits. Returns False when the email was skipped.
     """
-    async_task(
-        "django.core.mail.send_mail",
-        subject=subject,
-        message=body,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=recipient_list,
-        fail_silently=False,
-        html_message=html_message,
+    mail = {
+        "subject": subject,
+        "message": body,
+        "from_email": settings.DEFAULT_FROM_EMAIL,
+        "recipient_list": recipient_list,
+        "fail_silently": False,
+        "html_message": html_message,
+    }
+    if idempotency is None:
+        lanes.enqueue("django.core.mail.send_mail", **mail, lane=lane)
+        return True
+
+    reservation = EmailIdempotencyKey.reserve(recipient_list=recipient_list, **idempotency)
+    if reservation is None:
+        logger.info("Skipping duplicate %s email to %s", idempotency["template"], recipient_list)
+        return False
+    transaction.on_commit(
+        lambda: lanes.enqueue("packagehandling.utils.deliver_email", reservation.key, **mail, lane=lane)
     )
+    return True
+
+
+def deliver_email(idempotency_key, **mail):
+    """
+    Task body for idempotent emails: sends unless this key was already sent
+    (a django-q redelivery after ``retry`` or a duplicate task).
+    """
+    keys = EmailIdempotencyKey.objects.filter(key=idempotency_key)
+    if not keys.filter(sent_at__isnull=True).update(sent_at=timezone.now()):
+        if keys.exists():
+            logger.info("Skipping already delivered email %s", idempotency_key)
+        else:
+            # Pruned while the task waited: whether it was sent is unknown, so it is not sent twice.
+            logger.warning("Skipping email %s: its idempotency key expired before delivery", idempotency_key)
+        return False
+    try:
+        send_mail(**mail)
+    except Exception:
+        # Release the claim so the retry can send it.
+        keys.update(sent_at=None)
+        raise
+    return True
+
+
+def prune_email_idempotency_keys():
+    """Delete expired email reservations. Scheduled by ``setup_schedules``."""
+    # Keep a day of margin so a task still waiting in a queue finds its reservation.
+    deleted, _ = EmailIdempotencyKey.objects.filter(expires_at__lt=timezone.now() - timedelta(days=1)).delete()
+    return deleted
 
 
 def send_consolidation_notification_email(consolidation):
@@ -26,26 +85,30 @@ def send_consolidation_notification_email(consolidation):
     have arrived in Panama and are ready for pickup.
 
     Args:
-        consolidation: A Consolidate model instance with related packages
+        consolidation: A Consolidate model instance or its primary key
     """
     from .models import Consolidate  # Avoid circular import
 
-    # Get the consolidation with related packages
     if isinstance(consolidation, Consolidate):
         consolidate_obj = consolidation
     else:
-        consolidate_obj = Consolidate.objects.prefetch_related("packages").get(pk=consolidation)
+        consolidate_obj = Consolidate.objects.select_related("client").get(pk=consolidation)
 
     client = consolidate_obj.client
 
-    # Calculate total cost from packages
-    packages = list(consolidate_obj.packages.all())
-    total_cost = sum(pkg.service_price or 0 for pkg in packages)
+    # Totals in one aggregate; the packages with only the columns rendered below.
+    totals = consolidation_totals(consolidate_obj)
+    packages = list(notification_packages(consolidate_obj))
+    total_cost = totals.total_cost
+    total_weight = weight_from_kg(totals.total_weight, DEFAULT_WEIGHT_UNIT)
 
     # Prepare context for the email template
     context = {
         "client_name": client.full_name,
         "packages": packages,
+        "package_count": totals.package_count,
+        "total_weight": total_weight,
+        "weight_unit": DEFAULT_WEIGHT_UNIT,
         "total_cost": total_cost,
         "logo_url": getattr(settings, "NARBOX_LOGO_URL", ""),
     }
@@ -75,6 +138,7 @@ Paquetes:
         plain_message += "\n"
 
     plain_message += f"""
+Total: {totals.package_count} paquetes - Peso total: {total_weight:.2f} {DEFAULT_WEIGHT_UNIT}
 El total a cancelar será de ${total_cost:.2f}
 
 Puedes realizar tus pagos de flete bajo las siguientes alternativas:
@@ -96,4 +160,10 @@ Su paquete con los mejores
         body=plain_message,
         recipient_list=[client.email],
         html_message=html_message,
+        lane=lanes.BULK,
+        idempotency={
+            "template": "consolidation_notification",
+            "consolidate_id": consolidate_obj.pk,
+            "status": consolidate_obj.status,
+        },
     )
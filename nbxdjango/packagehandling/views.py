@@ -0,0 +1,90 @@
+import logging
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+from graphene_django.views import GraphQLView
+
+from .schema.execution import ConcurrentExecutionContext, RoutedExecutionContext
+from .schema.validation import query_limit_rules
+
+logger = logging.getLogger(__name__)
+
+
+@require_safe
+def liveness_check(request):
+    """The process is up and serving requests. Does not touch the database."""
+    return JsonResponse({"status": "healthy"})
+
+
+@require_safe
+def health_check(request):
+    """The process can serve traffic: the database answers on a (possibly pooled) connection."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        logger.exception("Health check failed: database unavailable")
+        return JsonResponse({"status": "unhealthy", "database": "unavailable"}, status=503)
+    return JsonResponse({"status": "healthy", "database": "ok"})
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+class LimitedGraphQLView(GraphQLView):
+    """
+    Rejects operations over the depth, alias or cost limits before they run
+    (``packagehandling.schema.validation``) and reports the cost of the
+    operation in the response's ``extensions``.
+    """
+
+    query_cost = None
+
+    def execute_graphql_request(self, request, data, query, variables, operation_name, *args, **kwargs):
+        def record(costs):
+            if operation_name in costs:
+                self.query_cost = costs[operation_name]
+            elif len(costs) == 1:
+                self.query_cost = next(iter(costs.values()))
+
+        # Django makes a view instance per request, so the rules can carry this request's variables.
+        self.validation_rules = query_limit_rules(variables, record)
+        return super().execute_graphql_request(request, data, query, variables, operation_name, *args, **kwargs)
+
+    def json_encode(self, request, d, pretty=False):
+        if self.query_cost is not None and isinstance(d, dict):
+            d = {**d, "extensions": {"cost": {"requested": self.query_cost, "limit": settings.GRAPHQL_MAX_COST}}}
+        return super().json_encode(request, d, pretty)
+
+
+class RoutedGraphQLView(LimitedGraphQLView):
+    """GraphQL endpoint reading queries from the replica when one is configured (``packagehandling.routing``)."""
+
+    execution_context_class = RoutedExecutionContext
+
+
+class AsyncGraphQLView(LimitedGraphQLView):
+    """
+    GraphQL endpoint for ASGI deployments.
+
+    Request parsing, GraphiQL and mutations run on the request's thread-sensitive
+    sync thread exactly as in ``GraphQLView``; queries are handed back to the
+    event loop, where ``ConcurrentExecutionContext`` resolves their top-level
+    fields concurrently in the database thread pool.
+    """
+
+    view_is_async = True
+    execution_context_class = ConcurrentExecutionContext
+
+    async def dispatch(self, request, *args, **kwargs):
+        return await sync_to_async(super().dispatch)(request, *args, **kwargs)
+
+    def execute_graphql_request(self, *args, **kwargs):
+        result = super().execute_graphql_request(*args, **kwargs)
+        if self.execution_context_class.is_awaitable(result):
+            result = async_to_sync(_await)(result)
+        return result